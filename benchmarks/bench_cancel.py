@@ -0,0 +1,75 @@
+"""
+Times `order.cancel_all` against cancelling the same open orders one at a
+time, on a local `mockserver.MockFirstrade` with a fixed round-trip latency.
+
+Each run places --orders limit orders spread over --accounts accounts, then
+cancels them all.
+
+Usage:
+    python benchmarks/bench_cancel.py [--orders 100] [--accounts 10] [--latency 0.05] [--workers 32]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from firstrade import urls  # noqa: E402
+from firstrade.account import FTSession  # noqa: E402
+from firstrade.mockserver import MockFirstrade  # noqa: E402
+from firstrade.order import Duration, OrderSpec, OrderType, PriceType, cancel_all, cancel_order, get_orders, place_orders  # noqa: E402
+
+
+def place(ft_session, accounts, count):
+    specs = [
+        OrderSpec(accounts[i % len(accounts)], f"SYM{i % 25}", PriceType.LIMIT, OrderType.BUY, 1, Duration.DAY, 1.00)
+        for i in range(count)
+    ]
+    results = place_orders(ft_session, specs, dry_run=False, max_workers=len(accounts))
+    failed = [result for result in results if result.error is not None]
+    if failed:
+        raise failed[0].error
+
+
+def sequential(ft_session, accounts):
+    results = []
+    for account in accounts:
+        for order in get_orders(ft_session, account):
+            if order["Status"] == "Open":
+                results.append(cancel_order(ft_session, account, order["Reference"], order))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100, help="open orders to cancel")
+    parser.add_argument("--accounts", type=int, default=10, help="accounts the orders are spread over")
+    parser.add_argument("--latency", type=float, default=0.05, help="mock server latency in seconds")
+    parser.add_argument("--workers", type=int, default=32, help="cancel_all max_workers")
+    args = parser.parse_args()
+
+    accounts = [str(10000000 + i) for i in range(args.accounts)]
+    with MockFirstrade(accounts=accounts, latency=args.latency) as server, tempfile.TemporaryDirectory() as profile:
+        urls.set_base_url(server.base_url)
+        ft_session = FTSession("mock", "mock", "1234", None, profile, pool_maxsize=args.workers)
+        print(f"{args.orders} orders in {args.accounts} accounts, {args.latency * 1e3:.0f} ms latency")
+        for name, run in (
+            ("sequential", lambda: sequential(ft_session, accounts)),
+            ("cancel_all", lambda: cancel_all(ft_session, accounts, max_workers=args.workers, allow_unverified=True)),
+        ):
+            place(ft_session, accounts, args.orders)
+            start = time.perf_counter()
+            results = run()
+            elapsed = time.perf_counter() - start
+            cancelled = sum(result.cancelled for result in results)
+            latencies = [result.elapsed for result in results]
+            print(f"{name:<11} {elapsed:>7.3f} s  {cancelled} cancelled  "
+                  f"per cancel p50 {statistics.median(latencies) * 1e3:.1f} ms  max {max(latencies) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
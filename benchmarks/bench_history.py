@@ -0,0 +1,68 @@
+"""
+Measures the cost of recording quotes with QuoteRecorder and of time-range
+queries with QuoteHistory, against pickling a list of SymbolQuote-like rows.
+
+Usage:
+    python benchmarks/bench_history.py [--records 200000]
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import payloads  # noqa: E402
+from firstrade.history import QuoteHistory, QuoteRecorder  # noqa: E402
+from firstrade.symbols import QUOTE_FIELDS, SymbolQuote  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    quote = SymbolQuote(None, "", data=payloads.fixture("quote.xml"))
+    start_time = 1760000000.0
+    with tempfile.TemporaryDirectory() as directory:
+        # Quote times use a 12-hour clock: 11:42:07 AM and 01:42:07 PM.
+        afternoon = SymbolQuote(None, "", data=payloads.fixture("quote_afternoon.xml"))
+        with QuoteRecorder(directory) as recorder:
+            recorder.record(quote, start_time - 2)
+            recorder.record(afternoon, start_time - 1)
+        quote_times = QuoteHistory(directory).query(quote.symbol)["quote_time"].tolist()
+        assert quote_times == [11 * 3600 + 42 * 60 + 7, 13 * 3600 + 42 * 60 + 7], quote_times
+
+        with QuoteRecorder(directory) as recorder:
+            start = time.perf_counter()
+            for i in range(args.records):
+                quote.bid += 0.01  # so no record is skipped as a duplicate
+                recorder.record(quote, start_time + i * 0.01)
+            elapsed = time.perf_counter() - start
+        print(f"record: {elapsed / args.records * 1e6:.2f} us per quote")
+
+        rows = [{name: getattr(quote, name) for name in QUOTE_FIELDS} for _ in range(args.records)]
+        start = time.perf_counter()
+        with open(os.path.join(directory, "quotes.pkl"), "wb") as f:
+            pickle.dump(rows, f)
+        print(f"pickle list of dicts: {(time.perf_counter() - start) / args.records * 1e6:.2f} us per quote")
+
+        history = QuoteHistory(directory)
+        middle = start_time + args.records * 0.005
+        start = time.perf_counter()
+        window = history.query(quote.symbol, middle, middle + 60)
+        mean = float(window["last"].mean())
+        print(f"query 60 s window ({len(window)} records, mean last {mean:.2f}): "
+              f"{(time.perf_counter() - start) * 1e3:.3f} ms")
+        start = time.perf_counter()
+        with open(os.path.join(directory, "quotes.pkl"), "rb") as f:
+            pickle.load(f)
+        print(f"unpickle everything: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compares parsing positions and order status pages in threads against
+`parsing.ParseExecutor` worker processes over a range of payload sizes, to
+find the size from which the process pool is faster.
+
+For each size, --threads threads parse the payload repeatedly for --seconds,
+once in-thread and once through the pool. "cpu/parse" is the CPU time the
+parent process spends per parse, i.e. what is left of the GIL for other work.
+
+The speedup only shows with more than one CPU: on a single CPU the workers and
+the parent share it, so the pool can at best match in-thread parsing and only
+"cpu/parse" improves. Run this on the machine the session will run on before
+relying on the pool or changing `parsing.MIN_SIZE`.
+
+Usage:
+    python benchmarks/bench_parse_pool.py [--seconds 1] [--threads N] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import payloads  # noqa: E402
+from firstrade.account import parse_positions  # noqa: E402
+from firstrade.order import parse_orders  # noqa: E402
+from firstrade.parsing import MIN_SIZE, ParseExecutor  # noqa: E402
+
+SIZES = (1, 4, 16, 64, 256, 1024, 4096)
+
+
+def throughput(run, parser, payload, threads, seconds):
+    """Returns (parses per second, parent CPU seconds per parse) of `threads` threads calling `run`."""
+    counts = [0] * threads
+    deadline = time.perf_counter() + seconds
+
+    def worker(index):
+        while time.perf_counter() < deadline:
+            run(parser, payload)
+            counts[index] += 1
+
+    started = time.perf_counter()
+    cpu = time.process_time()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    total = sum(counts)
+    return total / (time.perf_counter() - started), (time.process_time() - cpu) / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="duration of each measurement")
+    parser.add_argument("--threads", type=int, default=os.cpu_count(), help="parsing threads")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args()
+
+    def inline(parse, payload):
+        return parse(payload)
+
+    print(f"{os.cpu_count()} CPUs, {args.threads} threads, {args.workers} workers, MIN_SIZE {MIN_SIZE} bytes")
+    if os.cpu_count() == 1:
+        print("only one CPU: the pool cannot be faster here, compare cpu/parse instead")
+    with ParseExecutor(args.workers, min_size=0) as executor:
+        cases = (
+            ("positions", payloads.positions, parse_positions),
+            ("orders", lambda rows: payloads.orders(rows).decode(), parse_orders),
+        )
+        for name, build, parse in cases:
+            executor.run(parse, build(1))  # start the workers
+            print(f"\n{name:<9} {'rows':>5} {'bytes':>8} {'thread/s':>9} {'pool/s':>9} {'speedup':>8} "
+                  f"{'cpu/parse thread':>17} {'pool':>9}")
+            crossover = None
+            for rows in SIZES:
+                payload = build(rows)
+                local, local_cpu = throughput(inline, parse, payload, args.threads, args.seconds)
+                pooled, pooled_cpu = throughput(executor.run, parse, payload, args.threads, args.seconds)
+                if crossover is None and pooled > local:
+                    crossover = len(payload)
+                print(f"{'':<9} {rows:>5} {len(payload):>8} {local:>9.0f} {pooled:>9.0f} {pooled / local:>7.2f}x "
+                      f"{local_cpu * 1e3:>14.3f} ms {pooled_cpu * 1e3:>6.3f} ms")
+            if crossover is None:
+                print("  the pool was not faster at any size on this machine")
+            else:
+                print(f"  the pool is faster from about {crossover} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compares quote parsing throughput of SymbolQuote against the previous
+BeautifulSoup implementation on recorded `getxml?page=quo` payloads.
+
+Usage:
+    python benchmarks/bench_quote.py [--seconds 2]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from firstrade.symbols import SymbolQuote  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def legacy_quote(text):
+    """The BeautifulSoup parse SymbolQuote used before the lxml parser."""
+    quote = BeautifulSoup(text, "xml").find("quote")
+    result = {
+        "symbol": quote.find("symbol").text,
+        "underlying_symbol": quote.find("underlying_symbol").text,
+        "tick": quote.find("tick").text,
+        "exchange": quote.find("exchange").text,
+        "bid": float(quote.find("bid").text.replace(",", "")),
+        "ask": float(quote.find("ask").text.replace(",", "")),
+        "last": float(quote.find("last").text.replace(",", "")),
+    }
+    for name, tag in (("bid_size", "bidsize"), ("ask_size", "asksize"), ("last_size", "lastsize")):
+        temp_store = quote.find(tag).text.replace(",", "")
+        result[name] = int(temp_store) if temp_store.isdigit() else 0
+    result["bid_mmid"] = quote.find("bidmmid").text
+    result["ask_mmid"] = quote.find("askmmid").text
+    result["last_mmid"] = quote.find("lastmmid").text
+    result["change"] = float(quote.find("change").text.replace(",", ""))
+    if quote.find("high").text == "N/A":
+        result["high"] = None
+    else:
+        result["high"] = float(quote.find("high").text.replace(",", ""))
+    if quote.find("low").text == "N/A":
+        result["low"] = "None"
+    else:
+        result["low"] = float(quote.find("low").text.replace(",", ""))
+    result["change_color"] = quote.find("changecolor").text
+    result["volume"] = quote.find("vol").text
+    result["bidxask"] = quote.find("bidxask").text
+    result["quote_time"] = quote.find("quotetime").text
+    result["last_trade_time"] = quote.find("lasttradetime").text
+    result["real_time"] = quote.find("realtime").text == "T"
+    result["fractional"] = quote.find("fractional").text == "T"
+    result["err_code"] = quote.find("errcode").text
+    result["company_name"] = quote.find("companyname").text
+    return result
+
+
+def rate(func, payloads, seconds):
+    """Runs func over the payloads for about `seconds` and returns calls per second."""
+    count = 0
+    start = time.perf_counter()
+    while True:
+        for payload in payloads:
+            func(payload)
+        count += len(payloads)
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    payloads = []
+    for name in sorted(os.listdir(FIXTURES)):
+        if name.startswith("quote"):
+            with open(os.path.join(FIXTURES, name), "rb") as f:
+                payloads.append(f.read())
+
+    for payload in payloads:
+        quote = SymbolQuote(None, "", data=payload)
+        expected = legacy_quote(payload.decode("utf-8"))
+        for name, value in expected.items():
+            assert getattr(quote, name) == value, (name, getattr(quote, name), value)
+
+    legacy = rate(lambda payload: legacy_quote(payload.decode("utf-8")), payloads, args.seconds)
+    current = rate(lambda payload: SymbolQuote(None, "", data=payload), payloads, args.seconds)
+    print(f"{'parser':<16}{'quotes/sec':>14}")
+    print(f"{'BeautifulSoup':<16}{legacy:>14,.0f}")
+    print(f"{'SymbolQuote':<16}{current:>14,.0f}")
+    print(f"speedup: {current / legacy:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
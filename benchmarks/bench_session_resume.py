@@ -0,0 +1,91 @@
+"""
+Measures FTSession startup time with and without resuming saved cookies.
+
+HTTP is answered in-process with a simulated round-trip time, so the numbers
+show how many round trips each startup mode costs rather than real latency.
+Also compares the old pickle cookie lookup (directory scan) against the
+JSON session file lookup in a profile directory with many users.
+
+Usage:
+    python benchmarks/bench_session_resume.py [--rtt 0.05] [--users 200]
+"""
+
+import argparse
+import os
+import pickle
+import statistics
+import sys
+import tempfile
+import time
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from firstrade import account  # noqa: E402
+
+
+def stub_send(rtt):
+    def send(self, request, **kwargs):
+        time.sleep(rtt)
+        response = Response()
+        response.status_code = 200
+        response._content = b"<response><status>OK</status></response>"
+        response.url = request.url
+        response.request = request
+        return response
+
+    return send
+
+
+def legacy_load_cookies(username, directory):
+    """The directory scan and pickle load FTSession used before the JSON session file."""
+    cookies = {}
+    for filename in os.listdir(directory):
+        if filename.endswith(f"{username}.pkl"):
+            with open(os.path.join(directory, filename), "rb") as f:
+                cookies = pickle.load(f)
+    return cookies
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rtt", type=float, default=0.05, help="simulated round-trip time in seconds")
+    parser.add_argument("--users", type=int, default=200, help="users in the profile directory")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    HTTPAdapter.send = stub_send(args.rtt)
+    cookies = {f"cookie{i}": "x" * 32 for i in range(12)}
+    with tempfile.TemporaryDirectory() as profile:
+        for i in range(args.users):
+            account.save_cookies(f"user{i}", profile, cookies)
+            with open(os.path.join(profile, f"ft_cookiesuser{i}.pkl"), "wb") as f:
+                pickle.dump(cookies, f)
+
+        legacy = timed(lambda: legacy_load_cookies("user7", profile), args.repeat)
+        current = timed(lambda: account.load_session("user7", profile), args.repeat)
+        print(f"cookie lookup ({args.users} users): pickle scan {legacy * 1e3:.3f} ms, "
+              f"json session file {current * 1e3:.3f} ms")
+
+        def start(resume_max_age):
+            return lambda: account.FTSession("user7", "", "", None, profile, resume_max_age=resume_max_age)
+
+        validated = timed(start(None), args.repeat)
+        resumed = timed(start(3600), args.repeat)
+        print(f"FTSession startup (rtt {args.rtt * 1e3:.0f} ms): validated {validated * 1e3:.1f} ms, "
+              f"resumed {resumed * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
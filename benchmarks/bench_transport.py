@@ -0,0 +1,238 @@
+"""
+Compares FTSession transport settings against a local TLS stub server.
+
+The server speaks HTTP/1.1 and HTTP/2 (negotiated with ALPN), answers every
+request after a fixed service time, and uses a throwaway self-signed
+certificate made with openssl, so TCP and TLS setup costs are real. Reports
+the first-request latency of a cold and a prewarmed connection, and p50/p99/max
+latency of a burst of concurrent quote-sized requests for:
+
+- default: a pool of 10 connections, so a burst wider than 10 opens extra
+  connections that are thrown away after use
+- pooled: `pool_maxsize` matching the burst, prewarmed at login
+- http2: requests multiplexed over one HTTP/2 connection (needs httpx and h2)
+
+Client and server are both Python, so on a machine with few cores the
+numbers are CPU-bound; HTTP/2 framing in pure Python costs more CPU per
+request than HTTP/1.1, which shows in its p50.
+
+Usage:
+    python benchmarks/bench_transport.py [--concurrency 32] [--requests 2000] [--service 0.002]
+"""
+
+import argparse
+import heapq
+import multiprocessing
+import os
+import select
+import socket
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from firstrade import account, urls  # noqa: E402
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+except ImportError:
+    h2 = None
+
+BODY = open(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "quote.xml"), "rb"
+).read()
+
+
+def make_certificate(directory):
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", key, "-out", cert, "-subj", "/CN=localhost",
+            "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+class StubServer:
+    """TLS server answering every request with BODY after `service` seconds."""
+
+    def __init__(self, cert, key, service, handshakes):
+        self.service = service
+        self.handshakes = handshakes
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.context.load_cert_chain(cert, key)
+        self.context.set_alpn_protocols(["h2", "http/1.1"] if h2 is not None else ["http/1.1"])
+        self.listener = socket.create_server(("127.0.0.1", 0), backlog=256)
+        self.port = self.listener.getsockname()[1]
+
+    def serve_forever(self):
+        while True:
+            sock, _ = self.listener.accept()
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock):
+        try:
+            sock = self.context.wrap_socket(sock, server_side=True)
+            with self.handshakes.get_lock():
+                self.handshakes.value += 1
+            if sock.selected_alpn_protocol() == "h2":
+                self._serve_h2(sock)
+            else:
+                self._serve_http11(sock)
+        except (OSError, ssl.SSLError):
+            pass
+        finally:
+            sock.close()
+
+    def _serve_http11(self, sock):
+        reader = sock.makefile("rb")
+        while True:
+            length = 0
+            line = reader.readline()
+            if not line:
+                return
+            while line not in (b"\r\n", b""):
+                name, _, value = line.partition(b":")
+                if name.lower() == b"content-length":
+                    length = int(value)
+                line = reader.readline()
+            reader.read(length)
+            time.sleep(self.service)
+            sock.sendall(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/xml\r\nContent-Length: %d\r\n\r\n" % len(BODY) + BODY
+            )
+
+    def _serve_h2(self, sock):
+        # One thread reads and writes the connection; responses wait in a heap until due.
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        sock.sendall(conn.data_to_send())
+        due = []
+        while True:
+            timeout = max(0.0, due[0][0] - time.monotonic()) if due else None
+            if sock.pending() or select.select([sock], [], [], timeout)[0]:
+                data = sock.recv(65535)
+                if not data:
+                    return
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.StreamEnded):
+                        heapq.heappush(due, (time.monotonic() + self.service, event.stream_id))
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+            while due and due[0][0] <= time.monotonic():
+                _, stream_id = heapq.heappop(due)
+                conn.send_headers(
+                    stream_id,
+                    [(":status", "200"), ("content-type", "text/xml"), ("content-length", str(len(BODY)))],
+                )
+                conn.send_data(stream_id, BODY, end_stream=True)
+            data = conn.data_to_send()
+            if data:
+                sock.sendall(data)
+
+
+def run_server(cert, key, service, handshakes, ports):
+    server = StubServer(cert, key, service, handshakes)
+    ports.put(server.port)
+    server.serve_forever()
+
+
+def start_session(base, cert, profile, **transport):
+    """Logs an FTSession in against the stub server with the given transport settings."""
+    urls.set_base_url(base)
+    original = account.requests.Session.__init__
+
+    def init(self):
+        original(self)
+        self.trust_env = False  # so REQUESTS_CA_BUNDLE does not override `verify`
+        self.verify = cert
+
+    account.requests.Session.__init__ = init
+    try:
+        return account.FTSession("bench", "", "", None, profile, **transport)
+    finally:
+        account.requests.Session.__init__ = original
+
+
+def burst(ft_session, url, concurrency, count):
+    def one(_):
+        start = time.perf_counter()
+        ft_session.get(url).content
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return sorted(executor.map(one, range(count)))
+
+
+def report(name, samples, handshakes):
+    p50 = statistics.median(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"  {name:<8} p50 {p50 * 1e3:6.2f} ms   p99 {p99 * 1e3:6.2f} ms   "
+          f"max {samples[-1] * 1e3:6.2f} ms   TLS handshakes {handshakes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight at once")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per burst")
+    parser.add_argument("--service", type=float, default=0.002, help="server time per request in seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = make_certificate(directory)
+        # The server runs in its own process so it does not compete with the client for the GIL.
+        handshakes = multiprocessing.Value("i", 0)
+        ports = multiprocessing.Queue()
+        server = multiprocessing.Process(
+            target=run_server, args=(cert, key, args.service, handshakes, ports), daemon=True
+        )
+        server.start()
+        base = f"https://127.0.0.1:{ports.get()}"
+        quote_url = f"{base}/cgi-bin/getxml?page=quo&quoteSymbol=INTC"
+
+        print("first request after the connections were dropped:")
+        for name, warm in (("cold", False), ("prewarm", True)):
+            ft_session = start_session(base, cert, directory)
+            ft_session.session.close()  # as after an idle period closed the connection
+            if warm:
+                ft_session.prewarm(1)  # what `prewarm` at login and `keepalive` pings do
+            start = time.perf_counter()
+            ft_session.get(quote_url)
+            print(f"  {name:<8} {(time.perf_counter() - start) * 1e3:6.2f} ms")
+            ft_session.close()
+
+        print(f"{args.requests} requests, {args.concurrency} in flight:")
+        configs = [
+            ("default", {}),
+            ("pooled", {"pool_maxsize": args.concurrency, "prewarm": args.concurrency}),
+        ]
+        if h2 is not None:
+            from firstrade.transport import HTTP2Adapter
+
+            configs.append(("http2", {"adapter": HTTP2Adapter(verify=cert), "prewarm": 1}))
+        for name, transport in configs:
+            ft_session = start_session(base, cert, directory, **transport)
+            burst(ft_session, quote_url, args.concurrency, args.concurrency)
+            before = handshakes.value
+            samples = burst(ft_session, quote_url, args.concurrency, args.requests)
+            report(name, samples, handshakes.value - before)
+            ft_session.close()
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
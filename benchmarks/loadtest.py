@@ -0,0 +1,141 @@
+"""
+Load-tests quotes, positions and order placement end to end against
+`firstrade.mockserver.MockFirstrade`, or another server given with --base-url.
+
+Each scenario runs for --seconds with --concurrency threads sharing one
+logged in FTSession and reports throughput, p50/p99 latency and errors.
+Orders are submitted for real (dry_run=False), so only point --base-url at a
+stand-in server.
+
+Usage:
+    python benchmarks/loadtest.py [--seconds 5] [--concurrency 16] [--latency 0.03] [--jitter 0.02]
+                                  [--error-rate 0] [--expire-rate 0] [-k quotes]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from firstrade import urls  # noqa: E402
+from firstrade.account import FTAccountData, FTSession  # noqa: E402
+from firstrade.metrics import Instrumentation  # noqa: E402
+from firstrade.mockserver import MockFirstrade  # noqa: E402
+from firstrade.order import Duration, Order, OrderType, PriceType  # noqa: E402
+from firstrade.symbols import SymbolQuote  # noqa: E402
+
+SYMBOLS = ("INTC", "AAPL", "MSFT", "F", "VTI", "SPY", "QQQ", "AMD", "NVDA", "TSLA")
+
+
+def scenarios(ft_session, accounts):
+    account_data = FTAccountData(ft_session)
+
+    def quotes(i):
+        SymbolQuote(ft_session, SYMBOLS[i % len(SYMBOLS)])
+
+    def positions(i):
+        account_data.get_positions(accounts[i % len(accounts)])
+
+    def orders(i):
+        Order(ft_session).place_order(
+            accounts[i % len(accounts)],
+            SYMBOLS[i % len(SYMBOLS)],
+            PriceType.LIMIT,
+            OrderType.BUY,
+            1,
+            Duration.DAY,
+            price=1.00,
+            dry_run=False,
+        )
+
+    return {"quotes": quotes, "positions": positions, "orders": orders}
+
+
+def run(operation, seconds, concurrency):
+    """Calls `operation` from `concurrency` threads for `seconds`; returns (latencies, errors, elapsed)."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(10**9))
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        while time.perf_counter() < deadline:
+            with lock:
+                i = next(counter)
+            start = time.perf_counter()
+            try:
+                operation(i)
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), errors, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", help="server to test instead of a local MockFirstrade")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="threads per scenario")
+    parser.add_argument("--latency", type=float, default=0.03, help="mock server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="mock server jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock server 503 rate")
+    parser.add_argument("--expire-rate", type=float, default=0.0, help="mock server session expiry rate")
+    parser.add_argument("-k", help="only run scenarios whose name contains this")
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url is None:
+        server = MockFirstrade(
+            latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, expire_rate=args.expire_rate
+        ).start()
+        args.base_url = server.base_url
+    urls.set_base_url(args.base_url)
+    instrumentation = Instrumentation()
+    with tempfile.TemporaryDirectory() as profile:
+        ft_session = FTSession(
+            "mock", "mock", "1234", None, profile,
+            instrumentation=instrumentation, pool_maxsize=args.concurrency, backoff=0.05,
+        )
+        accounts = server.accounts if server is not None else FTAccountData(ft_session).account_numbers
+        print(f"{args.base_url}, {args.concurrency} threads, {args.seconds:g} s per scenario")
+        print(f"{'scenario':<10} {'ops/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+        for name, operation in scenarios(ft_session, accounts).items():
+            if args.k and args.k not in name:
+                continue
+            latencies, errors, elapsed = run(operation, args.seconds, args.concurrency)
+            if not latencies:
+                print(f"{name:<10} {'-':>8} {'-':>8} {'-':>8} {'-':>8} {len(errors):>7}  {errors[:1]}")
+                continue
+            p50 = statistics.median(latencies)
+            p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+            print(f"{name:<10} {len(latencies) / elapsed:>8.1f} {p50 * 1e3:>8.1f} {p99 * 1e3:>8.1f} "
+                  f"{latencies[-1] * 1e3:>8.1f} {len(errors):>7}")
+            kinds = Counter(f"{type(e).__name__}: {str(e)[:60]}" for e in errors)
+            for kind, count in kinds.most_common(3):
+                print(f"{'':<10} {count:>5} x {kind}")
+        snapshot = instrumentation.snapshot()
+        print(f"retries {sum(snapshot['retry'].values())}, re-logins {sum(snapshot['relogin'].values())}")
+    if server is not None:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Recorded fixture payloads and large synthetic payloads for the benchmarks."""
+
+import os
+import random
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture(name):
+    """Returns the bytes of a recorded fixture payload."""
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def positions(count, seed=0):
+    """Builds a `getxml?page=pos` payload holding `count` positions."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        price = rng.uniform(1, 500)
+        change = rng.uniform(-5, 5)
+        rows.append(
+            f"<position><symbol>SYM{i:04d}</symbol><quantity>{rng.randint(1, 5000)}</quantity>"
+            f"<price>{price:.3f}</price><change>{change:.3f}</change>"
+            f"<changepercent>{change / price * 100:.2f}</changepercent>"
+            f"<vol>{rng.randint(1000, 90000000):,}</vol></position>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<response>\n' + "\n".join(rows) + "\n</response>\n").encode()
+
+
+def orders(count, seed=0):
+    """Builds an `orderstatus` page listing `count` orders."""
+    rng = random.Random(seed)
+    page = fixture("orderstatus.html").decode()
+    head = page[: page.index("<tbody>") + len("<tbody>")]
+    tail = page[page.index("</tbody>"):]
+    rows = []
+    for i in range(count):
+        status = rng.choice(["<strong>Executed</strong><br>filled", "<strong>Open</strong>", "<strong>Cancelled</strong>"])
+        rows.append(
+            f'<tr class="{"odd" if i % 2 else "even"}"><td>10/16/2026<br>{9 + i % 7:02d}:{i % 60:02d}:00</td>'
+            f'<td>{rng.choice(["Buy", "Sell"])}</td><td>{rng.randint(1, 500)}</td>'
+            f'<td><a href="#" class="info" onmouseover="tooltip.show(\'&lt;div&gt;&lt;b&gt;Order Ref #: {40000000 + i}'
+            f'&lt;/b&gt;&lt;br&gt;Account: XXXX1234&lt;/div&gt;\');" onmouseout="tooltip.hide();">SYM{i % 800:03d}</a></td>'
+            f'<td>Limit</td><td>{rng.uniform(1, 500):.2f}</td><td>Day</td><td></td><td>{status}</td><td></td></tr>'
+        )
+    return (head + "\n".join(rows) + tail).encode()
@@ -0,0 +1,103 @@
+"""
+Offline micro-benchmarks for the response parsers.
+
+Runs every parser on recorded fixture payloads and large synthetic ones and
+reports operations per second and peak memory allocated during one call.
+No network access or credentials are needed.
+
+Usage:
+    python benchmarks/run.py [-k positions] [--seconds 1] [--save out.json] [--compare base.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import payloads  # noqa: E402
+from firstrade import account, order, positions  # noqa: E402
+from firstrade.cache import ParseCache  # noqa: E402
+from firstrade.symbols import SymbolQuote  # noqa: E402
+
+
+def cached(parser, endpoint):
+    """Runs `parser` through `parse_response` with a ParseCache, so every call after the first is a hit."""
+    session = SimpleNamespace(parse_cache=ParseCache())
+    return lambda payload: account.parse_response(session, endpoint, parser, payload, key="bench")
+
+
+def cases():
+    """Returns (name, parser, payload) for every benchmark."""
+    text = lambda name: payloads.fixture(name).decode()  # noqa: E731
+    return [
+        ("quote", lambda p: SymbolQuote(None, "", data=p), payloads.fixture("quote.xml")),
+        ("account_list", account.parse_account_numbers, text("accountlist.html")),
+        ("margin_status", json.loads, text("margin_status.json")),
+        ("balance", account.parse_balance, text("balance.xml")),
+        ("positions", account.parse_positions, text("positions.xml")),
+        ("positions_1000", account.parse_positions, payloads.positions(1000).decode()),
+        ("position_columns_1000", positions.parse_position_columns, payloads.positions(1000)),
+        ("orderbar_preview", order.parse_preview, text("orderbar_preview.xml")),
+        ("orderbar_submit", order.parse_submission, text("orderbar_submit.xml")),
+        ("orders", order.parse_orders, text("orderstatus.html")),
+        ("orders_2000", order.parse_orders, payloads.orders(2000).decode()),
+        ("positions_1000_cached", cached(account.parse_positions, "get_xml"), payloads.positions(1000).decode()),
+        ("orders_2000_cached", cached(order.parse_orders, "order_list"), payloads.orders(2000).decode()),
+    ]
+
+
+def measure(parser, payload, seconds):
+    """Returns (ops/sec, peak bytes allocated by one call)."""
+    tracemalloc.start()
+    parser(payload)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    count = 0
+    start = time.perf_counter()
+    while True:
+        parser(payload)
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return count / elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", dest="filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time spent on each benchmark")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="show the change against results saved with --save")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'benchmark':<20}{'payload':>12}{'ops/sec':>14}{'peak mem':>12}{'vs base':>10}")
+    for name, func, payload in cases():
+        if args.filter not in name:
+            continue
+        ops, peak = measure(func, payload, args.seconds)
+        results[name] = {"ops_per_sec": ops, "peak_bytes": peak, "payload_bytes": len(payload)}
+        change = ""
+        if name in baseline:
+            change = f"{ops / baseline[name]['ops_per_sec']:.2f}x"
+        print(f"{name:<20}{len(payload) / 1024:>10.1f}KB{ops:>14,.1f}{peak / 1024:>10.1f}KB{change:>10}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
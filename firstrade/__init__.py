@@ -1,3 +1,11 @@
-from . import account, order, symbols, urls
+import importlib
 
 __all__ = ["account", "order", "symbols", "urls"]
+
+
+def __getattr__(name):
+    # Submodules are imported on first use so that light entry points,
+    # like the command line client, do not pay for requests and bs4.
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
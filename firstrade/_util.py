@@ -0,0 +1,28 @@
+from lxml import etree
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Shared by the lxml response parsers: tolerant of broken markup, no entities, no network.
+XML_PARSER = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+
+
+def require_numpy(feature):
+    """Raises ImportError naming `feature` if numpy is not installed."""
+    if np is None:
+        raise ImportError(f"{feature} requires numpy. Install it with `pip install firstrade[numpy]`.")
+
+
+def to_float(text):
+    """Converts a number that may have thousands separators, raising ValueError if it is not one."""
+    return float(text.replace(",", "") if "," in text else text)
+
+
+def to_float_or_nan(text):
+    """Converts a number that may have thousands separators, or returns NaN if it is not one."""
+    try:
+        return to_float(text)
+    except ValueError:
+        return float("nan")
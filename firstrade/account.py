@@ -1,18 +1,244 @@
+import json
 import os
 import pickle
+import random
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import pyotp
 
 from firstrade import urls
 
 
+SESSION_FAILED = "/cgi-bin/sessionfailed?reason=6"
+MAX_RELOGIN_COOLDOWN = 900.0
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+class SessionExpired(Exception):
+    """Raised when a response still shows an expired session after logging in again."""
+
+
+def session_expired(response):
+    """Returns True if a response is Firstrade's expired-session page or a redirect to it."""
+    return "sessionfailed" in response.url or SESSION_FAILED.encode() in response.content
+
+
+class _LoginState:
+    """Login lock, counter and last login failure shared by an FTSession and its isolated copies."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.cookies = {}
+        self.error = None
+        self.failures = 0
+        self.retry_at = 0.0
+
+
+def login_data(username, password):
+    """Builds the form data for the username/password login step."""
+    return {
+        "redirect": "",
+        "ft_locale": "en-us",
+        "login.x": "Log In",
+        "username": r"" + username,
+        "password": r"" + password,
+        "destination_page": "home",
+    }
+
+
+def two_factor_data(totp_secret):
+    """Builds the form data for the 2FA step from the TOTP secret."""
+    # 可能需要其他字段，根据Firstrade的实际要求添加
+    return {"two_factor_code": pyotp.TOTP(totp_secret).now()}
+
+
+def pin_data(pin):
+    """Builds the form data for the PIN step."""
+    return {
+        "destination_page": "home",
+        "pin": pin,
+        "pin.x": "++OK++",
+        "sring": "0",
+    }
+
+
+def cookie_path(username, profile_path=None):
+    """
+    Returns the path of a user's saved session file.
+
+    Args:
+        username (str): Firstrade login username.
+        profile_path (str, optional): The directory session files are saved in. Defaults to the cwd.
+
+    Returns:
+        str: The path of the session file.
+    """
+    return os.path.join(profile_path or ".", f"ft_cookies{username}.json")
+
+
+def load_session(username, profile_path=None):
+    """
+    Loads a user's saved session cookies and when they were saved.
+
+    Args:
+        username (str): Firstrade login username.
+        profile_path (str, optional): The directory session files are saved in.
+
+    A session saved by older versions as `ft_cookies<username>.pkl` is
+    rewritten as the JSON session file the first time it is loaded, keeping
+    the pickle's modification time as the save time, and the pickle is removed.
+
+    Returns:
+        tuple: The cookies dict and the unix time they were saved at,
+            or ({}, None) if there is no usable saved session.
+    """
+    try:
+        with open(cookie_path(username, profile_path), "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        return dict(saved["cookies"]), float(saved["saved_at"])
+    except FileNotFoundError:
+        return _migrate_pickle(username, profile_path)
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}, None
+
+
+def _migrate_pickle(username, profile_path):
+    path = os.path.join(profile_path or ".", f"ft_cookies{username}.pkl")
+    try:
+        saved_at = os.path.getmtime(path)
+        with open(path, "rb") as f:
+            cookies = dict(pickle.load(f))
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        return {}, None
+    save_cookies(username, profile_path, cookies, saved_at)
+    os.remove(path)
+    return cookies, saved_at
+
+
+def load_cookies(username, profile_path=None):
+    """
+    Checks if session cookies were saved for a user.
+
+    Args:
+        username (str): Firstrade login username.
+        profile_path (str, optional): The directory session files are saved in.
+
+    Returns:
+        Dict: Dictionary of cookies. Nom Nom
+    """
+    return load_session(username, profile_path)[0]
+
+
+def save_cookies(username, profile_path, cookies, saved_at=None):
+    """
+    Saves session cookies for a user to a file, along with the time they were saved.
+
+    The file is written atomically and is only readable by the current user.
+
+    Args:
+        username (str): Firstrade login username.
+        profile_path (str): The directory to save the session file in, or None for the cwd.
+        cookies (dict): The cookies to save.
+        saved_at (float, optional): Unix time to record as the save time. Defaults to now.
+    """
+    path = cookie_path(username, profile_path)
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"saved_at": time.time() if saved_at is None else saved_at, "cookies": cookies}, f)
+    os.replace(temp_path, path)
+
+
+def _call(parser, payload, *args):
+    return parser(payload, *args)
+
+
+def parse_response(ft_session, endpoint, parser, payload, *args, key=None, with_changed=False):
+    """
+    Runs a response parser, timing it if the session has instrumentation.
+
+    The parser runs in the session's parse executor if it has one. If the
+    session has a parse cache covering the endpoint, a body parsed before
+    returns the cached, frozen result instead.
+
+    Args:
+        ft_session (FTSession): The session the response was received on. May be None.
+        endpoint (str): The endpoint name from `urls.endpoint` the response came from.
+        parser (callable): Called with the payload and `args`.
+        payload (bytes or str): The response body.
+        key (hashable, optional): What the response is for within the endpoint, i.e. the
+            account, for `ParseCache.changed`.
+        with_changed (bool, optional): Also return whether the body differs from the previous
+            one for the endpoint and key. Always True without a parse cache. Defaults to False.
+
+    Returns:
+        The parser's result, frozen (see `cache.freeze`) if it came through the parse cache,
+        or a (result, changed) tuple if `with_changed`.
+    """
+    parse_cache = getattr(ft_session, "parse_cache", None)
+    if parse_cache is not None and endpoint in parse_cache.endpoints:
+        result, changed = parse_cache.parse(
+            endpoint, partial(_run_parser, ft_session, endpoint), parser, payload, args, key
+        )
+    else:
+        result, changed = _run_parser(ft_session, endpoint, parser, payload, *args), True
+    return (result, changed) if with_changed else result
+
+
+def _run_parser(ft_session, endpoint, parser, payload, *args):
+    executor = getattr(ft_session, "parse_executor", None)
+    run = executor.run if executor is not None else _call
+    instrumentation = getattr(ft_session, "instrumentation", None)
+    if instrumentation is None:
+        return run(parser, payload, *args)
+    start = time.perf_counter()
+    try:
+        return run(parser, payload, *args)
+    finally:
+        instrumentation.record_parse(endpoint, time.perf_counter() - start)
+
+
 class FTSession:
     """Class creating a session for Firstrade."""
 
-    def __init__(self, username, password, pin,totp_secret, profile_path=None):
+    def __init__(
+        self,
+        username,
+        password,
+        pin,
+        totp_secret,
+        profile_path=None,
+        quote_cache=None,
+        quote_recorder=None,
+        resume_max_age=None,
+        scheduler=None,
+        instrumentation=None,
+        adapter=None,
+        max_retries=3,
+        backoff=0.5,
+        max_backoff=8.0,
+        pool_maxsize=10,
+        pool_block=False,
+        http2=False,
+        prewarm=0,
+        keepalive=None,
+        parse_executor=None,
+        symbol_reference=None,
+        parse_cache=None,
+        relogin_cooldown=30.0,
+    ):
         """
         Initializes a new instance of the FTSession class.
 
@@ -21,21 +247,107 @@ class FTSession:
             password (str): Firstrade login password.
             pin (str): Firstrade login pin.
             persistent_session (bool, optional): Whether the user wants to save the session cookies.
-            profile_path (str, optional): The path where the user wants to save the cookie pkl file.
+            profile_path (str, optional): The path where the user wants to save the session file.
+            quote_cache (QuoteCache, optional): Cache shared by quote requests made with this session.
+                Quotes are always fetched when not given.
+            quote_recorder (history.QuoteRecorder, optional): Records every quote built with this session.
+            resume_max_age (float, optional): Trust saved cookies younger than this many seconds
+                without checking them with Firstrade. If they turn out to be expired, the first
+                request logs in again. Saved cookies are always checked when not given.
+            scheduler (RequestScheduler, optional): Prioritizes and rate limits requests made with
+                this session. Requests are sent immediately when not given.
+            instrumentation (Instrumentation, optional): Records latency, response size, parse time
+                and re-logins of requests made with this session.
+            adapter (requests.adapters.HTTPAdapter, optional): Transport adapter to mount,
+                i.e. one whose connection pool is shared with other sessions.
+            max_retries (int, optional): Times a request is sent again after a connection error,
+                timeout, 429 or 5xx response. Defaults to 3.
+            backoff (float, optional): Seconds to wait before the first retry, doubled for each
+                further retry. Defaults to 0.5.
+            max_backoff (float, optional): Longest wait between retries in seconds. Defaults to 8.
+            pool_maxsize (int, optional): Maximum connections kept open to Firstrade. Ignored when
+                `adapter` is given. Defaults to 10.
+            pool_block (bool, optional): Wait for a free connection instead of opening one beyond
+                `pool_maxsize` that is closed after use. Defaults to False.
+            http2 (bool, optional): Send requests over multiplexed HTTP/2 connections with
+                `transport.HTTP2Adapter`. Requires httpx. Defaults to False.
+            prewarm (int, optional): Connections to open right after login, so the first requests
+                do not pay for TCP and TLS setup. Defaults to 0.
+            keepalive (float, optional): Send a lightweight request on the prewarmed connections
+                whenever the session has been idle this many seconds. No pings when not given.
+            parse_executor (parsing.ParseExecutor, optional): Parses large responses in worker
+                processes. Responses are parsed in the calling thread when not given.
+            symbol_reference (reference.SymbolReference, optional): Stores the reference data of
+                every quote built with this session, and validates orders against it.
+            parse_cache (cache.ParseCache, optional): Reuses the parse results of balance, position,
+                account status and order status responses that did not change. Every response is
+                parsed when not given.
+            relogin_cooldown (float, optional): Seconds after a failed re-login before the next
+                one is attempted, doubled after each consecutive failure up to 15 minutes.
+                Requests that find the session expired meanwhile raise the login's error. Defaults to 30.
         """
         self.username = username
         self.password = password
         self.pin = pin
         self.profile_path = profile_path
+        self.quote_cache = quote_cache
+        self.quote_recorder = quote_recorder
+        self.resume_max_age = resume_max_age
+        self.scheduler = scheduler
+        self.instrumentation = instrumentation
+        self.parse_executor = parse_executor
+        self.symbol_reference = symbol_reference
+        self.parse_cache = parse_cache
+        self.relogin_cooldown = relogin_cooldown
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.order_book = None
+        self.login_cookies = {}
         self.session = requests.Session()
+        self.session.headers.update(urls.session_headers())
+        if adapter is None:
+            if http2:
+                from firstrade.transport import HTTP2Adapter
+
+                adapter = HTTP2Adapter(max_connections=pool_maxsize)
+            else:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.totp_secret = totp_secret  # Google Authenticator密钥
-        self.login()
+        self.warm_connections = prewarm
+        self._login_state = _LoginState()
+        self._last_used = time.monotonic()
+        self._keepalive = None
+        self._keepalive_stop = threading.Event()
+        self.login(resume=resume_max_age is not None)
+        if prewarm:
+            self.prewarm(prewarm)
+        if keepalive:
+            self.start_keepalive(keepalive)
 
-    def login(self):
+    def login(self, resume=False):
+        """
+        Logs in, reusing saved cookies when they are still valid.
+
+        Args:
+            resume (bool, optional): Skip checking saved cookies younger than
+                `resume_max_age` with Firstrade. Defaults to False.
+        """
         headers = urls.session_headers()
-        cookies = self.load_cookies()
+        cookies, saved_at = load_session(self.username, self.profile_path)
         cookies = requests.utils.cookiejar_from_dict(cookies)
         self.session.cookies.update(cookies)
+        if (
+            resume
+            and saved_at is not None
+            and len(cookies)
+            and time.time() - saved_at < self.resume_max_age
+        ):
+            self.login_cookies = self.session.cookies.get_dict()
+            self._login_state.cookies = self.login_cookies
+            return
         response = self.session.get(
             url=urls.get_xml(), headers=urls.session_headers(), cookies=cookies
         )
@@ -43,64 +355,268 @@ class FTSession:
             raise Exception(
                 "Login failed. Check your credentials or internet connection."
             )
-        if "/cgi-bin/sessionfailed?reason=6" in response.text:
+        if SESSION_FAILED in response.text:
+            # Drop the expired cookies so they are not sent alongside the new ones.
+            self.session.cookies.clear()
             self.session.get(url=urls.login(), headers=headers)
-            data = {
-                "redirect": "",
-                "ft_locale": "en-us",
-                "login.x": "Log In",
-                "username": r"" + self.username,
-                "password": r"" + self.password,
-                "destination_page": "home",
-            }
-
             response = self.session.post(
                 url=urls.login(),
                 headers=headers,
                 cookies=self.session.cookies,
-                data=data,
+                data=login_data(self.username, self.password),
             )
 
             # 检查是否需要输入2FA代码
             if "2FA" in response.text:  # 这里需要根据实际的响应内容来判断
-                totp = pyotp.TOTP(self.totp_secret)
-                two_factor_code = totp.now()
-
                 # 发送2FA验证请求
-                data = {
-                    "two_factor_code": two_factor_code,
-                    # 可能需要其他字段，根据Firstrade的实际要求添加
-                }
                 response = self.session.post(
-                    url=urls.two_factor_auth(),  # 需要定义这个URL
+                    url=urls.two_factor_auth(),
                     headers=headers,
                     cookies=self.session.cookies,
-                    data=data,
+                    data=two_factor_data(self.totp_secret),
                 )
 
                 # 检查2FA验证是否成功
                 if "2FA Failed" in response.text:  # 根据实际响应修改
                     raise Exception("Two-factor authentication failed.")
 
-            data = {
-                "destination_page": "home",
-                "pin": self.pin,
-                "pin.x": "++OK++",
-                "sring": "0",
-                "pin": self.pin,
-            }
-
             self.session.post(
-                url=urls.pin(), headers=headers, cookies=self.session.cookies, data=data
+                url=urls.pin(),
+                headers=headers,
+                cookies=self.session.cookies,
+                data=pin_data(self.pin),
             )
             self.save_cookies()
-        if (
-                "/cgi-bin/sessionfailed?reason=6"
+            if (
+                SESSION_FAILED
                 in self.session.get(
-            url=urls.get_xml(), headers=urls.session_headers(), cookies=cookies
-        ).text
-        ):
-            raise Exception("Login failed. Check your credentials.")
+                    url=urls.get_xml(), headers=urls.session_headers()
+                ).text
+            ):
+                raise Exception("Login failed. Check your credentials.")
+        self.login_cookies = self.session.cookies.get_dict()
+        self._login_state.cookies = self.login_cookies
+
+    def relogin(self, generation, endpoint="other"):
+        """
+        Logs in again after a request found the session expired.
+
+        Only one login runs at a time. Callers that saw the same expired session
+        wait for it and reuse its cookies instead of logging in themselves. If
+        the login fails, they get its exception instead of trying themselves, and
+        no further login is attempted for `relogin_cooldown` seconds, doubled
+        after each consecutive failure, so a wrong password cannot lock the account.
+
+        Args:
+            generation (int): The `login_generation` when the failed request was sent.
+            endpoint (str, optional): Endpoint name of the failed request, for instrumentation.
+
+        Raises:
+            Exception: The error of the failed login, while the cooldown lasts.
+        """
+        state = self._login_state
+        with state.lock:
+            if state.generation == generation:
+                if state.error is not None and time.monotonic() < state.retry_at:
+                    raise state.error
+                if self.instrumentation is not None:
+                    self.instrumentation.record_relogin(endpoint)
+                try:
+                    self.login()
+                except Exception as e:
+                    state.error = e
+                    state.failures += 1
+                    cooldown = self.relogin_cooldown * 2 ** (state.failures - 1)
+                    state.retry_at = time.monotonic() + min(cooldown, MAX_RELOGIN_COOLDOWN)
+                    raise
+                state.error = None
+                state.failures = 0
+                state.generation += 1
+                return
+        self.login_cookies = state.cookies
+        self.session.cookies.update(requests.utils.cookiejar_from_dict(state.cookies))
+
+    @property
+    def login_generation(self):
+        """int: Number of times the session has logged in again since it was created."""
+        return self._login_state.generation
+
+    def request(self, method, url, retry=None, priority=None, on_relogin=None, resend_after_relogin=True, **kwargs):
+        """
+        Sends a request through the underlying session, waiting for the
+        scheduler first if the session has one.
+
+        If the response shows the session has expired, logs in again once
+        (shared with any other request that found it expired at the same time)
+        and sends the request again. Connection errors, timeouts, 429 and 5xx
+        responses are retried up to `max_retries` times with exponential backoff.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The request URL.
+            retry (bool, optional): Whether to retry after connection errors, timeouts,
+                429 and 5xx responses. Defaults to True, except for order and cancel POSTs,
+                which may have reached Firstrade and must not be sent twice.
+            priority (scheduler.Priority, optional): Overrides the scheduler's priority class
+                for the URL's endpoint.
+            on_relogin (callable, optional): Called after logging in again and before the request
+                is sent again, i.e. to select the account the request depends on once more, as a
+                new login starts on the default account.
+            resend_after_relogin (bool, optional): Whether to send the request again after
+                logging in again. If False, the session still logs in again, but SessionExpired
+                is raised instead. Defaults to True.
+
+        Returns:
+            requests.Response: The response.
+
+        Raises:
+            SessionExpired: If the session is still expired after logging in again, or was
+                expired and `resend_after_relogin` is False.
+        """
+        endpoint = urls.endpoint(url)
+        if retry is None:
+            retry = not (method.upper() == "POST" and endpoint in ("orderbar", "cancel_order"))
+        relogged = False
+        attempt = 0
+        while True:
+            generation = self._login_state.generation
+            try:
+                response = self._send(method, url, priority, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not retry or attempt >= self.max_retries:
+                    raise
+                self._wait_retry(endpoint, attempt)
+                attempt += 1
+                continue
+            if response.status_code in RETRY_STATUSES and retry and attempt < self.max_retries:
+                self._wait_retry(endpoint, attempt, response.headers.get("Retry-After"))
+                attempt += 1
+                continue
+            if not session_expired(response):
+                return response
+            if relogged:
+                raise SessionExpired("Session is still expired after logging in again.")
+            if self.instrumentation is not None:
+                self.instrumentation.record_retry(endpoint)
+            self.relogin(generation, endpoint)
+            relogged = True
+            if not resend_after_relogin:
+                raise SessionExpired("Session had expired; logged in again without sending the request again.")
+            if on_relogin is not None:
+                on_relogin()
+
+    def _wait_retry(self, endpoint, attempt, retry_after=None):
+        delay = min(self.max_backoff, self.backoff * 2**attempt) * random.uniform(0.5, 1.0)
+        if retry_after is not None:
+            try:
+                delay = min(self.max_backoff, max(delay, float(retry_after)))
+            except ValueError:
+                pass
+        if self.instrumentation is not None:
+            self.instrumentation.record_retry(endpoint)
+        time.sleep(delay)
+
+    def _send(self, method, url, priority=None, **kwargs):
+        self._last_used = time.monotonic()
+        with self.scheduler.slot(url, priority) if self.scheduler is not None else nullcontext():
+            if self.instrumentation is None:
+                return self.session.request(method, url, **kwargs)
+            start = time.perf_counter()
+            response = self.session.request(method, url, **kwargs)
+            self.instrumentation.record_request(
+                urls.endpoint(url), time.perf_counter() - start, len(response.content)
+            )
+            return response
+
+    def get(self, url, **kwargs):
+        """Sends a GET request. See `request`."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        """Sends a POST request. See `request`."""
+        return self.request("POST", url, data=data, **kwargs)
+
+    def prewarm(self, connections=1):
+        """
+        Opens connections to Firstrade ahead of time by sending lightweight requests at once.
+
+        Failures are ignored; the connections are simply opened later.
+
+        Args:
+            connections (int, optional): Number of connections to open. Defaults to 1.
+        """
+
+        def open_connection(_):
+            try:
+                # Streamed, so the connection stays checked out and each ping opens its own.
+                return self.session.get(url=urls.get_xml(), stream=True, timeout=10)
+            except requests.RequestException:
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, connections)) as executor:
+            responses = list(executor.map(open_connection, range(connections)))
+        for response in responses:
+            if response is not None:
+                response.content
+                response.close()
+
+    def start_keepalive(self, interval=30.0):
+        """
+        Keeps connections warm on a background thread, pinging them whenever
+        the session has not sent a request for `interval` seconds.
+
+        Args:
+            interval (float, optional): Idle seconds before a ping. Defaults to 30.
+        """
+        if self._keepalive is not None:
+            return
+        self._keepalive_stop.clear()
+
+        def run():
+            while not self._keepalive_stop.wait(
+                max(0.0, interval - (time.monotonic() - self._last_used))
+            ):
+                if time.monotonic() - self._last_used >= interval:
+                    self.prewarm(max(1, self.warm_connections))
+                    self._last_used = time.monotonic()
+
+        self._keepalive = threading.Thread(target=run, name="FTSession-keepalive", daemon=True)
+        self._keepalive.start()
+
+    def stop_keepalive(self):
+        """Stops the keep-alive thread started by `start_keepalive`."""
+        self._keepalive_stop.set()
+        if self._keepalive is not None:
+            self._keepalive.join()
+            self._keepalive = None
+
+    def close(self):
+        """Stops the keep-alive thread and closes the connections."""
+        self.stop_keepalive()
+        self.session.close()
+
+    def isolated_copy(self):
+        """
+        Creates a copy of this session with its own cookie jar.
+
+        The copy starts from the cookies the login ended with and shares this
+        session's connection pool, so account-specific requests made through it
+        do not change this session's cookies.
+
+        Returns:
+            FTSession: The copy. Do not close its `session`, as that closes the shared pool.
+        """
+        session = requests.Session()
+        session.headers.update(self.session.headers)
+        for prefix, adapter in self.session.adapters.items():
+            session.mount(prefix, adapter)
+        session.cookies.update(requests.utils.cookiejar_from_dict(self.login_cookies))
+        copy = FTSession.__new__(FTSession)
+        copy.__dict__.update(self.__dict__)
+        copy.session = session
+        copy._keepalive = None
+        copy._keepalive_stop = threading.Event()
+        return copy
 
     def load_cookies(self):
         """
@@ -109,38 +625,15 @@ class FTSession:
         Returns:
             Dict: Dictionary of cookies. Nom Nom
         """
-        cookies = {}
-        directory = os.path.abspath(self.profile_path) if self.profile_path is not None else "."
-        
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-
-        for filename in os.listdir(directory):
-            if filename.endswith(f"{self.username}.pkl"):
-                filepath = os.path.join(directory, filename)
-                with open(filepath, "rb") as f:
-                    cookies = pickle.load(f)
-        return cookies
+        return load_cookies(self.username, self.profile_path)
 
     def save_cookies(self):
         """Saves session cookies to a file."""
-        if self.profile_path is not None:
-            directory = os.path.abspath(self.profile_path)
-            if not os.path.exists(directory):
-                os.makedirs(directory)
-            path = os.path.join(self.profile_path, f"ft_cookies{self.username}.pkl")
-        else:
-            path = f"ft_cookies{self.username}.pkl"
-        with open(path, "wb") as f:
-            pickle.dump(self.session.cookies.get_dict(), f)
+        save_cookies(self.username, self.profile_path, self.session.cookies.get_dict())
     
-    def delete_cookies(self):    
+    def delete_cookies(self):
         """Deletes the session cookies."""
-        if self.profile_path is not None:
-            path = os.path.join(self.profile_path, f"ft_cookies{self.username}.pkl")
-        else:
-            path = f"ft_cookies{self.username}.pkl"
-        os.remove(path)
+        os.remove(cookie_path(self.username, self.profile_path))
 
     def __getattr__(self, name):
         """
@@ -156,125 +649,314 @@ class FTSession:
 
 
 class FTAccountData:
-    """Dataclass for storing account information."""
+    """
+    Dataclass for storing account information.
+
+    Account balances and statuses are fetched the first time they are accessed,
+    or up front with `refresh()`.
+    """
 
     def __init__(self, session):
         """
         Initializes a new instance of the FTAccountData class.
 
+        Only the account list is requested here.
+
         Args:
-            session (requests.Session):
+            session (FTSession):
             The session object used for making HTTP requests.
         """
         self.session = session
-        self.all_accounts = []
         self.account_numbers = []
-        self.account_statuses = []
-        self.account_balances = []
         self.securities_held = {}
-        all_account_info = []
+        self._details = {}
+        self._lock = threading.Lock()
         html_string = self.session.get(
             url=urls.account_list(),
             headers=urls.session_headers(),
             cookies=self.session.cookies,
         ).text
-        regex_accounts = re.findall(r"([0-9]+)-", html_string)
+        self.account_numbers.extend(
+            parse_response(self.session, "account_list", parse_account_numbers, html_string)
+        )
 
-        for match in regex_accounts:
-            self.account_numbers.append(match)
+    @property
+    def all_accounts(self):
+        """list: Balance and status of every account, keyed by account number."""
+        self._ensure_loaded()
+        return [
+            account_info(account, self._details[account][1], self._details[account][0])
+            for account in self.account_numbers
+        ]
 
-        for account in self.account_numbers:
-            # reset cookies to base login cookies to run scripts
-            self.session.cookies.clear()
-            self.session.cookies.update(self.session.load_cookies())
-            # set account to get data for
-            data = {"accountId": account}
-            self.session.post(
+    @property
+    def account_statuses(self):
+        """list: The `margin_v2.php` status data of every account."""
+        self._ensure_loaded()
+        return [self._details[account][0] for account in self.account_numbers]
+
+    @property
+    def account_balances(self):
+        """list: The total account value of every account."""
+        self._ensure_loaded()
+        return [self._details[account][1] for account in self.account_numbers]
+
+    def get_status(self, account):
+        """
+        Gets the status data of an account, fetching it on first access.
+
+        Args:
+            account (str): Account number.
+
+        Returns:
+            dict: The `data` object of the `margin_v2.php` status response.
+        """
+        self._ensure_loaded([account])
+        return self._details[account][0]
+
+    def get_balance(self, account):
+        """
+        Gets the total account value of an account, fetching it on first access.
+
+        Args:
+            account (str): Account number.
+
+        Returns:
+            str: The total account value.
+        """
+        self._ensure_loaded([account])
+        return self._details[account][1]
+
+    def refresh(self, accounts=None, parallel=True, max_workers=8):
+        """
+        Fetches the status and balance of accounts.
+
+        Each account is fetched on its own copy of the session with an isolated
+        cookie jar, because selecting an account changes the session's cookies.
+        The copies share the session's connection pool.
+
+        Args:
+            accounts (list, optional): Account numbers to fetch. Defaults to every account.
+            parallel (bool, optional): Fetch the accounts concurrently. Defaults to True.
+            max_workers (int, optional): Maximum number of accounts fetched at once. Defaults to 8.
+        """
+        accounts = list(self.account_numbers if accounts is None else accounts)
+        if parallel and len(accounts) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(accounts))) as executor:
+                details = list(executor.map(self._fetch_account, accounts))
+        else:
+            details = [self._fetch_account(account) for account in accounts]
+        self._details.update(zip(accounts, details))
+
+    def _ensure_loaded(self, accounts=None):
+        accounts = self.account_numbers if accounts is None else accounts
+        if all(account in self._details for account in accounts):
+            return
+        with self._lock:
+            missing = [account for account in accounts if account not in self._details]
+            if missing:
+                self.refresh(missing)
+
+    def _fetch_account(self, account):
+        session = self.session.isolated_copy()
+
+        # set account to get data for, again after a re-login as that resets it
+        def select_account():
+            session.post(
                 url=urls.account_status(),
                 headers=urls.session_headers(),
-                cookies=self.session.cookies,
-                data=data,
+                cookies=session.cookies,
+                data={"accountId": account},
             )
-            # request to get account status data
-            data = {"req": "get_status"}
-            account_status = self.session.post(
+
+        select_account()
+        # request to get account status data
+        data = {"req": "get_status"}
+        account_status = parse_response(
+            session,
+            "status",
+            json.loads,
+            session.post(
                 url=urls.status(),
                 headers=urls.session_headers(),
-                cookies=self.session.cookies,
+                cookies=session.cookies,
                 data=data,
-            ).json()
-            self.account_statuses.append(account_status["data"])
-            data = {"page": "bal", "account_id": account}
-            account_soup = BeautifulSoup(
-                self.session.post(
-                    url=urls.get_xml(),
-                    headers=urls.session_headers(),
-                    cookies=self.session.cookies,
-                    data=data,
-                ).text,
-                "xml",
-            )
-            balance = account_soup.find("total_account_value").text
-            self.account_balances.append(balance)
-            all_account_info.append(
-                {
-                    account: {
-                        "Balance": balance,
-                        "Status": {
-                            "primary": account_status["data"]["primary"],
-                            "domestic": account_status["data"]["domestic"],
-                            "joint": account_status["data"]["joint"],
-                            "ira": account_status["data"]["ira"],
-                            "hasMargin": account_status["data"]["hasMargin"],
-                            "opLevel": account_status["data"]["opLevel"],
-                            "p_country": account_status["data"]["p_country"],
-                            "mrgnStatus": account_status["data"]["mrgnStatus"],
-                            "opStatus": account_status["data"]["opStatus"],
-                            "margin_id": account_status["data"]["margin_id"],
-                        },
-                    }
-                }
-            )
-
-        self.all_accounts = all_account_info
+                on_relogin=select_account,
+            ).content,
+            key=account,
+        )
+        data = {"page": "bal", "account_id": account}
+        balance = parse_response(
+            session,
+            "get_xml",
+            parse_balance,
+            session.post(
+                url=urls.get_xml(),
+                headers=urls.session_headers(),
+                cookies=session.cookies,
+                data=data,
+                on_relogin=select_account,
+            ).text,
+            key=("bal", account),
+        )
+        return account_status["data"], balance
 
-    def get_positions(self, account):
+    def get_positions(self, account, with_changed=False):
         """Gets currently held positions for a given account.
 
         Args:
             account (str): Account number of the account you want to get positions for.
+            with_changed (bool, optional): Also return whether the positions response differs
+                from the previous one for the account. Always True without a session parse
+                cache. Defaults to False.
 
         Returns:
             self.securities_held {dict}:
-            Dict of held positions with the pos. ticker as the key.
+            Dict of held positions with the pos. ticker as the key. With a session
+            parse cache, each position is a read-only `cache.FrozenDict`.
+            A (securities_held, changed) tuple if `with_changed`.
         """
         data = {
             "page": "pos",
             "accountId": str(account),
         }
-        position_soup = BeautifulSoup(
+        positions, changed = parse_response(
+            self.session,
+            "get_xml",
+            parse_positions,
             self.session.post(
                 url=urls.get_xml(),
                 headers=urls.session_headers(),
                 data=data,
                 cookies=self.session.cookies,
             ).text,
-            "xml",
+            key=("pos", str(account)),
+            with_changed=True,
         )
+        self.securities_held.update(positions)
+        return (self.securities_held, changed) if with_changed else self.securities_held
+
+    def get_all_positions(self, accounts=None, max_workers=8):
+        """
+        Gets currently held positions for many accounts concurrently as a typed, columnar table.
+
+        Unlike `get_positions`, a ticker held in several accounts keeps one row per account.
+        Requires numpy (`pip install firstrade[numpy]`).
+
+        Args:
+            accounts (list, optional): Account numbers to fetch. Defaults to every account.
+            max_workers (int, optional): Maximum number of accounts fetched at once. Defaults to 8.
 
-        tickers = position_soup.find_all("symbol")
-        quantity = position_soup.find_all("quantity")
-        price = position_soup.find_all("price")
-        change = position_soup.find_all("change")
-        change_percent = position_soup.find_all("changepercent")
-        vol = position_soup.find_all("vol")
-        for i, ticker in enumerate(tickers):
-            ticker = ticker.text
-            self.securities_held[ticker] = {
-                "quantity": quantity[i].text,
-                "price": price[i].text,
-                "change": change[i].text,
-                "change_percent": change_percent[i].text,
-                "vol": vol[i].text,
-            }
-        return self.securities_held
+        Returns:
+            PositionsTable: The positions of every requested account.
+        """
+        from firstrade.positions import PositionsTable, parse_position_columns
+
+        accounts = [str(account) for account in (self.account_numbers if accounts is None else accounts)]
+
+        def fetch(account):
+            return parse_response(
+                self.session,
+                "get_xml",
+                parse_position_columns,
+                self.session.post(
+                    url=urls.get_xml(),
+                    headers=urls.session_headers(),
+                    data={"page": "pos", "accountId": account},
+                    cookies=self.session.cookies,
+                ).content,
+                key=("pos", account),
+            )
+
+        if len(accounts) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(accounts))) as executor:
+                columns = list(executor.map(fetch, accounts))
+        else:
+            columns = [fetch(account) for account in accounts]
+        return PositionsTable.from_columns(dict(zip(accounts, columns)))
+
+
+def parse_account_numbers(html_string):
+    """
+    Parses the account numbers out of the `getaccountlist` page.
+
+    Args:
+        html_string (str): Body of the account list response.
+
+    Returns:
+        list: Account numbers as strings.
+    """
+    return re.findall(r"([0-9]+)-", html_string)
+
+
+def parse_balance(xml_string):
+    """
+    Parses the total account value out of a `getxml?page=bal` response.
+
+    Args:
+        xml_string (str): Body of the balance response.
+
+    Returns:
+        str: The total account value.
+    """
+    return BeautifulSoup(xml_string, "xml").find("total_account_value").text
+
+
+def account_info(account, balance, status):
+    """
+    Builds the `FTAccountData.all_accounts` entry for an account.
+
+    Args:
+        account (str): Account number.
+        balance (str): Total account value from `parse_balance`.
+        status (dict): The `data` object of the `margin_v2.php` status response.
+
+    Returns:
+        dict: The account's balance and status keyed by the account number.
+    """
+    return {
+        account: {
+            "Balance": balance,
+            "Status": {
+                "primary": status["primary"],
+                "domestic": status["domestic"],
+                "joint": status["joint"],
+                "ira": status["ira"],
+                "hasMargin": status["hasMargin"],
+                "opLevel": status["opLevel"],
+                "p_country": status["p_country"],
+                "mrgnStatus": status["mrgnStatus"],
+                "opStatus": status["opStatus"],
+                "margin_id": status["margin_id"],
+            },
+        }
+    }
+
+
+def parse_positions(xml_string):
+    """
+    Parses a `getxml?page=pos` response.
+
+    Args:
+        xml_string (str): Body of the positions response.
+
+    Returns:
+        dict: Dict of held positions with the pos. ticker as the key.
+    """
+    position_soup = BeautifulSoup(xml_string, "xml")
+    tickers = position_soup.find_all("symbol")
+    quantity = position_soup.find_all("quantity")
+    price = position_soup.find_all("price")
+    change = position_soup.find_all("change")
+    change_percent = position_soup.find_all("changepercent")
+    vol = position_soup.find_all("vol")
+    positions = {}
+    for i, ticker in enumerate(tickers):
+        positions[ticker.text] = {
+            "quantity": quantity[i].text,
+            "price": price[i].text,
+            "change": change[i].text,
+            "change_percent": change_percent[i].text,
+            "vol": vol[i].text,
+        }
+    return positions
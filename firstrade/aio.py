@@ -0,0 +1,331 @@
+import asyncio
+import ipaddress
+import time
+from urllib.parse import urlsplit
+
+from firstrade import urls
+from firstrade.account import (
+    SESSION_FAILED,
+    account_info,
+    load_cookies,
+    login_data,
+    parse_account_numbers,
+    parse_balance,
+    parse_positions,
+    pin_data,
+    save_cookies,
+    two_factor_data,
+)
+from firstrade.order import (
+    Duration,
+    OrderType,
+    PriceType,
+    order_form,
+    parse_orders,
+    parse_preview,
+    parse_submission,
+)
+from firstrade.symbols import QuoteBatch, SymbolQuote
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:
+    aiohttp = None
+
+
+def _is_ip(url):
+    """Returns True if the host of `url` is an IP address, whose cookies aiohttp refuses by default."""
+    try:
+        ipaddress.ip_address(urlsplit(url).hostname or "")
+    except ValueError:
+        return False
+    return True
+
+
+class AsyncFTSession:
+    """
+    Class creating an asyncio session for Firstrade.
+
+    Uses the same URLs, headers, form data and saved cookies as FTSession, so
+    a user logged in with one can be resumed with the other.
+    Requires `aiohttp` (`pip install firstrade[async]`).
+    """
+
+    def __init__(
+        self,
+        username,
+        password,
+        pin,
+        totp_secret,
+        profile_path=None,
+        limit=100,
+        client_session=None,
+    ):
+        """
+        Initializes a new instance of the AsyncFTSession class.
+
+        The session is not logged in until `login()` is awaited, or the
+        session is entered with `async with`.
+
+        Args:
+            username (str): Firstrade login username.
+            password (str): Firstrade login password.
+            pin (str): Firstrade login pin.
+            totp_secret (str): Secret used to generate 2FA codes.
+            profile_path (str, optional): The path where the session file is saved.
+            limit (int, optional): Maximum number of simultaneous connections. 0 means no limit.
+                Defaults to 100.
+            client_session (aiohttp.ClientSession, optional):
+                Client session to use instead of creating one, i.e. one pointed at a stub server.
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncFTSession requires aiohttp. Install it with `pip install firstrade[async]`."
+            )
+        self.username = username
+        self.password = password
+        self.pin = pin
+        self.totp_secret = totp_secret
+        self.profile_path = profile_path
+        self.limit = limit
+        self.session = client_session
+        self._owns_session = client_session is None
+
+    async def __aenter__(self):
+        try:
+            await self.login()
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _client(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit),
+                headers=urls.session_headers(),
+                cookie_jar=aiohttp.CookieJar(unsafe=_is_ip(urls.BASE_URL)),
+            )
+        return self.session
+
+    async def get(self, url, **kwargs):
+        """
+        Sends a GET request.
+
+        Returns:
+            str: The response body.
+        """
+        async with self._client().get(url, **kwargs) as response:
+            return await response.text()
+
+    async def post(self, url, **kwargs):
+        """
+        Sends a POST request.
+
+        Returns:
+            str: The response body.
+        """
+        async with self._client().post(url, **kwargs) as response:
+            return await response.text()
+
+    async def post_json(self, url, **kwargs):
+        """
+        Sends a POST request.
+
+        Returns:
+            The decoded JSON response body.
+        """
+        async with self._client().post(url, **kwargs) as response:
+            return await response.json(content_type=None)
+
+    async def login(self):
+        """Logs in, reusing saved cookies when they are still valid."""
+        session = self._client()
+        session.cookie_jar.update_cookies(
+            load_cookies(self.username, self.profile_path),
+            response_url=URL(urls.get_xml()),
+        )
+        async with session.get(urls.get_xml()) as response:
+            if response.status != 200:
+                raise Exception(
+                    "Login failed. Check your credentials or internet connection."
+                )
+            text = await response.text()
+        if SESSION_FAILED in text:
+            await self.get(urls.login())
+            text = await self.post(
+                urls.login(), data=login_data(self.username, self.password)
+            )
+            if "2FA" in text:
+                text = await self.post(
+                    urls.two_factor_auth(), data=two_factor_data(self.totp_secret)
+                )
+                if "2FA Failed" in text:
+                    raise Exception("Two-factor authentication failed.")
+            await self.post(urls.pin(), data=pin_data(self.pin))
+            self.save_cookies()
+            if SESSION_FAILED in await self.get(urls.get_xml()):
+                raise Exception("Login failed. Check your credentials.")
+
+    def save_cookies(self):
+        """Saves session cookies to the same file FTSession uses."""
+        save_cookies(
+            self.username,
+            self.profile_path,
+            {cookie.key: cookie.value for cookie in self.session.cookie_jar},
+        )
+
+    async def close(self):
+        """Closes the underlying client session if this object created it."""
+        if self.session is not None and self._owns_session:
+            await self.session.close()
+        self.session = None
+
+
+async def get_quote(ft_session: AsyncFTSession, symbol: str):
+    """
+    Retrieves a quote for a symbol.
+
+    Args:
+        ft_session (AsyncFTSession): The session used for making HTTP requests to Firstrade.
+        symbol (str): The symbol to retrieve the quote for.
+
+    Returns:
+        SymbolQuote: The parsed quote.
+    """
+    data = await ft_session.get(urls.quote(symbol))
+    return SymbolQuote(ft_session, symbol, data=data)
+
+
+async def get_quotes(ft_session: AsyncFTSession, symbols):
+    """
+    Retrieves quotes for many symbols concurrently on the running event loop.
+
+    The number of requests on the wire at once is bounded by the session's `limit`.
+
+    Args:
+        ft_session (AsyncFTSession): The session used for making HTTP requests to Firstrade.
+        symbols (iterable): The symbols to retrieve quotes for. Duplicates are fetched once.
+
+    Returns:
+        QuoteBatch: Quotes, per-symbol errors and request timings keyed by symbol.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    batch = QuoteBatch(ft_session.limit)
+
+    async def fetch(symbol):
+        start = time.perf_counter()
+        try:
+            batch.quotes[symbol] = await get_quote(ft_session, symbol)
+        except Exception as e:
+            batch.errors[symbol] = e
+        batch.timings[symbol] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+    batch.elapsed = time.perf_counter() - start
+    return batch
+
+
+async def get_account_numbers(ft_session: AsyncFTSession):
+    """
+    Retrieves the account numbers of the logged in user.
+
+    Returns:
+        list: Account numbers as strings.
+    """
+    return parse_account_numbers(await ft_session.get(urls.account_list()))
+
+
+async def get_account_info(ft_session: AsyncFTSession, account):
+    """
+    Retrieves the balance and status of an account.
+
+    The account context is switched server-side, so calls for different
+    accounts on the same session must not overlap.
+
+    Args:
+        ft_session (AsyncFTSession): The session used for making HTTP requests to Firstrade.
+        account (str): Account number.
+
+    Returns:
+        dict: The account's balance and status in the `FTAccountData.all_accounts` format.
+    """
+    await ft_session.post(urls.account_status(), data={"accountId": account})
+    account_status = await ft_session.post_json(urls.status(), data={"req": "get_status"})
+    balance = parse_balance(
+        await ft_session.post(
+            urls.get_xml(), data={"page": "bal", "account_id": account}
+        )
+    )
+    return account_info(account, balance, account_status["data"])
+
+
+async def get_positions(ft_session: AsyncFTSession, account):
+    """
+    Gets currently held positions for a given account.
+
+    Args:
+        ft_session (AsyncFTSession): The session used for making HTTP requests to Firstrade.
+        account (str): Account number of the account you want to get positions for.
+
+    Returns:
+        dict: Dict of held positions with the pos. ticker as the key.
+    """
+    return parse_positions(
+        await ft_session.post(
+            urls.get_xml(), data={"page": "pos", "accountId": str(account)}
+        )
+    )
+
+
+async def place_order(
+    ft_session: AsyncFTSession,
+    account,
+    symbol,
+    price_type: PriceType,
+    order_type: OrderType,
+    quantity,
+    duration: Duration,
+    price=0.00,
+    dry_run=True,
+    notional=False,
+):
+    """
+    Builds and places an order. See `Order.place_order`.
+
+    Returns:
+        dict: The order confirmation data.
+    """
+    data = order_form(
+        account, symbol, price_type, order_type, quantity, duration, price, notional
+    )
+    data = {key: str(getattr(value, "value", value)) for key, value in data.items()}
+    order_confirmation = parse_preview(
+        await ft_session.post(urls.orderbar(), data=data), dry_run
+    )
+    if "warning" in order_confirmation:
+        data["viewederror"] = "1"
+    if not dry_run:
+        data["previewOrders"] = ""
+        data["submitOrders"] = "1"
+        order_confirmation = parse_submission(
+            await ft_session.post(urls.orderbar(), data=data), order_confirmation
+        )
+    return order_confirmation
+
+
+async def get_orders(ft_session: AsyncFTSession, account):
+    """
+    Retrieves existing order data for a given account.
+
+    Returns:
+        list: A list of dictionaries, each containing details about an order.
+    """
+    return parse_orders(
+        await ft_session.post(urls.order_list(), data={"accountId": account})
+    )
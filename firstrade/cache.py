@@ -0,0 +1,336 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# Endpoints whose responses often repeat unchanged between polls: balances and
+# positions (get_xml), account status (status) and order status (order_list).
+PARSE_CACHE_ENDPOINTS = ("get_xml", "status", "order_list")
+
+
+class _Call:
+    """A fetch in flight that other callers can wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class QuoteCache:
+    """
+    Thread-safe TTL/LRU cache for quote responses.
+
+    Concurrent requests for the same uncached key share a single fetch.
+
+    Attributes:
+        ttl (float): Seconds a cached entry stays fresh.
+        max_entries (int): Maximum number of entries kept before the least recently used is evicted.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that needed a fetch.
+        coalesced (int): Lookups that waited on another caller's fetch instead of making their own.
+        evictions (int): Entries dropped to stay under `max_entries`.
+    """
+
+    def __init__(self, ttl=0.5, max_entries=1024):
+        """
+        Initializes a new instance of the QuoteCache class.
+
+        Args:
+            ttl (float, optional): Seconds a cached entry stays fresh. Defaults to 0.5.
+            max_entries (int, optional): Maximum number of cached entries. Defaults to 1024.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, fetch, fresh=False):
+        """
+        Returns the cached value for a key, fetching it if missing or expired.
+
+        Args:
+            key (str): The cache key, i.e. the symbol.
+            fetch (callable): Called with no arguments to produce the value on a miss.
+            fresh (bool, optional): Skip the cache and always fetch. The result
+                still refreshes the cached entry. Defaults to False.
+
+        Returns:
+            The cached or newly fetched value.
+        """
+        owner = True
+        with self._lock:
+            if fresh:
+                call = _Call()
+                self.misses += 1
+            else:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                call = self._in_flight.get(key)
+                if call is None:
+                    call = self._in_flight[key] = _Call()
+                    self.misses += 1
+                else:
+                    owner = False
+                    self.coalesced += 1
+
+        if not owner:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fetch()
+        except Exception as e:
+            call.error = e
+            raise
+        else:
+            self._store(key, call.value)
+        finally:
+            with self._lock:
+                if self._in_flight.get(key) is call:
+                    del self._in_flight[key]
+            call.event.set()
+        return call.value
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        """
+        Drops one cached entry, or every entry when no key is given.
+
+        Args:
+            key (str, optional): The key to drop.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: hits, misses, coalesced, evictions and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FrozenDict(dict):
+    """A dict that cannot be changed, so a cached parse result can be shared safely."""
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("Cached parse results cannot be changed; copy them with `dict()` first.")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __copy__(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+def freeze(value):
+    """Returns `value` with every dict turned into a FrozenDict and every list into a tuple, recursively."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class ParseCache:
+    """
+    Memoizes response parsing by a hash of the response body.
+
+    Attach it with `FTSession(..., parse_cache=ParseCache())` and
+    `account.parse_response` looks every response of the cached endpoints up
+    by the BLAKE2b digest of its body before parsing it. An identical body
+    returns the result parsed before, frozen with `freeze` (dicts become
+    FrozenDict and lists become tuples), so it is the very same object:
+    `new is old` is a free "nothing changed" check. Only the `max_entries`
+    most recently used results are kept.
+
+    Because results are frozen, attaching a cache changes what the parsing
+    functions return: `get_orders` returns a tuple of FrozenDict instead of a
+    list of dicts, and the positions in `get_positions` and the balances and
+    statuses of `FTAccountData` are FrozenDicts. Code that appends to or
+    assigns into them must copy them first, i.e. with `list()` or `dict()`.
+
+    Responses are also tracked per endpoint and key (i.e. the account): `parse`
+    returns whether a response differed from the one before it for that key,
+    which `get_orders(..., with_changed=True)` and
+    `get_positions(..., with_changed=True)` hand back to their caller, and
+    `changed` repeats that flag for the calling thread's last response.
+
+    Attributes:
+        endpoints (frozenset): The `urls.endpoint` names whose responses are cached.
+        max_entries (int): Maximum number of parse results kept.
+        hits (int): Parses answered from the cache.
+        misses (int): Responses that had to be parsed.
+        evictions (int): Results dropped to stay under `max_entries`.
+    """
+
+    def __init__(self, max_entries=256, endpoints=PARSE_CACHE_ENDPOINTS):
+        """
+        Initializes a new instance of the ParseCache class.
+
+        Args:
+            max_entries (int, optional): Maximum number of parse results kept. Defaults to 256.
+            endpoints (iterable, optional): Endpoint names whose responses are cached.
+                Defaults to `PARSE_CACHE_ENDPOINTS`.
+        """
+        self.endpoints = frozenset(endpoints)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._digests = OrderedDict()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def parse(self, endpoint, parse, parser, payload, args=(), key=None):
+        """
+        Returns the parse result of a response, from the cache if its body was parsed before,
+        and whether the body differs from the previous one for the endpoint and key.
+
+        Args:
+            endpoint (str): The endpoint name from `urls.endpoint` the response came from.
+            parse (callable): Called with `parser`, `payload` and `args` on a miss, i.e. to time it.
+            parser (callable): The response parser.
+            payload (bytes or str): The response body.
+            args (tuple, optional): Further arguments of the parser. Must be hashable.
+            key (hashable, optional): What the response is for within the endpoint, i.e. the account.
+
+        Returns:
+            tuple: The frozen parse result, or the unfrozen result if `args` is not hashable,
+                and True if the body changed or is the first one seen for the key.
+        """
+        try:
+            hash(args)
+        except TypeError:
+            return parse(parser, payload, *args), True
+        digest = hashlib.blake2b(
+            payload.encode("utf-8") if isinstance(payload, str) else payload, digest_size=16
+        ).digest()
+        entry_key = (parser, args, digest)
+        slot = (endpoint, key)
+        with self._lock:
+            changed = self._digests.get(slot) != digest
+            result = self._entries.get(entry_key, self)
+            if result is not self:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                self._seen(slot, digest, changed)
+                return result, changed
+            self.misses += 1
+        # A body that fails to parse is not recorded, so the next identical one is still a change.
+        result = freeze(parse(parser, payload, *args))
+        with self._lock:
+            self._entries[entry_key] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._seen(slot, digest, changed)
+        return result, changed
+
+    def _seen(self, slot, digest, changed):
+        # Called with the lock held.
+        self._digests.pop(slot, None)
+        self._digests[slot] = digest
+        if len(self._digests) > self.max_entries:
+            self._digests.popitem(last=False)
+        last_changed = self._last_changed()
+        last_changed.pop(slot, None)
+        last_changed[slot] = changed
+        if len(last_changed) > self.max_entries:
+            last_changed.popitem(last=False)
+
+    def _last_changed(self):
+        last_changed = getattr(self._local, "changed", None)
+        if last_changed is None:
+            last_changed = self._local.changed = OrderedDict()
+        return last_changed
+
+    def changed(self, endpoint, key=None):
+        """
+        Returns whether the last response the calling thread parsed for an endpoint
+        and key differed from the one before it.
+
+        The flag is kept per thread, for the `max_entries` keys the thread parsed
+        last. It only describes the call it follows if nothing else parsed a
+        response for the key in between on this thread; pass `with_changed=True`
+        to `get_orders` or `get_positions` to get the flag of the call itself.
+
+        Args:
+            endpoint (str): The endpoint name, i.e. "order_list".
+            key (hashable, optional): The key the responses were parsed under, i.e. the account.
+
+        Returns:
+            bool: True if it changed or is the first one seen.
+        """
+        return self._last_changed().get((endpoint, key), True)
+
+    @property
+    def hit_rate(self):
+        """float: Fraction of parses answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        """Drops every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+        self._local = threading.local()
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, hit_rate and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hit_rate,
+                "size": len(self._entries),
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,133 @@
+"""
+Command line client for Firstrade.
+
+`firstrade daemon` logs in once and keeps the session warm; the other
+commands send a request to the daemon over a Unix socket and print the JSON
+result. The client only uses the standard library so that it starts quickly.
+
+Credentials for the daemon are read from the FIRSTRADE_USERNAME,
+FIRSTRADE_PASSWORD, FIRSTRADE_PIN and FIRSTRADE_TOTP_SECRET environment variables.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+
+def default_socket_path():
+    """Returns $FIRSTRADE_SOCKET, or firstrade-<uid>.sock in the runtime or temp directory."""
+    if os.environ.get("FIRSTRADE_SOCKET"):
+        return os.environ["FIRSTRADE_SOCKET"]
+    directory = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(directory, f"firstrade-{os.getuid()}.sock")
+
+
+def send(socket_path, command, timeout=30.0, **args):
+    """
+    Sends one command to the daemon and returns its result.
+
+    Args:
+        socket_path (str): Path of the daemon's Unix socket.
+        command (str): The command name, i.e. "quote".
+        timeout (float, optional): Seconds to wait for the daemon. Defaults to 30.
+        **args: The command's arguments.
+
+    Returns:
+        The command's result.
+
+    Raises:
+        RuntimeError: If the daemon reports an error.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps({"command": command, "args": args}).encode() + b"\n")
+        with client.makefile("rb") as reader:
+            response = json.loads(reader.readline())
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return response["result"]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="firstrade", description="Unofficial Firstrade command line client.")
+    parser.add_argument("--socket", default=default_socket_path(), help="path of the daemon socket")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    daemon = commands.add_parser("daemon", help="log in and serve the other commands")
+    daemon.add_argument("--profile-path", help="directory to keep the session file in")
+    daemon.add_argument("--quote-ttl", type=float, default=1.0, help="seconds to serve quotes from cache")
+
+    commands.add_parser("ping", help="check that the daemon is running")
+    commands.add_parser("shutdown", help="stop the daemon")
+
+    quote = commands.add_parser("quote", help="get quotes")
+    quote.add_argument("symbols", nargs="+")
+    quote.add_argument("--fresh", action="store_true", help="bypass the daemon's quote cache")
+
+    positions = commands.add_parser("positions", help="get held positions")
+    positions.add_argument("accounts", nargs="*", help="defaults to every account")
+
+    orders = commands.add_parser("orders", help="get the orders of an account")
+    orders.add_argument("account")
+
+    preview = commands.add_parser("preview", help="preview an order without placing it")
+    preview.add_argument("account")
+    preview.add_argument("symbol")
+    preview.add_argument("quantity", type=float)
+    preview.add_argument("--side", choices=["B", "S", "SS", "BC"], default="B", help="order type, defaults to B (buy)")
+    preview.add_argument("--price-type", choices=["1", "2", "3", "4", "5", "6"], default="1",
+                         help="PriceType value, defaults to 1 (market)")
+    preview.add_argument("--duration", choices=["0", "1", "A", "P", "D"], default="0",
+                         help="Duration value, defaults to 0 (day)")
+    preview.add_argument("--price", type=float, default=0.00)
+    preview.add_argument("--notional", action="store_true", help="quantity is a dollar amount")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "daemon":
+        from firstrade import daemon
+
+        try:
+            credentials = [
+                os.environ[name]
+                for name in ("FIRSTRADE_USERNAME", "FIRSTRADE_PASSWORD", "FIRSTRADE_PIN", "FIRSTRADE_TOTP_SECRET")
+            ]
+        except KeyError as e:
+            sys.exit(f"firstrade: {e.args[0]} is not set")
+        daemon.run(*credentials, args.socket, args.profile_path, args.quote_ttl)
+        return 0
+
+    command_args = {}
+    if args.command == "quote":
+        command_args = {"symbols": args.symbols, "fresh": args.fresh}
+    elif args.command == "positions":
+        command_args = {"accounts": args.accounts or None}
+    elif args.command == "orders":
+        command_args = {"account": args.account}
+    elif args.command == "preview":
+        command_args = {
+            "account": args.account,
+            "symbol": args.symbol,
+            "quantity": args.quantity,
+            "order_type": args.side,
+            "price_type": args.price_type,
+            "duration": args.duration,
+            "price": args.price,
+            "notional": args.notional,
+        }
+    try:
+        result = send(args.socket, args.command, **command_args)
+    except (OSError, RuntimeError) as e:
+        sys.exit(f"firstrade: {e}")
+    json.dump(result, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import json
+import os
+import socketserver
+import threading
+
+from firstrade.account import FTAccountData, FTSession
+from firstrade.cache import QuoteCache
+from firstrade.order import Duration, Order, OrderType, PriceType, get_orders
+from firstrade.symbols import QUOTE_FIELDS, get_quotes
+
+
+class FTDaemon:
+    """
+    Holds a logged in FTSession and answers commands sent over a Unix socket.
+
+    Each request is one line of JSON, `{"command": ..., "args": {...}}`, and
+    each response is one line of JSON, `{"ok": true, "result": ...}` or
+    `{"ok": false, "error": ...}`. Orders can only be previewed, never submitted.
+    """
+
+    def __init__(self, ft_session: FTSession, socket_path):
+        """
+        Initializes a new instance of the FTDaemon class.
+
+        Args:
+            ft_session (FTSession): The logged in session to serve from.
+            socket_path (str): Path of the Unix socket to listen on.
+        """
+        self.ft_session = ft_session
+        self.socket_path = socket_path
+        self._account_data = None
+        self._lock = threading.Lock()
+        self._server = None
+        self.commands = {
+            "ping": self.ping,
+            "quote": self.quote,
+            "positions": self.positions,
+            "orders": self.orders,
+            "preview": self.preview,
+            "shutdown": self.shutdown,
+        }
+
+    @property
+    def account_data(self):
+        """FTAccountData, created on first use."""
+        with self._lock:
+            if self._account_data is None:
+                self._account_data = FTAccountData(self.ft_session)
+            return self._account_data
+
+    def ping(self):
+        return {"username": self.ft_session.username, "pid": os.getpid()}
+
+    def quote(self, symbols, fresh=False):
+        # A symbol that fails gets {"error": ...} instead of failing the whole command.
+        batch = get_quotes(self.ft_session, symbols, fresh=fresh)
+        result = {}
+        for symbol in dict.fromkeys(symbols):
+            if symbol in batch.errors:
+                error = batch.errors[symbol]
+                result[symbol] = {"error": f"{type(error).__name__}: {error}"}
+            else:
+                result[symbol] = {name: getattr(batch[symbol], name) for name in QUOTE_FIELDS}
+        return result
+
+    def positions(self, accounts=None):
+        account_data = self.account_data
+        result = {}
+        with self._lock:
+            for account in accounts or account_data.account_numbers:
+                account_data.securities_held = {}
+                result[account] = account_data.get_positions(account)
+        return result
+
+    def orders(self, account):
+        return get_orders(self.ft_session, account)
+
+    def preview(
+        self,
+        account,
+        symbol,
+        quantity,
+        order_type="B",
+        price_type="1",
+        duration="0",
+        price=0.00,
+        notional=False,
+    ):
+        order = Order(self.ft_session)
+        order.place_order(
+            account,
+            symbol,
+            PriceType(price_type),
+            OrderType(order_type),
+            quantity,
+            Duration(duration),
+            price=price,
+            dry_run=True,
+            notional=notional,
+        )
+        return order.order_confirmation
+
+    def shutdown(self):
+        threading.Thread(target=self._server.shutdown, daemon=True).start()
+        return "stopping"
+
+    def handle(self, request):
+        """Runs one decoded request and returns the response object."""
+        try:
+            command = self.commands[request["command"]]
+            return {"ok": True, "result": command(**request.get("args", {}))}
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    def serve_forever(self):
+        """Listens on the socket until the `shutdown` command is received."""
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        response = daemon.handle(json.loads(line))
+                    except ValueError as e:
+                        response = {"ok": False, "error": f"Bad request: {e}"}
+                    self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+                    self.wfile.flush()
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        old_umask = os.umask(0o077)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+def run(username, password, pin, totp_secret, socket_path, profile_path=None, quote_ttl=1.0):
+    """
+    Logs in and serves commands on `socket_path` until told to shut down.
+
+    Args:
+        username (str): Firstrade login username.
+        password (str): Firstrade login password.
+        pin (str): Firstrade login pin.
+        totp_secret (str): Secret used to generate 2FA codes.
+        socket_path (str): Path of the Unix socket to listen on.
+        profile_path (str, optional): The path where the session file is saved.
+        quote_ttl (float, optional): Seconds quotes are served from cache. Defaults to 1.0.
+    """
+    ft_session = FTSession(
+        username,
+        password,
+        pin,
+        totp_secret,
+        profile_path,
+        quote_cache=QuoteCache(ttl=quote_ttl),
+    )
+    FTDaemon(ft_session, socket_path).serve_forever()
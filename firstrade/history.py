@@ -0,0 +1,263 @@
+import bisect
+import math
+import os
+import struct
+import threading
+import time
+
+from firstrade._util import np, require_numpy
+
+MAGIC = b"FTQH"
+VERSION = 1
+HEADER = struct.Struct("<4sII")
+RECORD = struct.Struct("<7d4qi")
+RECORD_FIELDS = (
+    ("time", "<f8"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("last", "<f8"),
+    ("change", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("bid_size", "<i8"),
+    ("ask_size", "<i8"),
+    ("last_size", "<i8"),
+    ("volume", "<i8"),
+    ("quote_time", "<i4"),
+)
+SUFFIX = ".quotes"
+
+
+def quote_dtype():
+    """Returns the NumPy structured dtype of one record, matching the on-disk layout."""
+    require_numpy("Reading quote history")
+    return np.dtype(list(RECORD_FIELDS))
+
+
+def _float(value):
+    return value if isinstance(value, float) else math.nan
+
+
+def _seconds(text):
+    """Seconds since midnight of a `hh:mm:ss AM ET mm/dd/yyyy` quote time (12-hour clock), or -1."""
+    clock, _, rest = text.partition(" ")
+    try:
+        hours, minutes, seconds = clock.split(":")
+        hours = int(hours)
+        if rest.startswith("PM"):
+            hours = hours % 12 + 12
+        elif rest.startswith("AM"):
+            hours %= 12
+        return hours * 3600 + int(minutes) * 60 + int(seconds)
+    except ValueError:
+        return -1
+
+
+def _volume(text):
+    if "," in text:
+        text = text.replace(",", "")
+    return int(text) if text.isdigit() else -1
+
+
+def _day(timestamp):
+    return time.strftime("%Y%m%d", time.localtime(timestamp))
+
+
+class QuoteRecorder:
+    """
+    Appends SymbolQuote snapshots to fixed-width binary files, one per symbol per day.
+
+    Files live in `<directory>/<YYYYMMDD>/<SYMBOL>.quotes`: a 12-byte header
+    followed by records in the layout of `quote_dtype()`, in the order they were
+    recorded. Each record is written straight to the file, so readers see it at
+    once. Attach a recorder with `FTSession(..., quote_recorder=QuoteRecorder(path))`
+    to record every quote built with that session.
+
+    A quote identical to the symbol's previous record, i.e. one served from the
+    quote cache, is not recorded again.
+
+    Records are stored row by row rather than one file region per column: a
+    quote is then a single append that readers see whole, with no preallocated
+    column regions to grow or remap. QuoteHistory still reads any field as a
+    column, a strided NumPy view such as `records["last"]`.
+
+    Attributes:
+        recorded (int): Number of records written.
+    """
+
+    def __init__(self, directory):
+        """
+        Initializes a new instance of the QuoteRecorder class.
+
+        Args:
+            directory (str): Directory to write the files in. Created if missing.
+        """
+        self.directory = directory
+        self.recorded = 0
+        self._files = {}
+        self._last = {}
+        self._day = None
+        self._day_end = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, quote, timestamp=None):
+        """
+        Appends one quote.
+
+        Args:
+            quote (SymbolQuote): The quote to record.
+            timestamp (float, optional): Unix time of the snapshot. Defaults to now.
+        """
+        values = (
+            quote.bid,
+            quote.ask,
+            quote.last,
+            quote.change,
+            _float(quote.high),
+            _float(quote.low),
+            quote.bid_size,
+            quote.ask_size,
+            quote.last_size,
+            _volume(quote.volume),
+            _seconds(quote.quote_time),
+        )
+        with self._lock:
+            if self._last.get(quote.symbol) == values:
+                return
+            self._last[quote.symbol] = values
+            timestamp = time.time() if timestamp is None else timestamp
+            os.write(self._file(quote.symbol, timestamp), RECORD.pack(timestamp, *values))
+            self.recorded += 1
+
+    def _file(self, symbol, timestamp):
+        if not self._day_end > timestamp:
+            self._close_files()
+            self._day = _day(timestamp)
+            tomorrow = time.localtime(timestamp + 86400)
+            self._day_end = time.mktime(
+                (tomorrow.tm_year, tomorrow.tm_mon, tomorrow.tm_mday, 0, 0, 0, 0, 0, -1)
+            )
+        fd = self._files.get(symbol)
+        if fd is None:
+            directory = os.path.join(self.directory, self._day)
+            os.makedirs(directory, exist_ok=True)
+            fd = os.open(os.path.join(directory, symbol + SUFFIX), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            if os.fstat(fd).st_size == 0:
+                os.write(fd, HEADER.pack(MAGIC, VERSION, RECORD.size))
+            self._files[symbol] = fd
+        return fd
+
+    def _close_files(self):
+        for fd in self._files.values():
+            os.close(fd)
+        self._files = {}
+
+    def close(self):
+        """Closes every open file."""
+        with self._lock:
+            self._close_files()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class QuoteHistory:
+    """
+    Reads files written by QuoteRecorder as memory-mapped NumPy arrays.
+
+    Only the pages a query touches are read from disk. Records are in time
+    order, so time ranges are found with a binary search on the `time` column.
+    """
+
+    def __init__(self, directory):
+        """
+        Initializes a new instance of the QuoteHistory class.
+
+        Args:
+            directory (str): The directory a QuoteRecorder writes to.
+        """
+        require_numpy("Reading quote history")
+        self.directory = directory
+        self.dtype = quote_dtype()
+
+    def days(self, symbol=None):
+        """Returns the recorded days as sorted `YYYYMMDD` strings, only those with `symbol` if given."""
+        try:
+            days = sorted(name for name in os.listdir(self.directory) if name.isdigit())
+        except FileNotFoundError:
+            return []
+        if symbol is None:
+            return days
+        return [day for day in days if os.path.exists(self._path(symbol, day))]
+
+    def symbols(self, day):
+        """Returns the symbols recorded on a day."""
+        try:
+            names = os.listdir(os.path.join(self.directory, day))
+        except FileNotFoundError:
+            return []
+        return sorted(name[: -len(SUFFIX)] for name in names if name.endswith(SUFFIX))
+
+    def _path(self, symbol, day):
+        return os.path.join(self.directory, day, symbol + SUFFIX)
+
+    def load(self, symbol, day):
+        """
+        Maps one symbol's records for one day.
+
+        Args:
+            symbol (str): The symbol.
+            day (str): The day as `YYYYMMDD`.
+
+        Returns:
+            numpy.ndarray: Read-only memory-mapped structured array, empty if nothing was recorded.
+        """
+        path = self._path(symbol, day)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return np.empty(0, self.dtype)
+        with open(path, "rb") as f:
+            magic, version, record_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or record_size != self.dtype.itemsize:
+            raise ValueError(f"{path} is not a version {VERSION} quote history file.")
+        count = (size - HEADER.size) // record_size
+        if count == 0:
+            return np.empty(0, self.dtype)
+        return np.memmap(path, self.dtype, mode="r", offset=HEADER.size, shape=(count,))
+
+    def query(self, symbol, start=None, end=None):
+        """
+        Returns a symbol's records with `start <= time < end`.
+
+        Args:
+            symbol (str): The symbol.
+            start (float, optional): Unix time of the first record. Defaults to the first recorded.
+            end (float, optional): Unix time after the last record. Defaults to the last recorded.
+
+        Returns:
+            numpy.ndarray: A view into the memory-mapped file when the range lies
+                within one day, otherwise a copy of the records of every day in range.
+        """
+        first = _day(start) if start is not None else None
+        last = _day(end) if end is not None else None
+        parts = []
+        for day in self.days(symbol):
+            if (first is not None and day < first) or (last is not None and day > last):
+                continue
+            records = self.load(symbol, day)
+            # bisect reads only the ~log2(n) records it compares, where searchsorted
+            # would first copy the whole strided column into memory.
+            times = records["time"]
+            low = 0 if start is None else bisect.bisect_left(times, start)
+            high = len(records) if end is None else bisect.bisect_left(times, end)
+            if high > low:
+                parts.append(records[low:high])
+        if not parts:
+            return np.empty(0, self.dtype)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
@@ -0,0 +1,187 @@
+import bisect
+import threading
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+PARSE_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket streaming histogram.
+
+    Memory use does not grow with the number of observations. Quantiles are
+    estimated by interpolating within a bucket.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Estimates the q-quantile (0 <= q <= 1), or returns None if nothing was observed."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                if i == len(self.bounds):
+                    return lower
+                return lower + (self.bounds[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Instrumentation:
+    """
+    Collects per-endpoint request latency, response size, parse time and
+    retry and re-login counts.
+
+    Attach one to FTSession with `FTSession(..., instrumentation=Instrumentation())`.
+    Endpoints are the names returned by `urls.endpoint`. Callbacks added with
+    `subscribe` are called with `(kind, endpoint, value)` for every observation,
+    where kind is one of "request", "response_bytes", "parse", "retry" or "relogin".
+    """
+
+    def __init__(
+        self,
+        latency_buckets=LATENCY_BUCKETS,
+        size_buckets=SIZE_BUCKETS,
+        parse_buckets=PARSE_BUCKETS,
+    ):
+        """
+        Initializes a new instance of the Instrumentation class.
+
+        Args:
+            latency_buckets (tuple, optional): Upper bounds in seconds of the request latency buckets.
+            size_buckets (tuple, optional): Upper bounds in bytes of the response size buckets.
+            parse_buckets (tuple, optional): Upper bounds in seconds of the parse time buckets.
+        """
+        self._bounds = {
+            "request": latency_buckets,
+            "response_bytes": size_buckets,
+            "parse": parse_buckets,
+        }
+        self._histograms = {kind: {} for kind in self._bounds}
+        self._counters = {"retry": {}, "relogin": {}}
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """Adds a callback called with `(kind, endpoint, value)` for every observation."""
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        """Removes a callback added with `subscribe`."""
+        self._callbacks.remove(callback)
+
+    def _observe(self, kind, endpoint, value):
+        with self._lock:
+            histogram = self._histograms[kind].get(endpoint)
+            if histogram is None:
+                histogram = self._histograms[kind][endpoint] = Histogram(self._bounds[kind])
+            histogram.observe(value)
+        for callback in self._callbacks:
+            callback(kind, endpoint, value)
+
+    def _increment(self, kind, endpoint):
+        with self._lock:
+            self._counters[kind][endpoint] = self._counters[kind].get(endpoint, 0) + 1
+        for callback in self._callbacks:
+            callback(kind, endpoint, 1)
+
+    def record_request(self, endpoint, seconds, response_bytes):
+        """Records the latency and body size of one request."""
+        self._observe("request", endpoint, seconds)
+        self._observe("response_bytes", endpoint, response_bytes)
+
+    def record_parse(self, endpoint, seconds):
+        """Records the time spent parsing one response."""
+        self._observe("parse", endpoint, seconds)
+
+    def record_retry(self, endpoint):
+        """Records that a request was sent again."""
+        self._increment("retry", endpoint)
+
+    def record_relogin(self, endpoint):
+        """Records that a request found the session expired and logged in again."""
+        self._increment("relogin", endpoint)
+
+    def snapshot(self):
+        """
+        Returns the collected metrics.
+
+        Returns:
+            dict: For each kind, the count, sum and estimated p50/p90/p99 keyed by endpoint,
+                and the retry and relogin counts keyed by endpoint.
+        """
+        with self._lock:
+            result = {
+                kind: {endpoint: histogram.snapshot() for endpoint, histogram in histograms.items()}
+                for kind, histograms in self._histograms.items()
+            }
+            for kind, counts in self._counters.items():
+                result[kind] = dict(counts)
+        return result
+
+    def prometheus(self, prefix="firstrade"):
+        """
+        Returns the collected metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): Prefix of every metric name. Defaults to "firstrade".
+
+        Returns:
+            str: The metrics.
+        """
+        families = (
+            ("request", "request_seconds", "Request latency in seconds."),
+            ("response_bytes", "response_bytes", "Response body size in bytes."),
+            ("parse", "parse_seconds", "Response parse time in seconds."),
+        )
+        lines = []
+        with self._lock:
+            for kind, name, help_text in families:
+                name = f"{prefix}_{name}"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for endpoint, histogram in sorted(self._histograms[kind].items()):
+                    label = f'endpoint="{endpoint}"'
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{label},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{name}_sum{{{label}}} {histogram.sum:.9g}")
+                    lines.append(f"{name}_count{{{label}}} {histogram.count}")
+            for kind in ("retry", "relogin"):
+                name = f"{prefix}_{kind}s_total"
+                lines.append(f"# HELP {name} Number of {kind}s.")
+                lines.append(f"# TYPE {name} counter")
+                for endpoint, count in sorted(self._counters[kind].items()):
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {count}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,517 @@
+"""
+Local stand-in for the Firstrade endpoints in `firstrade.urls`, for end-to-end
+and load testing without an account.
+
+    with MockFirstrade(latency=0.05, jitter=0.02) as server:
+        urls.set_base_url(server.base_url)
+        ft_session = FTSession("mock", "mock", "1234", None)
+
+Run it on its own with `python -m firstrade.mockserver --port 8080`.
+"""
+
+import argparse
+import json
+import random
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pyotp
+
+from firstrade import urls
+from firstrade.account import SESSION_FAILED
+
+SESSION_COOKIE = "ft_mock_session"
+FINAL_AFTER = 5.0
+
+QUOTE = """<?xml version="1.0" encoding="UTF-8"?>
+<response>
+<quote>
+<symbol>{symbol}</symbol>
+<underlying_symbol>{symbol}</underlying_symbol>
+<tick>0.01</tick>
+<exchange>NASDAQ</exchange>
+<bid>{bid:.2f}</bid>
+<ask>{ask:.2f}</ask>
+<last>{last:.3f}</last>
+<bidsize>{bid_size:,}</bidsize>
+<asksize>{ask_size:,}</asksize>
+<lastsize>100</lastsize>
+<bidmmid>NSDQ</bidmmid>
+<askmmid>ARCA</askmmid>
+<lastmmid>NSDQ</lastmmid>
+<change>{change:.3f}</change>
+<high>{high:.2f}</high>
+<low>{low:.2f}</low>
+<changecolor>{color}</changecolor>
+<vol>{volume:,}</vol>
+<bidxask>{bid:.2f} x {ask:.2f}</bidxask>
+<quotetime>{time}</quotetime>
+<lasttradetime>{time}</lasttradetime>
+<realtime>T</realtime>
+<fractional>T</fractional>
+<errcode>0</errcode>
+<companyname>{symbol} CORP</companyname>
+</quote>
+</response>
+"""
+
+BALANCE = """<?xml version="1.0" encoding="UTF-8"?>
+<response>
+<total_account_value>{total:,.2f}</total_account_value>
+<cash_balance>{cash:,.2f}</cash_balance>
+<buying_power>{buying_power:,.2f}</buying_power>
+<market_value>{market_value:,.2f}</market_value>
+</response>
+"""
+
+POSITION = (
+    "<position><symbol>{symbol}</symbol><quantity>{quantity:g}</quantity><price>{price:.3f}</price>"
+    "<change>{change:.3f}</change><changepercent>{percent:.2f}</changepercent><vol>{volume:,}</vol></position>\n"
+)
+
+ORDERBAR = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    "<response>\n"
+    "<success>{success}</success>\n"
+    '<actiondata><![CDATA[<div class="msg_bg"><div class="yellow box"><div class="error_msg"><div class="outbox">'
+    '<div class="inbox">{warning}</div></div></div></div></div>{body}]]></actiondata>\n'
+    "<errcode>{errcode}</errcode>\n"
+    "</response>\n"
+)
+
+ORDER_TABLE = (
+    '<table class="order_preview"><tr><th>Account</th><th>Action</th><th>Quantity</th><th>Symbol</th>'
+    "<th>Price Type</th><th>Price</th><th>Duration</th><th>Estimated Amount</th></tr><tr><td>XXXX{account}</td>"
+    "<td>{action}</td><td>{quantity}</td><td>{symbol}</td><td>{price_type}</td><td>{price}</td><td>{duration}</td>"
+    "<td>${amount:,.2f}</td></tr></table>"
+)
+
+ORDER_ROW = (
+    '<tr class="odd">\n<td>{date}<br>{time}</td><td>{action}</td><td>{quantity}</td><td><a href="#" class="info" '
+    "onmouseover=\"tooltip.show('&lt;div&gt;&lt;b&gt;Order Ref #: {ref}&lt;/b&gt;&lt;br&gt;Account: XXXX{account}"
+    "&lt;/div&gt;');\" onmouseout=\"tooltip.hide();\">{symbol}</a></td><td>{price_type}</td><td>{price:.2f}</td>"
+    "<td>{duration}</td><td></td><td><strong>{status}</strong></td><td></td>\n</tr>\n"
+)
+
+ORDER_STATUS = """<!DOCTYPE html>
+<html>
+<head><title>Order Status</title></head>
+<body>
+<div id="maincontent">
+<table class="tablesorter" id="order_status">
+<thead>
+<tr><th>Date/Time</th><th>Transaction</th><th>Quantity</th><th>Symbol</th><th>Type</th>\
+<th>Price</th><th>Duration</th><th>Instr.</th><th>Status</th><th>Action</th></tr>
+</thead>
+<tbody>
+{rows}</tbody>
+</table>
+</div>
+</body>
+</html>
+"""
+
+ACTIONS = {"B": "Buy", "S": "Sell", "SS": "Sell Short", "BC": "Buy to Cover"}
+PRICE_TYPES = {"1": "Market", "2": "Limit", "3": "Stop", "4": "Stop Limit", "5": "Trailing Stop $", "6": "Trailing Stop %"}
+DURATIONS = {"0": "Day", "1": "GT90", "A": "Pre-Market", "P": "After-Market", "D": "Day+EXT"}
+HOLDINGS = (("INTC", 120), ("AAPL", 15.5), ("VTI", 48), ("F", 300))
+
+
+class MockFirstrade:
+    """
+    HTTP server answering the Firstrade endpoints with realistic payloads.
+
+    Logging in follows FTSession's flow: the login form, a 2FA step when
+    `totp_secret` is given, then the PIN. Quotes follow a random walk per
+    symbol. Submitted orders show in `orderstatus` as Open, and market
+    orders turn Executed after `FINAL_AFTER` seconds. Open orders can be
+    cancelled through `cancelorder`.
+
+    Like Firstrade, the status and balance pages answer for the account last
+    selected through `account_status` in the same session, or the first
+    account if none was. Each account has its own cash balance, and balances
+    value the holdings at their opening prices, so a balance tells which
+    account it belongs to.
+
+    Attributes:
+        base_url (str): URL to pass to `urls.set_base_url` once started.
+        requests (dict): Number of requests served, keyed by `urls.endpoint` name.
+        latency (float): Seconds added to every response.
+        jitter (float): Up to this many extra seconds, drawn uniformly, added to every response.
+        error_rate (float): Fraction of requests of logged in sessions answered with a 503.
+        expire_rate (float): Fraction of requests that find their session expired.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        username="mock",
+        password="mock",
+        pin="1234",
+        totp_secret=None,
+        accounts=("12345678", "23456789"),
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        expire_rate=0.0,
+        seed=None,
+    ):
+        """
+        Initializes a new instance of the MockFirstrade class. The server starts with `start()`.
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on. Defaults to 0, any free port.
+            username (str, optional): Accepted login username. Defaults to "mock".
+            password (str, optional): Accepted login password. Defaults to "mock".
+            pin (str, optional): Accepted PIN. Defaults to "1234".
+            totp_secret (str, optional): Ask for a 2FA code generated from this secret after the password.
+            accounts (iterable, optional): Account numbers of the user.
+            latency (float, optional): Seconds added to every response. Defaults to 0.
+            jitter (float, optional): Up to this many extra seconds added to every response. Defaults to 0.
+            error_rate (float, optional): Fraction of requests of logged in sessions answered with a 503.
+                The login flow, which the client does not retry, is never failed. Defaults to 0.
+            expire_rate (float, optional): Fraction of requests that find their session expired. Defaults to 0.
+            seed (int, optional): Seed for the quotes and injected failures.
+        """
+        self.username = username
+        self.password = password
+        self.pin = pin
+        self.totp_secret = totp_secret
+        self.accounts = [str(account) for account in accounts]
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.expire_rate = expire_rate
+        self.requests = {}
+        self._random = random.Random(seed)
+        self._sessions = {}
+        self._selected = {}
+        self._expire_after = {}
+        self._expiring = set()
+        self._prices = {}
+        self._orders = {account: [] for account in self.accounts}
+        self._next_ref = 40112233
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+        self.base_url = f"http://{self._server.server_address[0]}:{self._server.server_address[1]}"
+
+    def start(self):
+        """Serves requests on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="MockFirstrade", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def expire_sessions(self):
+        """Expires every logged in session, as Firstrade does overnight."""
+        with self._lock:
+            self._sessions.clear()
+
+    def expire_after(self, endpoint, count=1):
+        """
+        Expires the session of each of the next `count` requests to an endpoint,
+        once that request is answered, i.e. between two steps of a sequence.
+
+        Args:
+            endpoint (str): The `urls.endpoint` name, i.e. "account_status".
+            count (int, optional): Number of requests. Defaults to 1.
+        """
+        with self._lock:
+            self._expire_after[endpoint] = self._expire_after.get(endpoint, 0) + count
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this the body waits for a delayed ACK.
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server._handle(self, {})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode("utf-8") if length else ""
+                server._handle(self, {name: values[-1] for name, values in parse_qs(body).items()})
+
+        return Handler
+
+    def _handle(self, handler, form):
+        url = urlsplit(handler.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        form = {**query, **form}
+        endpoint = urls.endpoint(handler.path)
+        cookie = SimpleCookie(handler.headers.get("Cookie", ""))
+        sid = cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            roll = self._random.random()
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if sid in self._sessions and self._sessions[sid] == "authenticated" and roll < self.expire_rate:
+                del self._sessions[sid]
+            if sid in self._expiring:
+                self._expiring.discard(sid)
+                self._sessions.pop(sid, None)
+            state = self._sessions.get(sid)
+            if state == "authenticated" and self._expire_after.get(endpoint):
+                self._expire_after[endpoint] -= 1
+                self._expiring.add(sid)
+        if delay:
+            time.sleep(delay)
+        if roll >= 1 - self.error_rate and state == "authenticated":
+            return self._send(handler, 503, "text/html", "<html><body>Service Unavailable</body></html>")
+
+        set_cookie = None
+        if endpoint == "login":
+            if handler.command == "GET":
+                return self._send(handler, 200, "text/html", "<html><form name='login'></form></html>")
+            if form.get("username") != self.username or form.get("password") != self.password:
+                return self._send(handler, 200, "text/html", "<html>Invalid username or password.</html>")
+            sid = secrets.token_hex(16)
+            set_cookie = sid
+            with self._lock:
+                self._sessions[sid] = "2fa" if self.totp_secret else "pin"
+            body = "<html>Enter your 2FA code.</html>" if self.totp_secret else "<html>Enter your PIN.</html>"
+            return self._send(handler, 200, "text/html", body, set_cookie)
+        if endpoint == "two_factor_auth":
+            if state == "2fa" and pyotp.TOTP(self.totp_secret).verify(form.get("two_factor_code", ""), valid_window=1):
+                with self._lock:
+                    self._sessions[sid] = "pin"
+                return self._send(handler, 200, "text/html", "<html>Enter your PIN.</html>")
+            return self._send(handler, 200, "text/html", "<html>2FA Failed</html>")
+        if endpoint == "pin":
+            if state == "pin" and form.get("pin") == self.pin:
+                with self._lock:
+                    self._sessions[sid] = "authenticated"
+            return self._send(handler, 200, "text/html", "<html>Welcome</html>")
+
+        if state != "authenticated":
+            return self._send(handler, 200, "text/html", f'<html><a href="{SESSION_FAILED}"></a></html>')
+        if endpoint == "quote":
+            return self._send(handler, 200, "text/xml", self._quote(form.get("quoteSymbol", "")))
+        if endpoint == "get_xml":
+            page = form.get("page")
+            account = form.get("accountId") or form.get("account_id")
+            if page == "bal":
+                return self._send(handler, 200, "text/xml", self._balance(self._selected.get(sid, self.accounts[0])))
+            if page == "pos":
+                return self._send(handler, 200, "text/xml", self._positions(account))
+            return self._send(handler, 200, "text/xml", "<response><status>OK</status></response>")
+        if endpoint == "account_list":
+            options = "".join(
+                f'<option value="{account}">{account}-Individual</option>\n' for account in self.accounts
+            )
+            return self._send(handler, 200, "text/html", f'<select name="accountId" id="accountId">\n{options}</select>')
+        if endpoint == "account_status":
+            with self._lock:
+                self._selected[sid] = form.get("accountId")
+            return self._send(handler, 200, "text/html", "<html>OK</html>")
+        if endpoint == "status":
+            data = {
+                "primary": "1", "domestic": "1", "joint": "0", "ira": "0", "hasMargin": "1", "opLevel": "2",
+                "p_country": "US", "mrgnStatus": "A", "opStatus": "A", "margin_id": "0",
+            }
+            return self._send(handler, 200, "application/json", json.dumps({"result": "success", "data": data}))
+        if endpoint == "orderbar":
+            return self._send(handler, 200, "text/xml", self._orderbar(form))
+        if endpoint == "order_list":
+            return self._send(handler, 200, "text/html", self._order_status(form.get("accountId")))
+        if endpoint == "cancel_order":
+            return self._send(handler, 200, "text/xml", self._cancel(form.get("accountId"), form.get("orderId")))
+        return self._send(handler, 404, "text/html", "<html>Not Found</html>")
+
+    def _send(self, handler, status, content_type, body, set_cookie=None):
+        body = body.encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        handler.send_header("Content-Length", str(len(body)))
+        if set_cookie is not None:
+            handler.send_header("Set-Cookie", f"{SESSION_COOKIE}={set_cookie}; Path=/; HttpOnly")
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _price(self, symbol):
+        with self._lock:
+            price = self._prices.get(symbol)
+            if price is None:
+                opening = self._random.uniform(5, 500)
+                price = self._prices[symbol] = [opening, opening, opening, opening]
+            price[0] = max(0.01, price[0] * (1 + self._random.gauss(0, 0.0005)))
+            price[2] = max(price[2], price[0])
+            price[3] = min(price[3], price[0])
+            return tuple(price)
+
+    def _quote(self, symbol):
+        last, opening, high, low = self._price(symbol)
+        change = last - opening
+        return QUOTE.format(
+            symbol=symbol,
+            bid=last - 0.01,
+            ask=last + 0.01,
+            last=last,
+            bid_size=self._random.randrange(1, 50) * 100,
+            ask_size=self._random.randrange(1, 50) * 100,
+            change=change,
+            high=high,
+            low=low,
+            color="green" if change >= 0 else "red",
+            volume=self._random.randrange(100000, 50000000),
+            time=time.strftime("%I:%M:%S %p ET %m/%d/%Y"),
+        )
+
+    def _holdings(self):
+        return [(symbol, quantity, self._price(symbol)) for symbol, quantity in HOLDINGS]
+
+    def _balance(self, account):
+        market_value = sum(quantity * price[1] for _, quantity, price in self._holdings())
+        cash = 1204.33 * (self.accounts.index(account) + 1 if account in self.accounts else 0)
+        return BALANCE.format(
+            total=market_value + cash, cash=cash, buying_power=cash * 2, market_value=market_value
+        )
+
+    def _positions(self, account):
+        rows = "".join(
+            POSITION.format(
+                symbol=symbol,
+                quantity=quantity,
+                price=last,
+                change=last - opening,
+                percent=(last - opening) / opening * 100,
+                volume=self._random.randrange(100000, 50000000),
+            )
+            for symbol, quantity, (last, opening, _, _) in self._holdings()
+        )
+        return f'<?xml version="1.0" encoding="UTF-8"?>\n<response>\n{rows}</response>\n'
+
+    def _orderbar(self, form):
+        account = form.get("accountId", "")
+        symbol = form.get("symbol", "")
+        if account not in self._orders or not symbol:
+            return ORDERBAR.format(success="No", warning="", body="<div>Invalid order.</div>", errcode="1")
+        quantity = form.get("quantity", "0")
+        price = form.get("limitPrice") or ""
+        amount = float(quantity or 0) * (float(price) if price else self._price(symbol)[0])
+        table = ORDER_TABLE.format(
+            account=account[-4:],
+            action=ACTIONS.get(form.get("transactionType"), "Buy"),
+            quantity=quantity,
+            symbol=symbol,
+            price_type=PRICE_TYPES.get(form.get("priceType"), "Market"),
+            price=price or "Market",
+            duration=DURATIONS.get(form.get("duration"), "Day"),
+            amount=amount,
+        )
+        if form.get("submitOrders") != "1":
+            body = f'<div id="preview_{int(time.time() * 1000)}" style="display:block">{table}</div>'
+            return ORDERBAR.format(success="Yes", warning="", body=body, errcode="0")
+        with self._lock:
+            ref = str(self._next_ref)
+            self._next_ref += 1
+            self._orders[account].append(
+                {
+                    "ref": ref,
+                    "placed": time.time(),
+                    "action": ACTIONS.get(form.get("transactionType"), "Buy"),
+                    "quantity": quantity,
+                    "symbol": symbol,
+                    "price_type": PRICE_TYPES.get(form.get("priceType"), "Market"),
+                    "price": float(price) if price else 0.0,
+                    "duration": DURATIONS.get(form.get("duration"), "Day"),
+                    "market": form.get("priceType") == "1",
+                    "cancelled": False,
+                }
+            )
+        body = f'<div class="order_confirm">{table}<div class="ref">Your order reference number is: {ref}</div></div>'
+        return ORDERBAR.format(success="Yes", warning="", body=body, errcode="0")
+
+    def _status(self, order, now):
+        if order["cancelled"]:
+            return "Cancelled"
+        return "Executed" if order["market"] and now - order["placed"] >= FINAL_AFTER else "Open"
+
+    def _cancel(self, account, ref):
+        now = time.time()
+        with self._lock:
+            for order in self._orders.get(account, []):
+                if order["ref"] == ref and self._status(order, now) == "Open":
+                    order["cancelled"] = True
+                    body = f"<div>Your cancel request for order {ref} has been received.</div>"
+                    return ORDERBAR.format(success="Yes", warning="", body=body, errcode="0")
+        body = f"<div>Order {ref} cannot be cancelled.</div>"
+        return ORDERBAR.format(success="No", warning="", body=body, errcode="1")
+
+    def _order_status(self, account):
+        now = time.time()
+        with self._lock:
+            orders = list(self._orders.get(account, []))
+        rows = "".join(
+            ORDER_ROW.format(
+                date=time.strftime("%m/%d/%Y", time.localtime(order["placed"])),
+                time=time.strftime("%H:%M:%S", time.localtime(order["placed"])),
+                action=order["action"],
+                quantity=order["quantity"],
+                ref=order["ref"],
+                account=account[-4:],
+                symbol=order["symbol"],
+                price_type=order["price_type"],
+                price=order["price"],
+                duration=order["duration"],
+                status=self._status(order, now),
+            )
+            for order in orders
+        )
+        return ORDER_STATUS.format(rows=rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Firstrade endpoints.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 503")
+    parser.add_argument("--expire-rate", type=float, default=0.0, help="fraction of requests finding the session expired")
+    args = parser.parse_args(argv)
+    server = MockFirstrade(
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        expire_rate=args.expire_rate,
+    )
+    print(f"Serving on {server.base_url}; log in with mock / mock / PIN 1234.")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
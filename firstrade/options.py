@@ -0,0 +1,316 @@
+import datetime
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from firstrade._util import np, require_numpy, to_float_or_nan
+from firstrade.account import FTSession, parse_response
+from firstrade.symbols import fetch_quote, parse_quote
+
+OPTION_COLUMNS = ("symbol", "expiry", "right", "strike", "bid", "ask", "last", "volume", "open_interest")
+# The quote response has no documented open interest element; the first of these present is used.
+OPEN_INTEREST_TAGS = ("openinterest", "open_interest", "oi")
+
+_OCC = re.compile(r"^([A-Z.]{1,6})(\d{6})([CP])(\d{8})$")
+
+
+def _date(expiry):
+    if isinstance(expiry, datetime.datetime):
+        return expiry.date()
+    if isinstance(expiry, datetime.date):
+        return expiry
+    return datetime.date.fromisoformat(str(expiry))
+
+
+def occ_symbol(underlying, expiry, right, strike):
+    """
+    Builds the OCC symbol of an option contract, i.e. `AAPL261120C00150000`.
+
+    Args:
+        underlying (str): Ticker of the underlying.
+        expiry (datetime.date or str): Expiration date, or an ISO `YYYY-MM-DD` string.
+        right (str): "C" for a call or "P" for a put.
+        strike (float): Strike price.
+
+    Returns:
+        str: The underlying, `YYMMDD` expiry, right and strike * 1000 as 8 digits, without padding.
+    """
+    right = right.upper()[0]
+    if right not in "CP":
+        raise ValueError(f"Option right must be 'C' or 'P', not {right!r}.")
+    return f"{underlying.upper()}{_date(expiry):%y%m%d}{right}{round(strike * 1000):08d}"
+
+
+def parse_occ_symbol(symbol):
+    """
+    Splits an OCC option symbol into its parts.
+
+    Args:
+        symbol (str): The OCC symbol, with or without padding spaces after the underlying.
+
+    Returns:
+        tuple: (underlying, expiry as datetime.date, right, strike).
+    """
+    match = _OCC.match(symbol.replace(" ", ""))
+    if match is None:
+        raise ValueError(f"{symbol!r} is not an OCC option symbol.")
+    underlying, expiry, right, strike = match.groups()
+    return underlying, datetime.datetime.strptime(expiry, "%y%m%d").date(), right, int(strike) / 1000
+
+
+def strike_grid(center, step, count):
+    """
+    Returns `count` strikes on each side of the multiple of `step` nearest `center`.
+
+    Args:
+        center (float): Price to center the strikes on, i.e. the underlying's last price.
+        step (float): Distance between strikes.
+        count (int): Strikes above and below the center strike.
+
+    Returns:
+        list: Up to 2 * count + 1 ascending, positive strikes.
+    """
+    middle = round(center / step)
+    return [round((middle + i) * step, 4) for i in range(-count, count + 1) if middle + i > 0]
+
+
+class OptionChain:
+    """
+    Option chain of one underlying, stored as one NumPy array per column.
+
+    Every column has one entry per contract, so filters are vectorized
+    boolean masks and `chain[mask]` returns a new, smaller chain.
+
+    Attributes:
+        underlying (str): Ticker of the underlying.
+        underlying_price (float): Last price of the underlying when the chain was fetched.
+        symbol (numpy.ndarray): OCC symbol of each contract.
+        expiry (numpy.ndarray): Expiration date of each contract, as datetime64[D].
+        right (numpy.ndarray): "C" for calls, "P" for puts.
+        strike (numpy.ndarray): Strike price, as float64.
+        bid (numpy.ndarray): Bid, as float64 (NaN when not quoted).
+        ask (numpy.ndarray): Ask, as float64 (NaN when not quoted).
+        last (numpy.ndarray): Last trade price, as float64 (NaN when not quoted).
+        volume (numpy.ndarray): Contracts traded today, as float64.
+        open_interest (numpy.ndarray): Open interest, as float64 (NaN when the quote does not report it).
+        errors (dict): Exceptions keyed by OCC symbol, for contracts that could not be quoted.
+        elapsed (float): Wall-clock seconds taken to fetch the chain.
+    """
+
+    __slots__ = ("underlying", "underlying_price", "errors", "elapsed") + OPTION_COLUMNS
+
+    def __init__(self, underlying, underlying_price, symbol, expiry, right, strike, bid, ask, last, volume, open_interest):
+        require_numpy("Option chains")
+        self.underlying = underlying
+        self.underlying_price = underlying_price
+        self.symbol = np.asarray(symbol, dtype=str)
+        self.expiry = np.asarray(expiry, dtype="datetime64[D]")
+        self.right = np.asarray(right, dtype="U1")
+        self.strike = np.asarray(strike, dtype=np.float64)
+        self.bid = np.asarray(bid, dtype=np.float64)
+        self.ask = np.asarray(ask, dtype=np.float64)
+        self.last = np.asarray(last, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+        self.open_interest = np.asarray(open_interest, dtype=np.float64)
+        self.errors = {}
+        self.elapsed = 0.0
+
+    def __len__(self):
+        return len(self.symbol)
+
+    def __getitem__(self, selection):
+        """Returns the contracts selected by a boolean mask, index array or slice as a new chain."""
+        chain = OptionChain(
+            self.underlying,
+            self.underlying_price,
+            *(getattr(self, name)[selection] for name in OPTION_COLUMNS),
+        )
+        chain.errors = self.errors
+        chain.elapsed = self.elapsed
+        return chain
+
+    @property
+    def expirations(self):
+        """numpy.ndarray: The distinct expiration dates, ascending."""
+        return np.unique(self.expiry)
+
+    def mid(self):
+        """numpy.ndarray: (bid + ask) / 2 of each contract."""
+        return (self.bid + self.ask) / 2
+
+    def moneyness(self):
+        """numpy.ndarray: strike / underlying price of each contract."""
+        return self.strike / self.underlying_price
+
+    def days_to_expiry(self, today=None):
+        """
+        Returns the calendar days from `today` to each contract's expiration.
+
+        Args:
+            today (datetime.date or str, optional): The day to count from. Defaults to today.
+
+        Returns:
+            numpy.ndarray: Days as int64.
+        """
+        today = np.datetime64(_date(today) if today is not None else datetime.date.today(), "D")
+        return (self.expiry - today).astype(np.int64)
+
+    def calls(self):
+        """Returns the call contracts."""
+        return self[self.right == "C"]
+
+    def puts(self):
+        """Returns the put contracts."""
+        return self[self.right == "P"]
+
+    def in_the_money(self):
+        """Returns the calls struck below and the puts struck above the underlying price."""
+        return self[
+            ((self.right == "C") & (self.strike < self.underlying_price))
+            | ((self.right == "P") & (self.strike > self.underlying_price))
+        ]
+
+    def near_money(self, low=0.9, high=1.1):
+        """
+        Returns the contracts with `low <= strike / underlying price <= high`.
+
+        Args:
+            low (float, optional): Lowest moneyness kept. Defaults to 0.9.
+            high (float, optional): Highest moneyness kept. Defaults to 1.1.
+        """
+        moneyness = self.moneyness()
+        return self[(moneyness >= low) & (moneyness <= high)]
+
+    def expiring(self, start=None, end=None, min_days=None, max_days=None, today=None):
+        """
+        Returns the contracts expiring within a date range and/or a range of days from today.
+
+        Args:
+            start (datetime.date or str, optional): Earliest expiration kept.
+            end (datetime.date or str, optional): Latest expiration kept.
+            min_days (int, optional): Fewest days to expiration kept.
+            max_days (int, optional): Most days to expiration kept.
+            today (datetime.date or str, optional): The day `min_days` and `max_days` count from.
+                Defaults to today.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.expiry >= np.datetime64(_date(start), "D")
+        if end is not None:
+            mask &= self.expiry <= np.datetime64(_date(end), "D")
+        if min_days is not None or max_days is not None:
+            days = self.days_to_expiry(today)
+            if min_days is not None:
+                mask &= days >= min_days
+            if max_days is not None:
+                mask &= days <= max_days
+        return self[mask]
+
+    def to_dict(self):
+        """Returns the columns as a dict of arrays, i.e. for `pandas.DataFrame`."""
+        return {name: getattr(self, name) for name in OPTION_COLUMNS}
+
+
+def _open_interest(quote):
+    for tag in OPEN_INTEREST_TAGS:
+        if tag in quote:
+            return to_float_or_nan(quote[tag])
+    return float("nan")
+
+
+def get_option_chains(ft_session: FTSession, underlyings, expirations, strikes, max_workers: int = 10, fresh=False):
+    """
+    Retrieves the option chains of many underlyings concurrently.
+
+    Firstrade has no chain listing endpoint in this API, so the contracts are
+    built from the given expirations and strikes, a call and a put for each
+    pair, and each is quoted through the `getxml?page=quo` path like
+    `SymbolQuote`. All quotes of all underlyings share one thread pool and the
+    session's quote cache, parse executor and instrumentation. Contracts that
+    do not exist end up in the chain's `errors` instead of its columns.
+
+    Experimental: quoting option contracts through this page is not verified
+    against a live account yet.
+
+    Requires numpy (`pip install firstrade[numpy]`).
+
+    Args:
+        ft_session (FTSession):
+            The session object used for making HTTP requests to Firstrade.
+        underlyings (iterable): Tickers of the underlyings.
+        expirations (iterable): Expiration dates as datetime.date or ISO strings, or a dict
+            of them keyed by underlying.
+        strikes (iterable or callable): Strike prices, a dict of them keyed by underlying, or a
+            function called with the underlying's last price that returns them, i.e.
+            `lambda price: strike_grid(price, 5, 10)`.
+        max_workers (int, optional): Maximum number of concurrent requests. Defaults to 10.
+        fresh (bool, optional): Bypass the session's quote cache. Defaults to False.
+
+    Returns:
+        dict: OptionChain keyed by underlying.
+    """
+    require_numpy("Option chains")
+    underlyings = list(dict.fromkeys(underlying.upper() for underlying in underlyings))
+
+    def quote(symbol):
+        try:
+            fields = parse_response(ft_session, "quote", parse_quote, fetch_quote(ft_session, symbol, fresh))
+        except Exception as e:
+            return None, e
+        if fields.get("errcode", "0") not in ("", "0"):
+            return None, ValueError(f"Quote for {symbol} failed with error code {fields['errcode']}.")
+        return fields, None
+
+    def per_underlying(value, underlying):
+        return value.get(underlying, ()) if isinstance(value, dict) else value
+
+    start = time.perf_counter()
+    chains = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        prices = {}
+        for underlying, (fields, error) in zip(underlyings, executor.map(quote, underlyings)):
+            prices[underlying] = to_float_or_nan(fields.get("last", "")) if error is None else float("nan")
+        contracts = []
+        for underlying in underlyings:
+            chain_strikes = per_underlying(strikes, underlying)
+            if callable(chain_strikes):
+                chain_strikes = () if math.isnan(prices[underlying]) else chain_strikes(prices[underlying])
+            for expiry in sorted({_date(expiry) for expiry in per_underlying(expirations, underlying)}):
+                for strike in sorted(set(chain_strikes)):
+                    for right in "CP":
+                        contracts.append((underlying, expiry, right, strike, occ_symbol(underlying, expiry, right, strike)))
+        results = executor.map(quote, [contract[4] for contract in contracts])
+
+        columns = {underlying: {name: [] for name in OPTION_COLUMNS} for underlying in underlyings}
+        errors = {underlying: {} for underlying in underlyings}
+        for (underlying, expiry, right, strike, symbol), (fields, error) in zip(contracts, results):
+            if error is not None:
+                errors[underlying][symbol] = error
+                continue
+            chain = columns[underlying]
+            chain["symbol"].append(symbol)
+            chain["expiry"].append(expiry)
+            chain["right"].append(right)
+            chain["strike"].append(strike)
+            chain["bid"].append(to_float_or_nan(fields.get("bid", "")))
+            chain["ask"].append(to_float_or_nan(fields.get("ask", "")))
+            chain["last"].append(to_float_or_nan(fields.get("last", "")))
+            chain["volume"].append(to_float_or_nan(fields.get("vol", "")))
+            chain["open_interest"].append(_open_interest(fields))
+    elapsed = time.perf_counter() - start
+    for underlying in underlyings:
+        chain = chains[underlying] = OptionChain(underlying, prices[underlying], **columns[underlying])
+        chain.errors = errors[underlying]
+        chain.elapsed = elapsed
+    return chains
+
+
+def get_option_chain(ft_session: FTSession, underlying, expirations, strikes, max_workers: int = 10, fresh=False):
+    """
+    Retrieves the option chain of one underlying. See `get_option_chains`.
+
+    Returns:
+        OptionChain: The chain.
+    """
+    return get_option_chains(ft_session, [underlying], expirations, strikes, max_workers, fresh)[underlying.upper()]
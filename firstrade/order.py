@@ -1,9 +1,18 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
+from typing import NamedTuple
 
+import lxml.html
 from bs4 import BeautifulSoup
 
 from firstrade import urls
-from firstrade.account import FTSession
+from firstrade.account import FTAccountData, FTSession, parse_response
+from firstrade.scheduler import Priority
+
+
+_ORDER_REF = re.compile(r"Order Ref[^<]*?#: ([^<]*)")
 
 
 class PriceType(str, Enum):
@@ -20,6 +29,10 @@ class PriceType(str, Enum):
     TRAILING_STOP_PERCENT = "6"
 
 
+# Price types whose price is a share price, which must be a multiple of the tick.
+TICK_PRICE_TYPES = (PriceType.LIMIT, PriceType.STOP, PriceType.STOP_LIMIT)
+
+
 class Duration(str, Enum):
     """
     This is an :class:'~enum.Enum'
@@ -49,11 +62,17 @@ class Order:
     """
     This class contains information about an order.
     It also contains a method to place an order.
+
+    Attributes:
+        order_confirmation (dict): The confirmation data of the last placed order.
+        timings (dict): Seconds taken by the `preview` and, if submitted, `submit`
+            legs of the last placed order.
     """
 
     def __init__(self, ft_session: FTSession):
         self.ft_session = ft_session
         self.order_confirmation = {}
+        self.timings = {}
 
     def place_order(
         self,
@@ -81,117 +100,331 @@ class Order:
             price (float, optional): The price to buy the shares at. Defaults to 0.00.
             dry_run (bool, optional): Whether you want the order to be placed or not.
                                       Defaults to True.
+            notional (bool, optional): Whether the quantity is a dollar amount. Defaults to False.
+
+        Submitted orders are recorded in the session's `order_book`, if it has one.
+        If the session has a `symbol_reference`, the order is validated against it first.
 
         Returns:
             Order:order_confirmation: Dictionary containing the order confirmation data.
-        """
 
-        if price_type == PriceType.MARKET:
-            price = ""
-
-        data = {
-            "submiturl": "/cgi-bin/orderbar",
-            "orderbar_clordid": "",
-            "orderbar_accountid": "",
-            "notional": "yes" if notional else "",
-            "stockorderpage": "yes",
-            "submitOrders": "",
-            "previewOrders": "1",
-            "lotMethod": "1",
-            "accountType": "1",
-            "quoteprice": "",
-            "viewederror": "",
-            "stocksubmittedcompanyname1": "",
-            "accountId": account,
-            "transactionType": order_type,
-            "quantity": quantity,
-            "symbol": symbol,
-            "priceType": price_type,
-            "limitPrice": price,
-            "duration": duration,
-            "qualifier": "0",
-            "cond_symbol0_0": "",
-            "cond_type0_0": "2",
-            "cond_compare_type0_0": "2",
-            "cond_compare_value0_0": "",
-            "cond_and_or0": "1",
-            "cond_symbol0_1": "",
-            "cond_type0_1": "2",
-            "cond_compare_type0_1": "2",
-            "cond_compare_value0_1": "",
-        }
+        Raises:
+            reference.InvalidOrder: If the order fails validation against the session's symbol reference.
+        """
 
-        order_data = BeautifulSoup(
-            self.ft_session.post(
-                url=urls.orderbar(), headers=urls.session_headers(), data=data
-            ).text,
-            "xml",
+        self.timings = {}
+        symbol_reference = getattr(self.ft_session, "symbol_reference", None)
+        if symbol_reference is not None:
+            symbol_reference.validate(
+                symbol, quantity, price if price_type in TICK_PRICE_TYPES else None, notional
+            )
+        data = order_form(
+            account, symbol, price_type, order_type, quantity, duration, price, notional
         )
-        order_confirmation = {}
-        cdata = order_data.find("actiondata").string
-        cdata_soup = BeautifulSoup(cdata, "html.parser")
-        span = (
-            cdata_soup.find("div", class_="msg_bg")
-            .find("div", class_="yellow box")
-            .find("div", class_="error_msg")
-            .find("div", class_="outbox")
-            .find("div", class_="inbox")
-            .find("span")
+        start = time.perf_counter()
+        response = self.ft_session.post(
+            url=urls.orderbar(), headers=urls.session_headers(), data=data
+        ).text
+        self.timings["preview"] = time.perf_counter() - start
+        order_confirmation = parse_response(
+            self.ft_session, "orderbar", parse_preview, response, dry_run
         )
-        if span:
-            order_warning = span.text.strip()
-            order_confirmation["warning"] = order_warning
+        if "warning" in order_confirmation:
             data["viewederror"] = "1"
         if not dry_run:
             data["previewOrders"] = ""
             data["submitOrders"] = "1"
-            order_data = BeautifulSoup(
-                self.ft_session.post(
-                    url=urls.orderbar(), headers=urls.session_headers(), data=data
-                ).text,
-                "xml",
+            start = time.perf_counter()
+            response = self.ft_session.post(
+                url=urls.orderbar(), headers=urls.session_headers(), data=data
+            ).text
+            self.timings["submit"] = time.perf_counter() - start
+            order_confirmation = parse_response(
+                self.ft_session, "orderbar", parse_submission, response, order_confirmation
             )
+            order_book = getattr(self.ft_session, "order_book", None)
+            if order_book is not None:
+                order_book.record(
+                    OrderSpec(account, symbol, price_type, order_type, quantity, duration, price, notional),
+                    order_confirmation,
+                )
+        self.order_confirmation = order_confirmation
 
-        order_success = order_data.find("success").text.strip()
-        order_confirmation["success"] = order_success
-        action_data = order_data.find("actiondata").text.strip()
-        if order_success != "No":
-            # Extract the table data
-            table_start = action_data.find("<table")
-            table_end = action_data.find("</table>") + len("</table>")
-            table_data = action_data[table_start:table_end]
-            table_data = BeautifulSoup(table_data, "xml")
-            titles = table_data.find_all("th")
-            data = table_data.find_all("td")
-            for i, title in enumerate(titles):
-                order_confirmation[f"{title.get_text()}"] = data[i].get_text()
-            if not dry_run:
-                start_index = action_data.find(
-                    "Your order reference number is: "
-                ) + len("Your order reference number is: ")
-                end_index = action_data.find("</div>", start_index)
-                order_number = action_data[start_index:end_index]
-            else:
-                start_index = action_data.find('id="') + len('id="')
-                end_index = action_data.find('" style=', start_index)
-                order_number = action_data[start_index:end_index]
-            order_confirmation["orderid"] = order_number
-        else:
-            order_confirmation["actiondata"] = action_data
-        order_confirmation["errcode"] = order_data.find("errcode").text.strip()
+
+class OrderSpec(NamedTuple):
+    """The arguments of one `Order.place_order` call, for use with `place_orders`."""
+
+    account: str
+    symbol: str
+    price_type: PriceType
+    order_type: OrderType
+    quantity: float
+    duration: Duration
+    price: float = 0.00
+    notional: bool = False
+
+
+class OrderResult:
+    """
+    Dataclass containing the outcome of one order placed by `place_orders`.
+
+    Attributes:
+        spec (OrderSpec): The order that was placed.
+        order_confirmation (dict): The order confirmation data, empty if the order failed.
+        error (Exception): The exception raised while placing the order, or None.
+        timings (dict): Seconds taken by the `preview` and `submit` legs.
+    """
+
+    def __init__(self, spec: OrderSpec, order_confirmation, error, timings):
+        self.spec = spec
         self.order_confirmation = order_confirmation
+        self.error = error
+        self.timings = timings
+
+
+def place_orders(
+    ft_session: FTSession,
+    specs,
+    dry_run=True,
+    max_workers=8,
+    serialize_accounts=True,
+):
+    """
+    Places many orders concurrently.
+
+    Orders for different accounts are placed in parallel. Orders for the same
+    account are placed one after another, in the order given, unless
+    `serialize_accounts` is False.
+
+    Args:
+        ft_session (FTSession): The session object used for making HTTP requests to Firstrade.
+        specs (iterable): OrderSpec of each order to place.
+        dry_run (bool, optional): Whether you want the orders to be placed or not.
+                                  Defaults to True.
+        max_workers (int, optional): Maximum number of orders in flight at once. Defaults to 8.
+        serialize_accounts (bool, optional): Place orders for the same account one at a time.
+                                             Defaults to True.
 
+    Returns:
+        list: OrderResult of each order, in the same order as `specs`.
+    """
+    specs = list(specs)
+    results = [None] * len(specs)
+    groups = {}
+    for index, spec in enumerate(specs):
+        key = spec.account if serialize_accounts else index
+        groups.setdefault(key, []).append(index)
+
+    def place_group(indexes):
+        for index in indexes:
+            spec = specs[index]
+            order = Order(ft_session)
+            error = None
+            try:
+                order.place_order(
+                    spec.account,
+                    spec.symbol,
+                    spec.price_type,
+                    spec.order_type,
+                    spec.quantity,
+                    spec.duration,
+                    price=spec.price,
+                    dry_run=dry_run,
+                    notional=spec.notional,
+                )
+            except Exception as e:
+                error = e
+            results[index] = OrderResult(spec, order.order_confirmation, error, order.timings)
+
+    if groups:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups)))) as executor:
+            list(executor.map(place_group, groups.values()))
+    return results
+
+
+def order_form(
+    account,
+    symbol,
+    price_type: PriceType,
+    order_type: OrderType,
+    quantity,
+    duration: Duration,
+    price=0.00,
+    notional=False,
+):
+    """
+    Builds the `orderbar` form data for previewing an order.
 
-def get_orders(ft_session, account):
+    Args:
+        account (str): Account number of the account to place the order in.
+        symbol (str): Ticker to place the order for.
+        price_type (PriceType): Price Type i.e. LIMIT, MARKET, STOP, etc.
+        order_type (OrderType): Order Type i.e. BUY, SELL, etc.
+        quantity (float): The number of shares to buy.
+        duration (Duration): Duration of the order i.e. DAY, GT90, etc.
+        price (float, optional): The price to buy the shares at. Defaults to 0.00.
+        notional (bool, optional): Whether the quantity is a dollar amount. Defaults to False.
+
+    Returns:
+        dict: The form data. Set `submitOrders` to submit instead of preview.
+    """
+    if price_type == PriceType.MARKET:
+        price = ""
+
+    return {
+        "submiturl": "/cgi-bin/orderbar",
+        "orderbar_clordid": "",
+        "orderbar_accountid": "",
+        "notional": "yes" if notional else "",
+        "stockorderpage": "yes",
+        "submitOrders": "",
+        "previewOrders": "1",
+        "lotMethod": "1",
+        "accountType": "1",
+        "quoteprice": "",
+        "viewederror": "",
+        "stocksubmittedcompanyname1": "",
+        "accountId": account,
+        "transactionType": order_type,
+        "quantity": quantity,
+        "symbol": symbol,
+        "priceType": price_type,
+        "limitPrice": price,
+        "duration": duration,
+        "qualifier": "0",
+        "cond_symbol0_0": "",
+        "cond_type0_0": "2",
+        "cond_compare_type0_0": "2",
+        "cond_compare_value0_0": "",
+        "cond_and_or0": "1",
+        "cond_symbol0_1": "",
+        "cond_type0_1": "2",
+        "cond_compare_type0_1": "2",
+        "cond_compare_value0_1": "",
+    }
+
+
+def preview_warning(order_data):
+    """
+    Extracts the warning shown on an order preview, if any.
+
+    Args:
+        order_data (BeautifulSoup): The parsed `orderbar` preview response.
+
+    Returns:
+        str: The warning text, or None if the preview has no warning.
+    """
+    cdata = order_data.find("actiondata").string
+    cdata_soup = BeautifulSoup(cdata, "html.parser")
+    span = (
+        cdata_soup.find("div", class_="msg_bg")
+        .find("div", class_="yellow box")
+        .find("div", class_="error_msg")
+        .find("div", class_="outbox")
+        .find("div", class_="inbox")
+        .find("span")
+    )
+    if span:
+        return span.text.strip()
+    return None
+
+
+def parse_preview(response, dry_run=True):
+    """
+    Parses an `orderbar` preview response.
+
+    Args:
+        response (str): Body of the preview response.
+        dry_run (bool, optional): Build the full confirmation from the preview.
+            Otherwise only the warning is kept, for the submission to complete. Defaults to True.
+
+    Returns:
+        dict: The order confirmation data.
+    """
+    order_data = BeautifulSoup(response, "xml")
+    order_confirmation = {}
+    order_warning = preview_warning(order_data)
+    if order_warning is not None:
+        order_confirmation["warning"] = order_warning
+    if not dry_run:
+        return order_confirmation
+    return parse_order_confirmation(order_data, True, order_confirmation)
+
+
+def parse_submission(response, order_confirmation=None):
+    """
+    Parses an `orderbar` submit response.
+
+    Args:
+        response (str): Body of the submit response.
+        order_confirmation (dict, optional): Confirmation data from `parse_preview(..., dry_run=False)`.
+
+    Returns:
+        dict: The order confirmation data.
+    """
+    return parse_order_confirmation(BeautifulSoup(response, "xml"), False, order_confirmation)
+
+
+def parse_order_confirmation(order_data, dry_run, order_confirmation=None):
+    """
+    Builds the order confirmation from an `orderbar` response.
+
+    Args:
+        order_data (BeautifulSoup): The parsed `orderbar` preview or submit response.
+        dry_run (bool): Whether `order_data` is a preview rather than a submission.
+        order_confirmation (dict, optional): Confirmation data gathered so far, i.e. the preview warning.
+
+    Returns:
+        dict: The order confirmation data.
+    """
+    order_confirmation = dict(order_confirmation or {})
+    order_success = order_data.find("success").text.strip()
+    order_confirmation["success"] = order_success
+    action_data = order_data.find("actiondata").text.strip()
+    if order_success != "No":
+        # Extract the table data
+        table_start = action_data.find("<table")
+        table_end = action_data.find("</table>") + len("</table>")
+        table_data = action_data[table_start:table_end]
+        table_data = BeautifulSoup(table_data, "xml")
+        titles = table_data.find_all("th")
+        data = table_data.find_all("td")
+        for i, title in enumerate(titles):
+            order_confirmation[f"{title.get_text()}"] = data[i].get_text()
+        if not dry_run:
+            start_index = action_data.find(
+                "Your order reference number is: "
+            ) + len("Your order reference number is: ")
+            end_index = action_data.find("</div>", start_index)
+            order_number = action_data[start_index:end_index]
+        else:
+            start_index = action_data.find('id="') + len('id="')
+            end_index = action_data.find('" style=', start_index)
+            order_number = action_data[start_index:end_index]
+        order_confirmation["orderid"] = order_number
+    else:
+        order_confirmation["actiondata"] = action_data
+    order_confirmation["errcode"] = order_data.find("errcode").text.strip()
+    return order_confirmation
+
+
+def get_orders(ft_session, account, priority=None, with_changed=False):
     """
     Retrieves existing order data for a given account.
 
     Args:
         ft_session (FTSession): The session object used for making HTTP requests to Firstrade.
         account (str): Account number of the account to retrieve orders for.
+        priority (scheduler.Priority, optional): Scheduler priority class of the request.
+            Defaults to the priority of the `order_list` endpoint.
+        with_changed (bool, optional): Also return whether the order list differs from the
+            previous one fetched for the account. Always True without a session parse cache.
+            Defaults to False.
 
     Returns:
-        list: A list of dictionaries, each containing details about an order.
+        list: A list of dictionaries, each containing details about an order. With a
+            session parse cache, a tuple of read-only `cache.FrozenDict` instead.
+            An (orders, changed) tuple if `with_changed`.
     """
 
     # Data dictionary to send with the request
@@ -201,54 +434,301 @@ def get_orders(ft_session, account):
 
     # Post request to retrieve the order data
     response = ft_session.post(
-        url=urls.order_list(), headers=urls.session_headers(), data=data
+        url=urls.order_list(), headers=urls.session_headers(), data=data, priority=priority
     ).text
 
-    # Parse the response using BeautifulSoup
-    soup = BeautifulSoup(response, "html.parser")
+    return parse_response(ft_session, "order_list", parse_orders, response, key=account, with_changed=with_changed)
 
-    # Find the table containing orders
-    table = soup.find("table", class_="tablesorter")
-    if not table:
+
+def parse_orders(html_string):
+    """
+    Parses the `orderstatus` page.
+
+    Args:
+        html_string (str): Body of the order status response.
+
+    Returns:
+        list: A list of dictionaries, each containing details about an order.
+    """
+    if "tablesorter" not in html_string:
+        return []
+    document = lxml.html.fromstring(html_string)
+    tables = document.xpath(
+        '//table[contains(concat(" ", normalize-space(@class), " "), " tablesorter ")]'
+    )
+    if not tables:
         return []
 
-    rows = table.find_all("tr")[1:]  # skip the header row
+    rows = list(tables[0].iter("tr"))[1:]  # skip the header row
 
     orders = []
     for row in rows:
         try:
-            cells = row.find_all("td")
-            tooltip_content = row.find("a", {"class": "info"}).get("onmouseover")
-            tooltip_soup = BeautifulSoup(
-                tooltip_content.split("tooltip.show(")[1].strip("');"), "html.parser"
+            cells = list(row.iter("td"))
+            links = row.xpath(
+                './/a[contains(concat(" ", normalize-space(@class), " "), " info ")]'
             )
-            order_ref = tooltip_soup.find(text=lambda text: "Order Ref" in text)
-            order_ref_number = order_ref.split("#: ")[1] if order_ref else None
+            order_ref = _ORDER_REF.search(links[0].get("onmouseover") or "")
+            order_ref_number = order_ref.group(1) if order_ref else None
             status = cells[8]
-            # print(status)
-            sub_status = status.find("strong")
-            # print(sub_status)
-            sub_status = sub_status.get_text(strip=True)
-            # print(sub_status)
-            status = (
-                status.find("strong").get_text(strip=True)
-                if status.find("strong")
-                else status.get_text(strip=True)
-            )
+            strong = status.find(".//strong")
             order = {
-                "Date/Time": cells[0].get_text(strip=True),
+                "Date/Time": _cell_text(cells[0]),
                 "Reference": order_ref_number,
-                "Transaction": cells[1].get_text(strip=True),
-                "Quantity": int(cells[2].get_text(strip=True)),
-                "Symbol": cells[3].get_text(strip=True),
-                "Type": cells[4].get_text(strip=True),
-                "Price": float(cells[5].get_text(strip=True)),
-                "Duration": cells[6].get_text(strip=True),
-                "Instr.": cells[7].get_text(strip=True),
-                "Status": status,
+                "Transaction": _cell_text(cells[1]),
+                "Quantity": int(_cell_text(cells[2])),
+                "Symbol": _cell_text(cells[3]),
+                "Type": _cell_text(cells[4]),
+                "Price": float(_cell_text(cells[5])),
+                "Duration": _cell_text(cells[6]),
+                "Instr.": _cell_text(cells[7]),
+                "Status": _cell_text(strong if strong is not None else status),
             }
             orders.append(order)
         except Exception as e:
             print(f"Error parsing order: {e}")
 
     return orders
+
+
+def _cell_text(element):
+    """Equivalent of BeautifulSoup's `get_text(strip=True)`."""
+    return "".join(text.strip() for text in element.itertext())
+
+
+def parse_cancellation(response):
+    """
+    Parses a `cancelorder` response.
+
+    Args:
+        response (str): Body of the cancel response.
+
+    Returns:
+        dict: "success" ("Yes" or "No"), "errcode" and the "actiondata" message.
+    """
+    order_data = BeautifulSoup(response, "xml")
+    fields = {}
+    for name in ("success", "errcode", "actiondata"):
+        element = order_data.find(name)
+        fields[name] = element.text.strip() if element is not None else ""
+    if not fields["success"]:
+        fields["success"] = "No"
+    return fields
+
+
+class CancelResult:
+    """
+    Dataclass containing the outcome of one cancel request.
+
+    Attributes:
+        account (str): Account number of the order.
+        order_id (str): Reference number of the order.
+        order (dict): The order as returned by `get_orders`, or None if it was not listed.
+        cancel_confirmation (dict): The parsed cancel response, empty if the request failed.
+        error (Exception): The exception raised while cancelling, or None.
+        elapsed (float): Seconds taken by the cancel request.
+        response (str): The raw body of the cancel response, or None if there was none.
+    """
+
+    def __init__(self, account, order_id, order, cancel_confirmation, error, elapsed, response=None):
+        self.account = account
+        self.order_id = order_id
+        self.order = order
+        self.cancel_confirmation = cancel_confirmation
+        self.error = error
+        self.elapsed = elapsed
+        self.response = response
+
+    @property
+    def cancelled(self):
+        """bool: Whether the response explicitly confirmed the cancel. Anything else, including
+        a body that could not be parsed, counts as not cancelled; see `response`."""
+        return (
+            self.error is None
+            and self.cancel_confirmation.get("success") == "Yes"
+            and self.cancel_confirmation.get("errcode") in ("", "0")
+        )
+
+    def __repr__(self):
+        return f"CancelResult({self.account!r}, {self.order_id!r}, cancelled={self.cancelled}, elapsed={self.elapsed:.3f})"
+
+
+def cancel_order(ft_session: FTSession, account, order_id, order=None):
+    """
+    Requests the cancellation of one order.
+
+    Experimental: the cancel endpoint and its form fields are not verified
+    against a live account yet, so check the order with `get_orders` rather
+    than trusting a successful result alone.
+
+    The request goes ahead of every other request queued in the session's
+    scheduler. It is sent once: not again after a server error, and not again
+    after an expired session (the session logs in again and the result has a
+    SessionExpired error). Only a response that explicitly confirms the cancel
+    counts as `cancelled`; the raw body is kept in the result either way. The
+    order shows as cancelled in `get_orders` once it is done.
+
+    Args:
+        ft_session (FTSession): The session object used for making HTTP requests to Firstrade.
+        account (str): Account number of the order.
+        order_id (str): Reference number of the order, i.e. the "orderid" of its confirmation.
+        order (dict, optional): The order as returned by `get_orders`, kept in the result.
+
+    Returns:
+        CancelResult: The outcome of the request. Errors are returned in it, not raised.
+    """
+    data = {"accountId": str(account), "orderId": str(order_id)}
+    start = time.perf_counter()
+    body = None
+    cancel_confirmation = {}
+    try:
+        response = ft_session.post(
+            url=urls.cancel_order(),
+            headers=urls.session_headers(),
+            data=data,
+            priority=Priority.CANCEL,
+            retry=False,
+            resend_after_relogin=False,
+        )
+        body = response.text
+        response.raise_for_status()
+        cancel_confirmation = parse_response(ft_session, "cancel_order", parse_cancellation, body)
+        error = None
+    except Exception as e:
+        error = e
+    elapsed = time.perf_counter() - start
+    return CancelResult(str(account), str(order_id), order, cancel_confirmation, error, elapsed, body)
+
+
+def cancel_all(ft_session: FTSession, accounts=None, symbols=None, max_workers=32, allow_unverified=False):
+    """
+    Cancels every open order, i.e. as a kill switch.
+
+    Experimental, like `cancel_order`: it only runs with `allow_unverified=True`
+    until the cancel endpoint is confirmed against a live account. Confirm with
+    `get_orders` that the orders were cancelled before relying on it.
+
+    The order lists of all accounts are fetched concurrently, and the open
+    orders of each account are cancelled as soon as its list arrives, while
+    other lists are still loading. Every request goes ahead of any other
+    traffic queued in the session's scheduler.
+
+    Args:
+        ft_session (FTSession): The session object used for making HTTP requests to Firstrade.
+        accounts (iterable, optional): Account numbers to cancel in. Defaults to every account.
+        symbols (iterable, optional): Only cancel orders for these tickers. Defaults to all.
+        max_workers (int, optional): Maximum number of requests in flight at once. Defaults to 32.
+        allow_unverified (bool, optional): Opt in to using the unverified cancel endpoint.
+            Defaults to False.
+
+    Returns:
+        list: CancelResult of each open order found, in the order the cancels finished.
+            An account whose order list could not be fetched has one result with
+            `order_id` None and the error.
+
+    Raises:
+        ValueError: If `allow_unverified` is not True.
+    """
+    from firstrade.orderbook import is_final
+
+    if allow_unverified is not True:
+        raise ValueError("cancel_all uses an unverified cancel endpoint; pass allow_unverified=True to use it anyway.")
+
+    if accounts is None:
+        accounts = FTAccountData(ft_session).account_numbers
+    accounts = [str(account) for account in dict.fromkeys(accounts)]
+    symbols = None if symbols is None else {symbol.upper() for symbol in symbols}
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        listings = {
+            executor.submit(get_orders, ft_session, account, Priority.CANCEL): account for account in accounts
+        }
+        cancels = []
+        for listing in as_completed(listings):
+            account = listings[listing]
+            try:
+                orders = listing.result()
+            except Exception as e:
+                results.append(CancelResult(account, None, None, {}, e, 0.0))
+                continue
+            for order in orders:
+                if not order["Reference"] or is_final(order["Status"]):
+                    continue
+                if symbols is not None and order["Symbol"].upper() not in symbols:
+                    continue
+                cancels.append(executor.submit(cancel_order, ft_session, account, order["Reference"], order))
+        for cancel in as_completed(cancels):
+            results.append(cancel.result())
+    return results
+
+
+class OrderWatcher:
+    """
+    Polls the orders of an account and reports only new or changed orders.
+
+    Orders are keyed by their reference number.
+
+    Attributes:
+        orders (dict): The latest known state of every order seen, keyed by reference number.
+    """
+
+    def __init__(self, ft_session: FTSession, account, interval=5.0):
+        """
+        Initializes a new instance of the OrderWatcher class.
+
+        Args:
+            ft_session (FTSession): The session object used for making HTTP requests to Firstrade.
+            account (str): Account number of the account to watch.
+            interval (float, optional): Seconds between polls when iterating. Defaults to 5.0.
+        """
+        self.ft_session = ft_session
+        self.account = account
+        self.interval = interval
+        self.orders = {}
+        self._last = None
+
+    @staticmethod
+    def key(order):
+        """Returns the key an order is tracked under."""
+        if order["Reference"] is not None:
+            return order["Reference"]
+        return (order["Date/Time"], order["Transaction"], order["Symbol"], order["Quantity"])
+
+    def update(self, orders):
+        """
+        Records a list of orders from `get_orders` and returns the ones that are new or changed.
+
+        Args:
+            orders (list): Orders as returned by `get_orders`.
+
+        Returns:
+            list: The orders that were not seen before or differ from their last seen state.
+        """
+        changed = []
+        for order in orders:
+            key = self.key(order)
+            if self.orders.get(key) != order:
+                self.orders[key] = order
+                changed.append(order)
+        return changed
+
+    def poll(self):
+        """
+        Fetches the account's orders once.
+
+        Returns:
+            list: The orders that are new or changed since the last poll.
+        """
+        orders = get_orders(self.ft_session, self.account)
+        if orders is self._last:
+            # The session's parse cache returned the same result: nothing changed.
+            return []
+        self._last = orders
+        return self.update(orders)
+
+    def __iter__(self):
+        """Polls every `interval` seconds forever, yielding each new or changed order."""
+        while True:
+            started = time.monotonic()
+            yield from self.poll()
+            time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
@@ -0,0 +1,314 @@
+import threading
+import time
+
+from firstrade.account import FTSession
+from firstrade.order import OrderSpec, get_orders
+
+FINAL_STATUSES = ("executed", "filled", "cancelled", "canceled", "rejected", "expired")
+
+
+def is_final(status):
+    """Returns True if an order status from `get_orders` can no longer change."""
+    return status.strip().lower().startswith(FINAL_STATUSES)
+
+
+class OrderRecord:
+    """
+    Dataclass for the locally known state of one placed order.
+
+    Attributes:
+        order_id (str): The order reference number from the order confirmation.
+        spec (OrderSpec): The order that was placed.
+        order_confirmation (dict): The confirmation data returned when the order was placed.
+        status (str): The latest status, "Placed" until seen in `get_orders`.
+        order (dict): The order as last returned by `get_orders`, or None.
+        placed_at (float): Unix time the order was placed.
+        updated_at (float): Unix time the status last changed.
+        checked_at (float): Unix time the order was last reconciled, or None.
+    """
+
+    __slots__ = (
+        "order_id",
+        "spec",
+        "order_confirmation",
+        "status",
+        "order",
+        "placed_at",
+        "updated_at",
+        "checked_at",
+        "_next_check",
+        "_backoff",
+    )
+
+    def __init__(self, order_id, spec: OrderSpec, order_confirmation):
+        self.order_id = order_id
+        self.spec = spec
+        self.order_confirmation = order_confirmation
+        self.status = "Placed"
+        self.order = None
+        self.placed_at = self.updated_at = time.time()
+        self.checked_at = None
+        self._next_check = 0.0
+        self._backoff = 0.0
+
+    @property
+    def account(self):
+        return self.spec.account
+
+    @property
+    def symbol(self):
+        return self.spec.symbol
+
+    @property
+    def is_open(self):
+        return not is_final(self.status)
+
+    def __repr__(self):
+        return f"OrderRecord({self.order_id!r}, {self.account!r}, {self.symbol!r}, {self.status!r})"
+
+
+class OrderBook:
+    """
+    Records every order placed with a session and keeps their status up to date.
+
+    Open orders are indexed by symbol, by account and by both, so `open_orders`
+    answers from local state without a request. `reconcile` (or the thread
+    started by `start`) fetches `get_orders` only for accounts with an order due
+    a check: open orders are checked every `interval` seconds, and orders in a
+    final state are checked again after a backoff that doubles up to
+    `max_backoff`. The thread sleeps while no order is open and wakes when the
+    next one is recorded.
+
+    Attributes:
+        orders (dict): OrderRecord of every recorded order, keyed by order id.
+        errors (dict): The exception of the last failed fetch of each account, until one succeeds.
+        last_error (Exception): The exception of the last failed fetch of any account, or None.
+    """
+
+    def __init__(self, ft_session: FTSession, interval=5.0, max_backoff=300.0):
+        """
+        Initializes a new instance of the OrderBook class.
+
+        Orders placed with `ft_session` (and its isolated copies) are recorded
+        in this book from now on.
+
+        Args:
+            ft_session (FTSession): The session object used for making HTTP requests to Firstrade.
+            interval (float, optional): Seconds between checks of an open order. Defaults to 5.0.
+            max_backoff (float, optional): Longest time in seconds between checks of an order
+                in a final state. Defaults to 300.
+        """
+        self.ft_session = ft_session
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.orders = {}
+        self.errors = {}
+        self.last_error = None
+        self._open_by_symbol = {}
+        self._open_by_account = {}
+        self._open_by_symbol_account = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        ft_session.order_book = self
+
+    def record(self, spec: OrderSpec, order_confirmation):
+        """
+        Records a submitted order. Called by `Order.place_order`.
+
+        Args:
+            spec (OrderSpec): The order that was placed.
+            order_confirmation (dict): The confirmation data of the submission.
+
+        Returns:
+            OrderRecord: The new record, or None if the confirmation has no order id.
+        """
+        order_id = order_confirmation.get("orderid")
+        if not order_id or order_confirmation.get("success") == "No":
+            return None
+        record = OrderRecord(order_id, spec, order_confirmation)
+        record._next_check = time.monotonic() + self.interval
+        with self._lock:
+            self.orders[order_id] = record
+            self._index(record)
+        self._wake.set()
+        return record
+
+    def _indexes(self, record):
+        return (
+            (self._open_by_symbol, record.symbol),
+            (self._open_by_account, record.account),
+            (self._open_by_symbol_account, (record.symbol, record.account)),
+        )
+
+    def _index(self, record):
+        for index, key in self._indexes(record):
+            index.setdefault(key, {})[record.order_id] = record
+
+    def _unindex(self, record):
+        for index, key in self._indexes(record):
+            orders = index.get(key)
+            if orders is not None:
+                orders.pop(record.order_id, None)
+                if not orders:
+                    del index[key]
+
+    def get(self, order_id):
+        """Returns the OrderRecord of an order id, or None."""
+        return self.orders.get(order_id)
+
+    def open_orders(self, symbol=None, account=None):
+        """
+        Returns the recorded orders that are not in a final state, without a request.
+
+        Args:
+            symbol (str, optional): Only orders for this ticker.
+            account (str, optional): Only orders in this account.
+
+        Returns:
+            list: OrderRecord of each matching open order, oldest first.
+        """
+        with self._lock:
+            if symbol is None and account is None:
+                return [record for orders in self._open_by_account.values() for record in orders.values()]
+            if symbol is None:
+                return list(self._open_by_account.get(account, {}).values())
+            if account is None:
+                return list(self._open_by_symbol.get(symbol, {}).values())
+            return list(self._open_by_symbol_account.get((symbol, account), {}).values())
+
+    def due_accounts(self):
+        """Returns the accounts with at least one order due a check."""
+        now = time.monotonic()
+        with self._lock:
+            return sorted({record.account for record in self.orders.values() if record._next_check <= now})
+
+    def reconcile(self, accounts=None):
+        """
+        Updates recorded orders from `get_orders`.
+
+        Args:
+            accounts (iterable, optional): Accounts to fetch. Defaults to the accounts
+                with an order due a check.
+
+        Returns:
+            list: OrderRecord of each order whose status changed.
+
+        Raises:
+            Exception: The error of the first account whose orders could not be fetched,
+                after the other accounts were reconciled. Every failure is kept in `errors`.
+        """
+        changed = []
+        error = None
+        for account in self.due_accounts() if accounts is None else accounts:
+            try:
+                orders = get_orders(self.ft_session, account)
+            except Exception as e:
+                self._failed(account, e)
+                error = error or e
+                continue
+            self.errors.pop(account, None)
+            self.update(account, orders, changed)
+        if error is not None:
+            raise error
+        return changed
+
+    def _failed(self, account, error):
+        # Retry the account after `interval` instead of on every pass.
+        self.errors[account] = self.last_error = error
+        retry_at = time.monotonic() + self.interval
+        with self._lock:
+            for record in self.orders.values():
+                if record.account == account and record._next_check < retry_at:
+                    record._next_check = retry_at
+
+    def update(self, account, orders, changed=None):
+        """
+        Applies a list of orders from `get_orders` for one account.
+
+        Args:
+            account (str): The account the orders were fetched for.
+            orders (list): Orders as returned by `get_orders`.
+            changed (list, optional): List the records whose status changed are appended to.
+
+        Returns:
+            list: OrderRecord of each order whose status changed.
+        """
+        changed = [] if changed is None else changed
+        now = time.monotonic()
+        with self._lock:
+            for order in orders:
+                record = self.orders.get(order["Reference"])
+                if record is None or record.account != account:
+                    continue
+                record.order = order
+                if order["Status"] != record.status:
+                    was_open = record.is_open
+                    record.status = order["Status"]
+                    record.updated_at = time.time()
+                    if was_open and not record.is_open:
+                        self._unindex(record)
+                    elif not was_open and record.is_open:
+                        self._index(record)
+                    changed.append(record)
+            for record in self.orders.values():
+                if record.account != account:
+                    continue
+                record.checked_at = time.time()
+                if record.is_open:
+                    record._backoff = 0.0
+                    record._next_check = now + self.interval
+                else:
+                    record._backoff = min(self.max_backoff, max(self.interval, record._backoff * 2))
+                    record._next_check = now + record._backoff
+        return changed
+
+    def forget(self, order_id):
+        """Stops tracking an order."""
+        with self._lock:
+            record = self.orders.pop(order_id, None)
+            if record is not None:
+                self._unindex(record)
+
+    def start(self):
+        """Reconciles on a background thread whenever an order is due a check."""
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+
+        def run():
+            while True:
+                self._wake.wait(self._until_due())
+                self._wake.clear()
+                if self._stop.is_set():
+                    break
+                try:
+                    self.reconcile()
+                except Exception:
+                    pass  # kept in self.errors
+
+        self._thread = threading.Thread(target=run, name="OrderBook", daemon=True)
+        self._thread.start()
+        return self
+
+    def _until_due(self):
+        # None, i.e. until `record` or `stop`, while no order is open.
+        with self._lock:
+            if not self._open_by_account:
+                return None
+            return max(0.0, min(record._next_check for record in self.orders.values()) - time.monotonic())
+
+    def stop(self):
+        """Stops the thread started by `start`."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
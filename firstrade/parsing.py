@@ -0,0 +1,106 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Untuned default: the crossover has only been measured on a single CPU, where
+# the pool cannot win. Measure it on the target machine with
+# benchmarks/bench_parse_pool.py and pass `min_size` accordingly.
+MIN_SIZE = 32 * 1024
+
+
+def _warm():
+    # Import the parser modules once per worker instead of on its first task.
+    import firstrade.account  # noqa: F401
+    import firstrade.order  # noqa: F401
+    import firstrade.symbols  # noqa: F401
+
+
+def _size(payload):
+    # Bytes, also for `response.text`; an ASCII str, the usual case, is not encoded.
+    if isinstance(payload, str) and not payload.isascii():
+        return len(payload.encode("utf-8"))
+    return len(payload)
+
+
+class ParseExecutor:
+    """
+    Parses large responses in a pool of worker processes.
+
+    Parsing with BeautifulSoup holds the GIL, so responses fetched concurrently
+    by threads are still parsed one at a time. Attach an executor with
+    `FTSession(..., parse_executor=ParseExecutor())` and every response parsed
+    through `account.parse_response` of at least `min_size` bytes is sent to a
+    worker, which returns the parser's plain result. Smaller responses are
+    parsed in the calling thread, where that is faster than the round trip.
+
+    The parser and its arguments must be picklable, i.e. module-level functions.
+    The executor can be shared by several sessions and is not closed with them.
+
+    Workers are started with "forkserver" (or "spawn" where that is not
+    available), not "fork": forking a process that already runs keep-alive,
+    scheduler and polling threads can leave a worker stuck on a lock one of
+    them held. Like any such pool, the main script must create it under
+    `if __name__ == "__main__":`.
+
+    Attributes:
+        min_size (int): Smallest payload in bytes parsed in a worker.
+        offloaded (int): Payloads parsed in a worker.
+        inline (int): Payloads parsed in the calling thread.
+    """
+
+    def __init__(self, max_workers=None, min_size=MIN_SIZE, mp_context=None):
+        """
+        Initializes a new instance of the ParseExecutor class.
+
+        Args:
+            max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            min_size (int, optional): Smallest payload in bytes parsed in a worker, counted in UTF-8
+                for str payloads. Defaults to 32 KiB, which is not tuned.
+            mp_context (multiprocessing.context.BaseContext, optional): Context the workers
+                are started with. Defaults to "forkserver", or "spawn" where it is not available.
+        """
+        if mp_context is None:
+            methods = multiprocessing.get_all_start_methods()
+            mp_context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self.min_size = min_size
+        self.offloaded = 0
+        self.inline = 0
+        self._lock = threading.Lock()
+        self._pool = ProcessPoolExecutor(max_workers, mp_context, initializer=_warm)
+
+    def run(self, parser, payload, *args):
+        """
+        Calls `parser(payload, *args)`, in a worker if the payload is large enough.
+
+        Args:
+            parser (callable): A module-level parser function.
+            payload (bytes or str): The response body.
+
+        Returns:
+            The parser's result.
+        """
+        if _size(payload) < self.min_size:
+            self._count("inline")
+            return parser(payload, *args)
+        try:
+            result = self._pool.submit(parser, payload, *args).result()
+        except BrokenProcessPool:
+            self._count("inline")
+            return parser(payload, *args)
+        self._count("offloaded")
+        return result
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def close(self):
+        """Shuts the worker processes down."""
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
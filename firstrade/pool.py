@@ -0,0 +1,137 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.adapters import HTTPAdapter
+
+from firstrade import urls
+from firstrade.account import FTSession
+
+
+class FTSessionPool:
+    """
+    Logs in many Firstrade users concurrently and hands out their sessions by username.
+
+    Every session mounts the same HTTPAdapter, so they share one pool of
+    keep-alive connections to Firstrade and a connection opened (and TLS
+    handshake done) for one user is reused by the others. Cookies stay in each
+    session's own cookie jar.
+
+    Attributes:
+        sessions (dict): Logged in FTSession objects keyed by username.
+        errors (dict): The exception raised by each login that failed, keyed by username.
+        adapter (HTTPAdapter): The transport adapter shared by every session.
+    """
+
+    def __init__(self, credentials, max_workers=4, pool_maxsize=32, **session_kwargs):
+        """
+        Initializes a new instance of the FTSessionPool class and logs in every user.
+
+        Args:
+            credentials (iterable): Dicts with the FTSession `username`, `password`, `pin`
+                and `totp_secret` arguments, and optionally `profile_path`.
+            max_workers (int, optional): Maximum number of logins run at once. Defaults to 4.
+            pool_maxsize (int, optional): Maximum number of connections kept open to Firstrade.
+                Defaults to 32.
+            **session_kwargs: Other FTSession arguments used for every user, i.e. `resume_max_age`.
+        """
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.sessions = {}
+        self.errors = {}
+        self._session_kwargs = session_kwargs
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._keepalive = None
+        self.login(credentials, max_workers)
+
+    def login(self, credentials, max_workers=4):
+        """
+        Logs in users concurrently and adds them to the pool.
+
+        Args:
+            credentials (iterable): Dicts of FTSession arguments, see the constructor.
+            max_workers (int, optional): Maximum number of logins run at once. Defaults to 4.
+        """
+        credentials = list(credentials)
+
+        def login(credential):
+            kwargs = dict(self._session_kwargs)
+            kwargs.update(credential)
+            try:
+                return credential["username"], FTSession(adapter=self.adapter, **kwargs), None
+            except Exception as e:
+                return credential["username"], None, e
+
+        if not credentials:
+            return
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(credentials)))) as executor:
+            for username, session, error in executor.map(login, credentials):
+                with self._lock:
+                    if error is None:
+                        self.sessions[username] = session
+                        self.errors.pop(username, None)
+                    else:
+                        self.errors[username] = error
+
+    def get(self, username, default=None):
+        """Returns the session of a user, or `default` if the user is not logged in."""
+        return self.sessions.get(username, default)
+
+    def __getitem__(self, username):
+        return self.sessions[username]
+
+    def __contains__(self, username):
+        return username in self.sessions
+
+    def __iter__(self):
+        return iter(list(self.sessions))
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def refresh(self):
+        """
+        Sends a lightweight request on every session. Sessions that have expired log in again.
+
+        Returns:
+            dict: The exception raised for each user whose refresh failed, keyed by username.
+        """
+        failed = {}
+        for username, session in list(self.sessions.items()):
+            try:
+                session.get(url=urls.get_xml(), headers=urls.session_headers())
+            except Exception as e:
+                failed[username] = e
+        return failed
+
+    def start_keepalive(self, interval=300.0):
+        """
+        Refreshes every session every `interval` seconds on a background thread,
+        keeping cookies valid and connections open.
+
+        Args:
+            interval (float, optional): Seconds between refreshes. Defaults to 300.
+        """
+        if self._keepalive is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                self.refresh()
+
+        self._keepalive = threading.Thread(target=run, name="FTSessionPool-keepalive", daemon=True)
+        self._keepalive.start()
+
+    def close(self):
+        """Stops the keepalive thread and closes the shared connections."""
+        self._stop.set()
+        if self._keepalive is not None:
+            self._keepalive.join()
+            self._keepalive = None
+        self.adapter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,138 @@
+from lxml import etree
+
+from firstrade._util import XML_PARSER, np, require_numpy, to_float_or_nan
+
+POSITION_TAGS = ("symbol", "quantity", "price", "change", "changepercent", "vol")
+NUMERIC_COLUMNS = ("quantity", "price", "change", "change_percent", "vol")
+
+
+def parse_position_columns(data):
+    """
+    Parses a `getxml?page=pos` response into columns in a single pass.
+
+    Args:
+        data (bytes or str): Body of the positions response.
+
+    Returns:
+        dict: Lists keyed by column name: `symbol` holds strings, the
+            `NUMERIC_COLUMNS` hold floats (NaN where the value is not a number).
+
+    Raises:
+        ValueError: If a position is missing one of the elements, so the columns
+            would no longer line up.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    columns = {tag: [] for tag in POSITION_TAGS}
+    root = etree.fromstring(data, XML_PARSER) if data else None
+    if root is not None:
+        for element in root.iter(POSITION_TAGS):
+            columns[element.tag].append(element.text or "")
+    lengths = {tag: len(values) for tag, values in columns.items()}
+    if len(set(lengths.values())) > 1:
+        raise ValueError(f"Positions response has columns of different lengths: {lengths}")
+    return {
+        "symbol": columns["symbol"],
+        "quantity": [to_float_or_nan(text) for text in columns["quantity"]],
+        "price": [to_float_or_nan(text) for text in columns["price"]],
+        "change": [to_float_or_nan(text) for text in columns["change"]],
+        "change_percent": [to_float_or_nan(text) for text in columns["changepercent"]],
+        "vol": [to_float_or_nan(text) for text in columns["vol"]],
+    }
+
+
+class PositionsTable:
+    """
+    Columnar table of positions across accounts, backed by NumPy arrays.
+
+    Every column has one entry per position, so a ticker held in several
+    accounts has one row per account.
+
+    Attributes:
+        account (numpy.ndarray): Account number of each position.
+        symbol (numpy.ndarray): Ticker of each position.
+        quantity (numpy.ndarray): Shares held, as float64.
+        price (numpy.ndarray): Last price, as float64.
+        change (numpy.ndarray): Price change today, as float64.
+        change_percent (numpy.ndarray): Price change today in percent, as float64.
+        vol (numpy.ndarray): Volume traded today, as float64.
+    """
+
+    __slots__ = ("account", "symbol") + NUMERIC_COLUMNS
+
+    def __init__(self, account, symbol, quantity, price, change, change_percent, vol):
+        require_numpy("PositionsTable")
+        self.account = np.asarray(account, dtype=str)
+        self.symbol = np.asarray(symbol, dtype=str)
+        self.quantity = np.asarray(quantity, dtype=np.float64)
+        self.price = np.asarray(price, dtype=np.float64)
+        self.change = np.asarray(change, dtype=np.float64)
+        self.change_percent = np.asarray(change_percent, dtype=np.float64)
+        self.vol = np.asarray(vol, dtype=np.float64)
+
+    @classmethod
+    def from_columns(cls, columns_by_account):
+        """
+        Builds a table from `parse_position_columns` results.
+
+        Args:
+            columns_by_account (dict): `parse_position_columns` results keyed by account number.
+
+        Returns:
+            PositionsTable: The combined table.
+        """
+        account = []
+        merged = {name: [] for name in ("symbol",) + NUMERIC_COLUMNS}
+        for number, columns in columns_by_account.items():
+            account.extend([number] * len(columns["symbol"]))
+            for name in merged:
+                merged[name].extend(columns[name])
+        return cls(account, **merged)
+
+    def __len__(self):
+        return len(self.symbol)
+
+    def __getitem__(self, selection):
+        """Returns the rows selected by a boolean mask, index array or slice as a new table."""
+        return PositionsTable(*(getattr(self, name)[selection] for name in self.__slots__))
+
+    def market_value(self):
+        """numpy.ndarray: quantity * price of each position."""
+        return self.quantity * self.price
+
+    def day_pnl(self):
+        """numpy.ndarray: quantity * change of each position, the profit or loss today."""
+        return self.quantity * self.change
+
+    def for_account(self, account):
+        """Returns the positions of one account."""
+        return self[self.account == str(account)]
+
+    def for_symbol(self, symbol):
+        """Returns the positions in one ticker across accounts."""
+        return self[self.symbol == symbol]
+
+    def totals(self, by="account"):
+        """
+        Sums market value, day P&L and quantity by account or symbol.
+
+        Args:
+            by (str, optional): "account" or "symbol". Defaults to "account".
+
+        Returns:
+            dict: {"market_value", "day_pnl", "quantity"} sums keyed by account or symbol.
+        """
+        keys, inverse = np.unique(getattr(self, by), return_inverse=True)
+        sums = {
+            "market_value": np.bincount(inverse, self.market_value(), len(keys)),
+            "day_pnl": np.bincount(inverse, self.day_pnl(), len(keys)),
+            "quantity": np.bincount(inverse, self.quantity, len(keys)),
+        }
+        return {
+            str(key): {name: float(values[i]) for name, values in sums.items()}
+            for i, key in enumerate(keys)
+        }
+
+    def to_dict(self):
+        """Returns the columns as a dict of arrays, i.e. for `pandas.DataFrame`."""
+        return {name: getattr(self, name) for name in self.__slots__}
@@ -0,0 +1,185 @@
+import math
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+from firstrade.symbols import get_quotes
+
+
+class InvalidOrder(ValueError):
+    """Raised when an order fails validation against the symbol reference data."""
+
+
+class SymbolInfo(NamedTuple):
+    """Reference data of one symbol, as last seen in a quote."""
+
+    symbol: str
+    exchange: str
+    company_name: str
+    tick: float
+    fractional: bool
+    updated_at: float
+
+
+def _tick(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class SymbolReference:
+    """
+    Disk-backed cache of symbol reference data for validating orders without a request.
+
+    Every quote built with a session that has this cache attached, i.e.
+    `FTSession(..., symbol_reference=SymbolReference(path))`, stores the symbol's
+    exchange, company name, tick and fractional flag in an SQLite table keyed by
+    symbol. The table is read into memory when the cache is opened, so lookups
+    never touch the disk, and a row is only rewritten when it changed or is half
+    way to going stale, not on every quote.
+
+    `Order.place_order` then calls `validate` before previewing the order, so a
+    fractional or notional order for a symbol that does not allow it, or a price
+    off the symbol's tick, fails locally instead of costing a round trip.
+
+    Attributes:
+        path (str): The SQLite database file, or ":memory:".
+        max_age (float): Seconds after which an entry is stale and no longer used.
+        require_known (bool): Whether `validate` rejects symbols that have no fresh entry.
+    """
+
+    def __init__(self, path, max_age=86400.0, require_known=False):
+        """
+        Initializes a new instance of the SymbolReference class.
+
+        Args:
+            path (str): The SQLite database file, created if missing, or ":memory:".
+            max_age (float, optional): Seconds after which an entry is stale. Defaults to one day.
+            require_known (bool, optional): Reject orders for symbols without a fresh entry.
+                Otherwise they are left for Firstrade to check. Defaults to False.
+        """
+        self.path = path
+        self.max_age = max_age
+        self.require_known = require_known
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS symbols ("
+            "symbol TEXT PRIMARY KEY, exchange TEXT, company_name TEXT, tick REAL, fractional INTEGER, updated_at REAL)"
+        )
+        self._db.commit()
+        self._entries = {
+            row[0]: SymbolInfo(row[0], row[1], row[2], row[3] if row[3] is not None else math.nan, bool(row[4]), row[5])
+            for row in self._db.execute("SELECT symbol, exchange, company_name, tick, fractional, updated_at FROM symbols")
+        }
+
+    def record(self, quote):
+        """
+        Stores the reference data of a quote. Called by `SymbolQuote`.
+
+        Args:
+            quote (SymbolQuote): The quote.
+        """
+        now = time.time()
+        info = SymbolInfo(quote.symbol.upper(), quote.exchange, quote.company_name, _tick(quote.tick), quote.fractional, now)
+        with self._lock:
+            cached = self._entries.get(info.symbol)
+            if cached is not None and now - cached.updated_at < self.max_age / 2 and cached[1:5] == info[1:5]:
+                return
+            self._entries[info.symbol] = info
+            self._db.execute(
+                "INSERT OR REPLACE INTO symbols VALUES (?, ?, ?, ?, ?, ?)",
+                (info.symbol, info.exchange, info.company_name, None if math.isnan(info.tick) else info.tick,
+                 int(info.fractional), info.updated_at),
+            )
+            self._db.commit()
+
+    def get(self, symbol):
+        """
+        Returns the reference data of a symbol.
+
+        Args:
+            symbol (str): The symbol.
+
+        Returns:
+            SymbolInfo: The entry, or None if there is none or it is stale.
+        """
+        info = self._entries.get(symbol.upper())
+        if info is None or time.time() - info.updated_at >= self.max_age:
+            return None
+        return info
+
+    def __contains__(self, symbol):
+        return self.get(symbol) is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def missing(self, symbols):
+        """Returns the symbols, uppercased and deduplicated, that have no fresh entry."""
+        return [symbol for symbol in dict.fromkeys(symbol.upper() for symbol in symbols) if symbol not in self]
+
+    def preload(self, ft_session, symbols, max_workers=10):
+        """
+        Fetches quotes for the symbols without a fresh entry, i.e. a watchlist at startup.
+
+        Args:
+            ft_session (FTSession): The session object used for making HTTP requests to Firstrade.
+            symbols (iterable): The symbols to have entries for.
+            max_workers (int, optional): Maximum number of concurrent requests. Defaults to 10.
+
+        Returns:
+            QuoteBatch: The quotes fetched, with the errors of symbols that could not be quoted.
+        """
+        batch = get_quotes(ft_session, self.missing(symbols), max_workers)
+        if getattr(ft_session, "symbol_reference", None) is not self:
+            for quote in batch.quotes.values():
+                self.record(quote)
+        return batch
+
+    def validate(self, symbol, quantity, price=None, notional=False):
+        """
+        Checks an order against the symbol's reference data, without a request.
+
+        Args:
+            symbol (str): Ticker of the order.
+            quantity (float): Shares, or dollars if `notional`.
+            price (float, optional): Limit or stop price, checked against the tick. Not checked when not given.
+            notional (bool, optional): Whether the quantity is a dollar amount. Defaults to False.
+
+        Returns:
+            SymbolInfo: The entry the order was checked against, or None if there is no fresh entry.
+
+        Raises:
+            InvalidOrder: If the order cannot be placed for the symbol.
+        """
+        info = self.get(symbol)
+        if info is None:
+            if self.require_known:
+                raise InvalidOrder(f"{symbol} is not a known symbol.")
+            return None
+        quantity = float(quantity)
+        if notional and not info.fractional:
+            raise InvalidOrder(f"{info.symbol} does not allow notional orders.")
+        if not notional and not quantity.is_integer() and not info.fractional:
+            raise InvalidOrder(f"{info.symbol} does not allow fractional shares.")
+        if price and info.tick > 0:
+            ticks = float(price) / info.tick
+            if abs(ticks - round(ticks)) > 1e-6:
+                raise InvalidOrder(f"{price} is not a multiple of the {info.symbol} tick of {info.tick}.")
+        return info
+
+    def close(self):
+        """Closes the database."""
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,232 @@
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+
+from firstrade import urls
+
+
+class Priority(IntEnum):
+    """
+    This is an :class:'~enum.IntEnum'
+    that contains the request priority classes. Lower values go first.
+    """
+
+    CANCEL = 0
+    ORDER = 1
+    ORDER_STATUS = 2
+    ACCOUNT = 3
+    QUOTE = 4
+
+
+DEFAULT_PRIORITIES = {
+    "cancel_order": Priority.CANCEL,
+    "orderbar": Priority.ORDER,
+    "order_list": Priority.ORDER_STATUS,
+    "quote": Priority.QUOTE,
+}
+
+
+class QueueFull(Exception):
+    """Raised when a priority class already has `max_queue` requests waiting."""
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most `capacity` tokens.
+
+    Not thread-safe on its own; RequestScheduler guards it with its lock.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Initializes a new instance of the TokenBucket class.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float, optional): Maximum tokens held, i.e. the burst size. Defaults to `rate`,
+                or 1 if `rate` is lower.
+
+        Raises:
+            ValueError: If `rate` is not positive or `capacity` is below 1, as the bucket
+                would then never hold a whole token.
+        """
+        if not rate > 0:
+            raise ValueError(f"Token bucket rate must be positive, not {rate!r}.")
+        if capacity is not None and not capacity >= 1:
+            raise ValueError(f"Token bucket capacity must be at least 1, not {capacity!r}.")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, now):
+        """Returns the seconds until a token is available, 0 if one is available now."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        """Removes one token. Call only after `delay()` returned 0."""
+        self.tokens -= 1
+
+
+class RequestScheduler:
+    """
+    Orders requests by priority class and paces them with token buckets.
+
+    A request waits until no higher-priority request that could run is waiting,
+    its endpoint's bucket and the global bucket have a token, and fewer than
+    `max_in_flight` requests are running. Endpoints are the names returned by
+    `urls.endpoint`.
+
+    Attributes:
+        max_queue (int): Maximum requests waiting per priority class before `QueueFull` is raised.
+        max_in_flight (int): Maximum requests running at once, or None for no limit.
+    """
+
+    def __init__(
+        self,
+        rate=None,
+        burst=None,
+        endpoint_limits=None,
+        max_in_flight=None,
+        max_queue=100,
+        priorities=None,
+    ):
+        """
+        Initializes a new instance of the RequestScheduler class.
+
+        Args:
+            rate (float, optional): Requests per second across all endpoints. No global limit when not given.
+            burst (float, optional): Size of the global bucket. Defaults to `rate`.
+            endpoint_limits (dict, optional): (rate, burst) tuples keyed by endpoint name,
+                i.e. {"quote": (10, 20)}.
+            max_in_flight (int, optional): Maximum requests running at once. No limit when not given.
+            max_queue (int, optional): Maximum requests waiting per priority class. Defaults to 100.
+            priorities (dict, optional): Priority of each endpoint name, merged over `DEFAULT_PRIORITIES`.
+                Endpoints not listed use `Priority.ACCOUNT`.
+
+        Raises:
+            ValueError: If a rate is not positive or a burst is below 1.
+        """
+        self.max_queue = max_queue
+        self.max_in_flight = max_in_flight
+        self.priorities = dict(DEFAULT_PRIORITIES)
+        self.priorities.update(priorities or {})
+        self._global = TokenBucket(rate, burst) if rate is not None else None
+        self._buckets = {
+            name: TokenBucket(*limit) for name, limit in (endpoint_limits or {}).items()
+        }
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._sequence = 0
+        self._in_flight = 0
+        self._queued = {priority: 0 for priority in Priority}
+        self._waits = {priority: [0, 0.0, 0.0] for priority in Priority}
+
+    def priority(self, endpoint):
+        """Returns the priority class of an endpoint name."""
+        return self.priorities.get(endpoint, Priority.ACCOUNT)
+
+    @contextmanager
+    def slot(self, url_or_endpoint, priority=None):
+        """
+        Waits for a turn to send a request and holds it until the block exits.
+
+        Args:
+            url_or_endpoint (str): The request URL, or an endpoint name from `urls.endpoint`.
+            priority (Priority, optional): Overrides the endpoint's priority class.
+
+        Raises:
+            QueueFull: If the priority class already has `max_queue` requests waiting.
+        """
+        endpoint = urls.endpoint(url_or_endpoint) if "/" in url_or_endpoint else url_or_endpoint
+        self._acquire(endpoint, self.priority(endpoint) if priority is None else Priority(priority))
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _acquire(self, endpoint, priority):
+        with self._condition:
+            if self._queued[priority] >= self.max_queue:
+                raise QueueFull(f"{self._queued[priority]} {priority.name} requests already waiting.")
+            self._sequence += 1
+            waiter = (priority, self._sequence, endpoint)
+            self._waiters.append(waiter)
+            self._waiters.sort()
+            self._queued[priority] += 1
+            start = time.monotonic()
+            try:
+                while True:
+                    delay = self._turn(waiter)
+                    if delay == 0:
+                        break
+                    self._condition.wait(delay)
+            finally:
+                self._waiters.remove(waiter)
+                self._queued[priority] -= 1
+            self._in_flight += 1
+            waited = time.monotonic() - start
+            stats = self._waits[priority]
+            stats[0] += 1
+            stats[1] += waited
+            stats[2] = max(stats[2], waited)
+            # Let the next waiter re-check now that this one left the queue.
+            self._condition.notify_all()
+
+    def _turn(self, waiter):
+        """Takes the tokens and returns 0 if it is `waiter`'s turn, else seconds to wait (None for a notify)."""
+        if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+            return None
+        now = time.monotonic()
+        global_delay = self._global.delay(now) if self._global is not None else 0.0
+        if global_delay:
+            return global_delay
+        shortest = None
+        for candidate in self._waiters:
+            bucket = self._buckets.get(candidate[2])
+            delay = bucket.delay(now) if bucket is not None else 0.0
+            if delay == 0:
+                if candidate is not waiter:
+                    # A higher-priority request can go first; wake it.
+                    self._condition.notify_all()
+                    return shortest
+                if bucket is not None:
+                    bucket.take()
+                if self._global is not None:
+                    self._global.take()
+                return 0
+            shortest = delay if shortest is None else min(shortest, delay)
+        return shortest
+
+    def metrics(self):
+        """
+        Returns the current queue depths and the wait times so far.
+
+        Returns:
+            dict: `in_flight`, plus `queue_depth` and `wait` (count, mean, total and max seconds)
+                keyed by priority class name.
+        """
+        with self._condition:
+            return {
+                "in_flight": self._in_flight,
+                "queue_depth": {priority.name: count for priority, count in self._queued.items()},
+                "wait": {
+                    priority.name: {
+                        "count": count,
+                        "mean": total / count if count else 0.0,
+                        "total": total,
+                        "max": longest,
+                    }
+                    for priority, (count, total, longest) in self._waits.items()
+                },
+            }
@@ -0,0 +1,210 @@
+import asyncio
+import threading
+import time
+
+from firstrade.account import FTSession
+from firstrade.symbols import QUOTE_FIELDS, get_quotes
+
+
+class QuoteStream:
+    """
+    Polls quotes for a set of symbols and yields only the fields that changed.
+
+    Iterate it directly, or with `async for`, to receive `(symbol, changes)`
+    tuples, where `changes` maps SymbolQuote attribute names to their new values.
+    The first update for a symbol contains every field.
+
+    Updates waiting for a slow consumer are merged per symbol, so at most one
+    pending update per symbol is held and it always carries the latest values.
+
+    Attributes:
+        interval (float): Seconds between the starts of two polls.
+        errors (dict): The latest error for symbols whose last poll failed.
+        polls (int): Number of polls completed.
+    """
+
+    def __init__(self, ft_session: FTSession, symbols, interval=1.0, max_workers=10):
+        """
+        Initializes a new instance of the QuoteStream class.
+
+        Polling starts when the stream is first iterated, or with `start()`.
+
+        Args:
+            ft_session (FTSession):
+                The session object used for making HTTP requests to Firstrade.
+            symbols (iterable): The symbols to poll.
+            interval (float, optional): Seconds between the starts of two polls. Defaults to 1.0.
+            max_workers (int, optional): Maximum number of concurrent quote requests per poll.
+                Defaults to 10.
+        """
+        self.ft_session = ft_session
+        self.interval = interval
+        self.max_workers = max_workers
+        self.errors = {}
+        self.polls = 0
+        self._symbols = list(dict.fromkeys(symbols))
+        self._last = {}
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._wakeups = set()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def symbols(self):
+        """list: The symbols currently being polled."""
+        with self._condition:
+            return list(self._symbols)
+
+    def add(self, *symbols):
+        """Starts polling more symbols from the next poll on."""
+        with self._condition:
+            for symbol in symbols:
+                if symbol not in self._symbols:
+                    self._symbols.append(symbol)
+
+    def remove(self, *symbols):
+        """Stops polling symbols and drops their pending updates."""
+        with self._condition:
+            for symbol in symbols:
+                if symbol in self._symbols:
+                    self._symbols.remove(symbol)
+                self._last.pop(symbol, None)
+                self._pending.pop(symbol, None)
+                self.errors.pop(symbol, None)
+
+    def start(self):
+        """Starts the background polling thread if it is not running."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="QuoteStream", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops polling and ends any iteration once pending updates are consumed."""
+        self._stopped.set()
+        with self._condition:
+            self._notify()
+
+    def _notify(self):
+        """Wakes every waiting consumer, threads and `async for` loops alike. Call with the lock held."""
+        self._condition.notify_all()
+        for loop, event in self._wakeups:
+            loop.call_soon_threadsafe(event.set)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            self.poll()
+            self._stopped.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def poll(self):
+        """
+        Fetches every symbol once and queues the changed fields.
+
+        Called by the polling thread, but can be called directly to drive the stream by hand.
+        """
+        batch = get_quotes(self.ft_session, self.symbols, self.max_workers)
+        with self._condition:
+            for symbol, quote in batch.quotes.items():
+                if symbol not in self._symbols:
+                    continue
+                self.errors.pop(symbol, None)
+                values = tuple(getattr(quote, name) for name in QUOTE_FIELDS)
+                previous = self._last.get(symbol)
+                if previous == values:
+                    continue
+                self._last[symbol] = values
+                if previous is None:
+                    changes = dict(zip(QUOTE_FIELDS, values))
+                else:
+                    changes = {
+                        name: value
+                        for name, value, old in zip(QUOTE_FIELDS, values, previous)
+                        if value != old
+                    }
+                pending = self._pending.get(symbol)
+                if pending is None:
+                    self._pending[symbol] = changes
+                else:
+                    pending.update(changes)
+            for symbol, error in batch.errors.items():
+                if symbol in self._symbols:
+                    self.errors[symbol] = error
+            self.polls += 1
+            if self._pending:
+                self._notify()
+
+    def take(self, timeout=None):
+        """
+        Waits for and removes every pending update.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Waits until an update or `stop()` when not given.
+
+        Returns:
+            dict: Changed fields keyed by symbol. Empty on timeout, None once the stream is stopped.
+        """
+        with self._condition:
+            if not self._pending and not self._stopped.is_set():
+                self._condition.wait(timeout)
+            if not self._pending and self._stopped.is_set():
+                return None
+            updates, self._pending = self._pending, {}
+            return updates
+
+    def __iter__(self):
+        self.start()
+        updates = {}
+        try:
+            while True:
+                updates = self.take()
+                if updates is None:
+                    return
+                while updates:
+                    symbol = next(iter(updates))
+                    yield symbol, updates.pop(symbol)
+        finally:
+            # A consumer that breaks out part-way leaves the rest for the next one.
+            with self._condition:
+                self._requeue(updates or {})
+
+    async def __aiter__(self):
+        # Waits on an asyncio.Event the polling thread sets, rather than a blocking
+        # take() in an executor thread, so a cancelled or abandoned loop leaves
+        # nothing behind that could consume updates later.
+        self.start()
+        wakeup = (asyncio.get_running_loop(), asyncio.Event())
+        with self._condition:
+            self._wakeups.add(wakeup)
+        updates = {}
+        try:
+            while True:
+                wakeup[1].clear()
+                updates = self.take(timeout=0)
+                if updates is None:
+                    return
+                if not updates:
+                    await wakeup[1].wait()
+                    continue
+                while updates:
+                    symbol = next(iter(updates))
+                    yield symbol, updates.pop(symbol)
+        finally:
+            with self._condition:
+                self._wakeups.discard(wakeup)
+                self._requeue(updates or {})
+
+    def _requeue(self, updates):
+        """Puts taken but unconsumed updates back, under any newer pending changes. Call with the lock held."""
+        for symbol, changes in updates.items():
+            if symbol in self._symbols:
+                self._pending[symbol] = {**changes, **self._pending.get(symbol, {})}
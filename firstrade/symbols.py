@@ -1,7 +1,68 @@
-from bs4 import BeautifulSoup
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lxml import etree
 
 from firstrade import urls
-from firstrade.account import FTSession
+from firstrade._util import XML_PARSER, to_float
+from firstrade.account import FTSession, parse_response
+
+
+def parse_quote(data):
+    """
+    Parses a `getxml?page=quo` response in a single pass.
+
+    Args:
+        data (bytes or str): Body of the quote response.
+
+    Returns:
+        dict: The text of every element under `<quote>` keyed by tag name.
+            Only the first occurrence of a tag is kept.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    quote = etree.fromstring(data, XML_PARSER) if data else None
+    if quote is not None and quote.tag != "quote":
+        quote = quote.find(".//quote")
+    if quote is None:
+        raise ValueError("Response does not contain a quote.")
+    fields = {}
+    for element in quote.iter(etree.Element):
+        if element.tag not in fields:
+            fields[element.tag] = element.text or ""
+    return fields
+
+
+def fetch_quote(ft_session: FTSession, symbol: str, fresh=False):
+    """
+    Requests the `getxml?page=quo` response for a symbol.
+
+    Goes through the session's quote cache when it has one, so concurrent
+    requests for the same symbol share one round trip.
+
+    Args:
+        ft_session (FTSession):
+            The session object used for making HTTP requests to Firstrade.
+        symbol (str): The symbol to request.
+        fresh (bool, optional): Bypass the cache. Defaults to False.
+
+    Returns:
+        bytes: The response body.
+    """
+
+    def fetch():
+        return ft_session.get(url=urls.quote(symbol), headers=urls.session_headers()).content
+
+    quote_cache = getattr(ft_session, "quote_cache", None)
+    if quote_cache is None:
+        return fetch()
+    return quote_cache.get(symbol, fetch, fresh)
+
+
+def _to_int(text):
+    if "," in text:
+        text = text.replace(",", "")
+    return int(text) if text.isdigit() else 0
 
 
 class SymbolQuote:
@@ -25,7 +86,36 @@ class SymbolQuote:
         fractional (bool):  If the stock can be traded fractionally, or not
     """
 
-    def __init__(self, ft_session: FTSession, symbol: str):
+    __slots__ = (
+        "ft_session",
+        "symbol",
+        "underlying_symbol",
+        "tick",
+        "exchange",
+        "bid",
+        "ask",
+        "last",
+        "bid_size",
+        "ask_size",
+        "last_size",
+        "bid_mmid",
+        "ask_mmid",
+        "last_mmid",
+        "change",
+        "high",
+        "low",
+        "change_color",
+        "volume",
+        "bidxask",
+        "quote_time",
+        "last_trade_time",
+        "real_time",
+        "fractional",
+        "err_code",
+        "company_name",
+    )
+
+    def __init__(self, ft_session: FTSession, symbol: str, data=None, fresh=False):
         """
         Initializes a new instance of the SymbolQuote class.
 
@@ -33,45 +123,119 @@ class SymbolQuote:
             ft_session (FTSession):
                 The session object used for making HTTP requests to Firstrade.
             symbol (str): The symbol for which the quote information is retrieved.
+            data (bytes or str, optional): A pre-fetched `getxml?page=quo` response to parse
+                instead of requesting one.
+            fresh (bool, optional): Bypass the session's quote cache. Defaults to False.
         """
         self.ft_session = ft_session
         self.symbol = symbol
-        symbol_data = self.ft_session.get(
-            url=urls.quote(self.symbol), headers=urls.session_headers()
-        )
-        soup = BeautifulSoup(symbol_data.text, "xml")
-        quote = soup.find("quote")
-        self.symbol = quote.find("symbol").text
-        self.underlying_symbol = quote.find("underlying_symbol").text
-        self.tick = quote.find("tick").text
-        self.exchange = quote.find("exchange").text
-        self.bid = float(quote.find("bid").text.replace(",", ""))
-        self.ask = float(quote.find("ask").text.replace(",", ""))
-        self.last = float(quote.find("last").text.replace(",", ""))
-        temp_store = quote.find("bidsize").text.replace(",", "")
-        self.bid_size = int(temp_store) if temp_store.isdigit() else 0
-        temp_store = quote.find("asksize").text.replace(",", "")
-        self.ask_size = int(temp_store) if temp_store.isdigit() else 0
-        temp_store = quote.find("lastsize").text.replace(",", "")
-        self.last_size = int(temp_store) if temp_store.isdigit() else 0
-        self.bid_mmid = quote.find("bidmmid").text
-        self.ask_mmid = quote.find("askmmid").text
-        self.last_mmid = quote.find("lastmmid").text
-        self.change = float(quote.find("change").text.replace(",", ""))
-        if quote.find("high").text == "N/A":
-            self.high = None
-        else:
-            self.high = float(quote.find("high").text.replace(",", ""))
-        if quote.find("low").text == "N/A":
-            self.low = "None"
-        else:
-            self.low = float(quote.find("low").text.replace(",", ""))
-        self.change_color = quote.find("changecolor").text
-        self.volume = quote.find("vol").text
-        self.bidxask = quote.find("bidxask").text
-        self.quote_time = quote.find("quotetime").text
-        self.last_trade_time = quote.find("lasttradetime").text
-        self.real_time = quote.find("realtime").text == "T"
-        self.fractional = quote.find("fractional").text == "T"
-        self.err_code = quote.find("errcode").text
-        self.company_name = quote.find("companyname").text
+        if data is None:
+            data = fetch_quote(ft_session, symbol, fresh)
+        quote = parse_response(ft_session, "quote", parse_quote, data)
+        self.symbol = quote["symbol"]
+        self.underlying_symbol = quote["underlying_symbol"]
+        self.tick = quote["tick"]
+        self.exchange = quote["exchange"]
+        self.bid = to_float(quote["bid"])
+        self.ask = to_float(quote["ask"])
+        self.last = to_float(quote["last"])
+        self.bid_size = _to_int(quote["bidsize"])
+        self.ask_size = _to_int(quote["asksize"])
+        self.last_size = _to_int(quote["lastsize"])
+        self.bid_mmid = quote["bidmmid"]
+        self.ask_mmid = quote["askmmid"]
+        self.last_mmid = quote["lastmmid"]
+        self.change = to_float(quote["change"])
+        high = quote["high"]
+        self.high = None if high == "N/A" else to_float(high)
+        low = quote["low"]
+        self.low = "None" if low == "N/A" else to_float(low)
+        self.change_color = quote["changecolor"]
+        self.volume = quote["vol"]
+        self.bidxask = quote["bidxask"]
+        self.quote_time = quote["quotetime"]
+        self.last_trade_time = quote["lasttradetime"]
+        self.real_time = quote["realtime"] == "T"
+        self.fractional = quote["fractional"] == "T"
+        self.err_code = quote["errcode"]
+        self.company_name = quote["companyname"]
+        quote_recorder = getattr(ft_session, "quote_recorder", None)
+        if quote_recorder is not None:
+            quote_recorder.record(self)
+        symbol_reference = getattr(ft_session, "symbol_reference", None)
+        if symbol_reference is not None:
+            symbol_reference.record(self)
+
+
+QUOTE_FIELDS = tuple(name for name in SymbolQuote.__slots__ if name != "ft_session")
+
+
+class QuoteBatch:
+    """
+    Dataclass containing the results of a multi-symbol quote request.
+
+    Attributes:
+        quotes (dict): SymbolQuote objects keyed by the requested symbol.
+        errors (dict): Exceptions keyed by the requested symbol, for symbols that failed.
+        timings (dict): Seconds spent on each symbol's request, keyed by the requested symbol.
+        elapsed (float): Wall-clock seconds taken by the whole batch.
+        max_workers (int): Number of worker threads used for the batch.
+    """
+
+    def __init__(self, max_workers: int):
+        self.quotes = {}
+        self.errors = {}
+        self.timings = {}
+        self.elapsed = 0.0
+        self.max_workers = max_workers
+
+    def __getitem__(self, symbol):
+        return self.quotes[symbol]
+
+    def __contains__(self, symbol):
+        return symbol in self.quotes
+
+    def __len__(self):
+        return len(self.quotes)
+
+
+def get_quotes(ft_session: FTSession, symbols, max_workers: int = 10, fresh=False):
+    """
+    Retrieves quotes for many symbols concurrently.
+
+    The requests are spread over a thread pool and share the connection pool
+    of the underlying `requests.Session`. The default of 10 workers matches the
+    default pool size of a `requests.Session`, so raising it past that only helps
+    if the session's adapter is sized to match.
+
+    Args:
+        ft_session (FTSession):
+            The session object used for making HTTP requests to Firstrade.
+        symbols (iterable): The symbols to retrieve quotes for. Duplicates are fetched once.
+        max_workers (int, optional): Maximum number of concurrent requests. Defaults to 10.
+        fresh (bool, optional): Bypass the session's quote cache. Defaults to False.
+
+    Returns:
+        QuoteBatch: Quotes, per-symbol errors and request timings keyed by symbol.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    batch = QuoteBatch(max_workers)
+
+    def fetch(symbol):
+        start = time.perf_counter()
+        try:
+            return SymbolQuote(ft_session, symbol, fresh=fresh), None, time.perf_counter() - start
+        except Exception as e:
+            return None, e, time.perf_counter() - start
+
+    start = time.perf_counter()
+    if symbols:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as executor:
+            for symbol, (quote, error, elapsed) in zip(symbols, executor.map(fetch, symbols)):
+                batch.timings[symbol] = elapsed
+                if error is None:
+                    batch.quotes[symbol] = quote
+                else:
+                    batch.errors[symbol] = error
+    batch.elapsed = time.perf_counter() - start
+    return batch
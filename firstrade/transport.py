@@ -0,0 +1,156 @@
+import asyncio
+import http.client
+import http.cookiejar
+import ssl
+import threading
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Connection-specific headers are not allowed in HTTP/2 requests.
+_HOP_BY_HOP = frozenset(
+    ("connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade")
+)
+
+
+class _NoCookies(http.cookiejar.DefaultCookiePolicy):
+    """Refuses every cookie, so the httpx client never stores or sends cookies of its own."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+class _Raw:
+    """
+    Stands in for the urllib3 response requests expects in `Response.raw`,
+    so the session's cookie jar is updated from the response's Set-Cookie headers.
+    """
+
+    def __init__(self, headers):
+        self.msg = http.client.HTTPMessage()
+        for name, value in headers:
+            self.msg[name] = value
+        self._original_response = self
+
+    def read(self, *args, **kwargs):
+        return b""
+
+    def release_conn(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    Transport adapter that sends requests with httpx, multiplexing them over
+    HTTP/2 connections when the server supports it.
+
+    Concurrent requests share one connection instead of each holding its own,
+    so bursts do not wait for new TCP and TLS handshakes. Mount it with
+    `FTSession(..., http2=True)` or `session.mount("https://", HTTP2Adapter())`.
+
+    Requests are sent by an asyncio client on a background thread: the
+    threaded httpx client can interleave the stream IDs of concurrent
+    requests, which servers reject as a protocol error.
+    """
+
+    def __init__(self, max_connections=10, keepalive_expiry=60.0, verify=True):
+        """
+        Initializes a new instance of the HTTP2Adapter class.
+
+        Args:
+            max_connections (int, optional): Maximum connections kept open. Defaults to 10.
+            keepalive_expiry (float, optional): Seconds an idle connection is kept open. Defaults to 60.
+            verify (bool or str, optional): Whether to verify certificates, or the path of a CA bundle.
+                Defaults to True.
+        """
+        if httpx is None:
+            raise ImportError(
+                "HTTP2Adapter requires httpx. Install it with `pip install firstrade[http2]`."
+            )
+        super().__init__()
+        if isinstance(verify, str):
+            verify = ssl.create_default_context(cafile=verify)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="HTTP2Adapter", daemon=True)
+        self._thread.start()
+        # The adapter is shared by sessions and their isolated copies: cookies must
+        # come only from each requests session's own jar, never from the client.
+        self.client = httpx.AsyncClient(
+            http2=True,
+            verify=verify,
+            cookies=http.cookiejar.CookieJar(policy=_NoCookies()),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Sends a PreparedRequest and returns a requests.Response."""
+        headers = [
+            (name, value)
+            for name, value in request.headers.items()
+            if name.lower() not in _HOP_BY_HOP
+        ]
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        sent = asyncio.run_coroutine_threadsafe(
+            self.client.request(
+                request.method,
+                request.url,
+                headers=headers,
+                content=request.body,
+                timeout=timeout,
+            ),
+            self._loop,
+        )
+        try:
+            response = sent.result()
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+        return self.build_response(request, response)
+
+    def build_response(self, request, response):
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        # httpx already decoded the body, so its Content-Encoding no longer applies.
+        result.headers = CaseInsensitiveDict(
+            (name, value) for name, value in response.headers.items() if name.lower() != "content-encoding"
+        )
+        result.encoding = get_encoding_from_headers(result.headers)
+        result._content = response.content
+        result._content_consumed = True
+        result.raw = _Raw(response.headers.multi_items())
+        result.url = request.url
+        result.request = request
+        result.connection = self
+        extract_cookies_to_jar(result.cookies, request, result.raw)
+        return result
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -1,46 +1,112 @@
+from types import MappingProxyType
+from urllib.parse import urlsplit
+
+BASE_URL = "https://invest.firstrade.com"
+
+
 def get_xml():
-    return "https://invest.firstrade.com/cgi-bin/getxml"
+    return f"{BASE_URL}/cgi-bin/getxml"
 
 
 def login():
-    return "https://invest.firstrade.com/cgi-bin/login"
+    return f"{BASE_URL}/cgi-bin/login"
 
 
 def pin():
-    return "https://invest.firstrade.com/cgi-bin/enter_pin?destination_page=home"
+    return f"{BASE_URL}/cgi-bin/enter_pin?destination_page=home"
+
+
+def two_factor_auth():
+    # Path of the 2FA step referenced by the login flow; not yet confirmed against the site.
+    return f"{BASE_URL}/cgi-bin/enter_2fa"
 
 
 def account_list():
-    return "https://invest.firstrade.com/cgi-bin/getaccountlist"
+    return f"{BASE_URL}/cgi-bin/getaccountlist"
 
 
 def quote(symbol):
-    return f"https://invest.firstrade.com/cgi-bin/getxml?page=quo&quoteSymbol={symbol}"
+    return f"{BASE_URL}/cgi-bin/getxml?page=quo&quoteSymbol={symbol}"
 
 
 def orderbar():
-    return "https://invest.firstrade.com/cgi-bin/orderbar"
+    return f"{BASE_URL}/cgi-bin/orderbar"
+
+
+def cancel_order():
+    # Experimental: not verified against a live account yet.
+    return f"{BASE_URL}/cgi-bin/cancelorder"
 
 
 def account_status():
-    return "https://invest.firstrade.com/cgi-bin/account_status"
+    return f"{BASE_URL}/cgi-bin/account_status"
 
 def order_list():
-    return "https://invest.firstrade.com/cgi-bin/orderstatus"
+    return f"{BASE_URL}/cgi-bin/orderstatus"
 
 
 def status():
-    return "https://invest.firstrade.com/scripts/profile/margin_v2.php"
+    return f"{BASE_URL}/scripts/profile/margin_v2.php"
+
+
+def _build_headers():
+    return MappingProxyType(
+        {
+            "Accept": "*/*",
+            "Accept-Encoding": "gzip, deflate, br",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Host": urlsplit(BASE_URL).netloc,
+            "Referer": f"{BASE_URL}/cgi-bin/main",
+            "Connection": "keep-alive",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36 Edg/116.0.1938.81",
+        }
+    )
+
+
+_SESSION_HEADERS = _build_headers()
+
+
+def set_base_url(base_url):
+    """
+    Points every URL in this module at another server, i.e. `mockserver.MockFirstrade`.
+
+    Sessions copy the default headers when they are created, so call this before creating them.
+
+    Args:
+        base_url (str): Scheme and host of the server, i.e. "http://127.0.0.1:8080".
+    """
+    global BASE_URL, _SESSION_HEADERS
+    BASE_URL = base_url.rstrip("/")
+    _SESSION_HEADERS = _build_headers()
 
 
 def session_headers():
-    headers = {
-        "Accept": "*/*",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Host": "invest.firstrade.com",
-        "Referer": "https://invest.firstrade.com/cgi-bin/main",
-        "Connection": "keep-alive",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36 Edg/116.0.1938.81",
-    }
-    return headers
+    """Returns the default request headers. The mapping is shared and read-only; copy it with `dict()` to change it."""
+    return _SESSION_HEADERS
+
+
+_ENDPOINTS = {
+    "/cgi-bin/getxml": "get_xml",
+    "/cgi-bin/login": "login",
+    "/cgi-bin/enter_pin": "pin",
+    "/cgi-bin/enter_2fa": "two_factor_auth",
+    "/cgi-bin/getaccountlist": "account_list",
+    "/cgi-bin/orderbar": "orderbar",
+    "/cgi-bin/cancelorder": "cancel_order",
+    "/cgi-bin/account_status": "account_status",
+    "/cgi-bin/orderstatus": "order_list",
+    "/scripts/profile/margin_v2.php": "status",
+}
+
+
+def endpoint(url):
+    """
+    Returns the name of the function in this module that builds `url`,
+    i.e. "quote" or "orderbar", or "other" for unknown URLs.
+    """
+    path, _, query = url.partition("?")
+    path = path[path.find("/", path.find("//") + 2):] if "//" in path else path
+    name = _ENDPOINTS.get(path, "other")
+    if name == "get_xml" and "page=quo" in query:
+        return "quote"
+    return name
@@ -15,8 +15,10 @@ setuptools.setup(
     url="https://github.com/MaxxRK/firstrade-api",
     download_url="https://github.com/MaxxRK/firstrade-api/archive/refs/tags/0020.tar.gz",
     keywords=["FIRSTRADE", "API"],
-    install_requires=["requests", "beautifulsoup4", "lxml"],
+    install_requires=["requests", "beautifulsoup4", "lxml", "pyotp"],
+    extras_require={"async": ["aiohttp"], "numpy": ["numpy"], "http2": ["httpx[http2]"]},
     packages=["firstrade"],
+    entry_points={"console_scripts": ["firstrade=firstrade.cli:main"]},
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
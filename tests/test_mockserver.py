@@ -0,0 +1,33 @@
+import pytest
+
+from firstrade import urls
+from firstrade.account import FTAccountData, FTSession
+from firstrade.mockserver import MockFirstrade
+
+
+@pytest.fixture
+def mock():
+    base_url = urls.BASE_URL
+    with MockFirstrade(seed=1) as server:
+        urls.set_base_url(server.base_url)
+        try:
+            yield server
+        finally:
+            urls.set_base_url(base_url)
+
+
+@pytest.mark.parametrize("expires_after", ["account_status", "status"])
+def test_account_data_survives_relogin_after_account_switch(mock, tmp_path, expires_after):
+    first, second = mock.accounts
+    ft_session = FTSession(mock.username, mock.password, mock.pin, None, str(tmp_path))
+    account_data = FTAccountData(ft_session)
+    account_data.refresh(parallel=False)
+    cash = 1204.33
+
+    mock.expire_after(expires_after)
+    account_data.refresh([second], parallel=False)
+
+    assert ft_session.login_generation == 1
+    first_balance = float(account_data.get_balance(first).replace(",", ""))
+    second_balance = float(account_data.get_balance(second).replace(",", ""))
+    assert second_balance - first_balance == pytest.approx(cash)